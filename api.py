@@ -2,15 +2,33 @@
 
 import argparse
 import logging
+import os
+import time
 import pandas as pd
 from time import sleep
 from backend.services.draft import Draft, Team
+from backend.services.draft_journal import DraftJournal, reconcile, replay
 from backend import config
-from backend.services.vbd_service import create_vbd_big_board, calculate_vorp, calculate_vona
-from backend.services.draft_service import get_user_picks
+from backend.services.vbd_service import create_vbd_big_board
+from backend.services.vona_service import SpeculativeVona, evaluate_vona
+from backend.services.draft_service import get_user_picks, get_team_index, vona_window
 from backend.services.simulation_service import simulate_cpu_pick, simulate_user_auto_pick
 from backend.services import sleeper_service, data_service
-from backend import utils
+from backend.services.profiler import enable_profiling, get_profiler
+
+def live_vona_window(picks_made: int, picks_order: list, slot_to_roster_id: dict, user_roster_id) -> tuple[int, int] | None:
+    """
+    Returns (picks_to_simulate, current_pick) for the VONA of the user's next
+    turn in live mode, given how many picks have been made. See
+    `draft_service.vona_window`.
+    """
+    user_indices = [i for i in range(picks_made, len(picks_order))
+                    if slot_to_roster_id.get(str(picks_order[i])) == user_roster_id]
+    return vona_window(picks_made, user_indices)
+
+def _apply_vona(available_players: pd.DataFrame, vona: pd.DataFrame) -> None:
+    available_players.loc[:, 'VONA'] = vona['VONA']
+    available_players.loc[:, 'SURVIVAL'] = vona['SURVIVAL']
 
 def run_draft(
     draft: Draft,
@@ -18,19 +36,33 @@ def run_draft(
     user_pick_slot: int,
     user_picks_simulation: list[int],
     draft_id: str | None = None,
-    non_interactive: bool = False
+    non_interactive: bool = False,
+    workers: int = 1,
+    journal: DraftJournal | None = None
 ):
     """
     Runs the main draft loop for either a live assistant or a simulation.
     This function is the single source of truth for draft logic.
+
+    With a journal, every pick is appended to it as it is made, and any picks
+    already in it are replayed first so an interrupted draft resumes where it
+    stopped.
     """
+    profiler = get_profiler()
     original_big_board = draft.players.copy()
+
+    resumed_records = journal.records() if journal else []
+    if len(resumed_records):
+        replay(draft, teams_list, resumed_records)
+        print(f"Resumed {len(resumed_records)} picks from {journal.path}")
     
     # --- Pre-calculate draft order for live mode ---
     picks_order = []
     slot_to_roster_id = {}
     if draft_id:
-        settings = sleeper_service.get_draft_settings(draft_id)
+        client = sleeper_service.SleeperClient(draft_id)
+        with profiler.stage('sleeper_poll'):
+            settings = client.get_draft_settings() or {}
         slot_to_roster_id = settings.get('slot_to_roster_id', {})
         user_roster_id = slot_to_roster_id.get(str(user_pick_slot))
         if not user_roster_id:
@@ -43,8 +75,16 @@ def run_draft(
                 round_order.reverse()
             picks_order.extend(round_order)
 
+        # VONA for the user's next turn is refined in the background while other teams pick
+        speculator = SpeculativeVona()
+        speculated_at = -1
+
+        # Only picks made since the journal was written are fetched and applied
+        client.resume(len(resumed_records))
+        reconciled = not len(resumed_records)
+
     # --- Main Draft Loop ---
-    current_pick_num = 0
+    current_pick_num = int(resumed_records['pick'][-1]) if len(resumed_records) else 0
     while current_pick_num < (draft.rounds * draft.teams):
         
         is_user_turn = False
@@ -55,23 +95,45 @@ def run_draft(
             # LIVE MODE: Poll API and check state
             print("\nWaiting for the next pick...")
             while True:
-                all_picks = sleeper_service.get_all_picks(draft_id)
-                picks_made = len(all_picks)
+                with profiler.stage('sleeper_poll'):
+                    new_picks = client.get_new_picks()
+
+                if not reconciled and client.picks and client.picks[0] is not None:
+                    mismatched = reconcile(draft, resumed_records, client.picks)
+                    if mismatched:
+                        logging.warning(f"Journal disagrees with Sleeper on picks {mismatched}; keeping the journaled picks.")
+                    reconciled = True
 
                 # Process any new picks that have appeared since last check
-                if picks_made > current_pick_num:
-                    for i in range(current_pick_num, picks_made):
-                        pick = all_picks[i]
+                if new_picks:
+                    for i, pick in enumerate(new_picks, start=current_pick_num):
                         player_id = pick.get('player_id')
                         roster_id = pick.get('roster_id') or slot_to_roster_id.get(str(pick.get('draft_slot')))
                         
-                        if not player_id or not roster_id: continue
+                        if not player_id or not roster_id:
+                            if journal: journal.append(i + 1, None, None)
+                            continue
 
-                        player_info = original_big_board[original_big_board['sleeper_id'] == player_id].iloc[0]
-                        draft.draft_player(player_info['display_name'])
+                        row_id = draft.row_for_sleeper_id(player_id)
+                        if row_id is None:
+                            if journal: journal.append(i + 1, None, int(roster_id) - 1)
+                            print(f"Pick {i + 1}: Team {roster_id} drafted a player who is not on the big board ({player_id})")
+                            continue
+                        player_name = original_big_board['display_name'].iat[row_id]
+                        pos = draft.draft_row(row_id)
+                        if pos:
+                            teams_list[int(roster_id) - 1].add_player(player_name, pos)
+                        # The user's own pick was drafted locally, but its team is still journaled here
+                        if journal: journal.append(i + 1, row_id, int(roster_id) - 1)
                         
-                        print(f"Pick {i + 1}: Team {roster_id} drafted {player_info['display_name']} ({player_info['position']})")
-                    current_pick_num = picks_made
+                        print(f"Pick {i + 1}: Team {roster_id} drafted {player_name} ({original_big_board['position'].iat[row_id]})")
+                    current_pick_num = len(client.picks)
+
+                if speculated_at != current_pick_num:
+                    window = live_vona_window(current_pick_num, picks_order, slot_to_roster_id, user_roster_id)
+                    if window:
+                        speculator.update(draft, teams_list, *window, picks_made=current_pick_num)
+                    speculated_at = current_pick_num
 
                 # Now, determine who is on the clock for the *next* pick
                 if current_pick_num >= len(picks_order):
@@ -86,66 +148,60 @@ def run_draft(
                     team_index = int(on_clock_roster_id) - 1
                     break # Exit waiting loop and proceed to user turn logic
                 else:
-                    print(f"Team {on_clock_roster_id} is on the clock. Checking again in 10 seconds...")
-                    sleep(10)
+                    # Poll faster as the user's turn approaches
+                    picks_until_turn = next((i - current_pick_num for i in range(current_pick_num, len(picks_order))
+                                             if slot_to_roster_id.get(str(picks_order[i])) == user_roster_id), len(picks_order))
+                    interval = sleeper_service.poll_interval(picks_until_turn)
+                    print(f"Team {on_clock_roster_id} is on the clock. Checking again in {interval:.0f} seconds...")
+                    sleep(interval)
         
         else:
             # SIMULATION MODE: Determine whose turn it is
             current_pick_num += 1
-            current_round = (current_pick_num - 1) // draft.teams + 1
-            
-            if draft.order == 'snake' and current_round % 2 == 0:
-                team_index = draft.teams - ((current_pick_num - 1) % draft.teams) - 1
-            else:
-                team_index = (current_pick_num - 1) % draft.teams
+            team_index = get_team_index(current_pick_num, draft.teams, draft.order)
             
             is_user_turn = current_pick_num in user_picks_simulation
 
+        turn_started = time.perf_counter()
+
         # --- USER'S TURN LOGIC (used by both modes) ---
         if is_user_turn:
             current_team = teams_list[team_index]
-            available_players = draft.get_available_players().copy()
+            with profiler.stage('board_copy'):
+                available_players = draft.get_available_players().copy()
             if available_players.empty:
                 print("No more players available.")
                 break
 
+            if 'VONA' not in available_players.columns: available_players['VONA'] = 0.0
+
             # VONA Calculation
-            print("Calculating VONA... (this may take a moment)")
-            
-            next_user_pick_index = -1
             if draft_id:
-                # Live mode: find the next pick belonging to the user
-                for i in range(current_pick_num, len(picks_order)):
-                    if slot_to_roster_id.get(str(picks_order[i])) == user_roster_id:
-                        # Find the next one that isn't the current pick
-                        if i > current_pick_num:
-                            next_user_pick_index = i
-                            break
+                # Live mode: the estimate has been refined since the last pick arrived.
+                # One made before the latest picks is never shown.
+                speculator.wait(config.SPECULATIVE_VONA_WAIT_SECONDS, complete=False)
+                vona, futures, complete, picks_made = speculator.latest()
+                if vona is not None and picks_made == current_pick_num:
+                    _apply_vona(available_players, vona)
+                    print(f"VONA from {futures} simulated futures{'' if complete else ' (still refining)'}")
             else: # Simulation mode
-                 current_user_pick_index = user_picks_simulation.index(current_pick_num)
-                 if current_user_pick_index + 1 < len(user_picks_simulation):
-                     # In sim mode, the pick number is 1-based, index is 0-based
-                     next_user_pick_index = user_picks_simulation[current_user_pick_index + 1] - 1
+                print("Calculating VONA... (this may take a moment)")
+                next_user_pick_index = -1
+                current_user_pick_index = user_picks_simulation.index(current_pick_num)
+                if current_user_pick_index + 1 < len(user_picks_simulation):
+                    # In sim mode, the pick number is 1-based, index is 0-based
+                    next_user_pick_index = user_picks_simulation[current_user_pick_index + 1] - 1
 
-            picks_to_simulate = (next_user_pick_index - current_pick_num) if next_user_pick_index != -1 else 0
-            
-            if 'VONA' not in available_players.columns: available_players['VONA'] = 0.0
-
-            if picks_to_simulate > 0:
-                print(f"Simulating {picks_to_simulate} picks until your next turn...")
-                vona_values = {}
-                for index, player_row in available_players.sort_values(by='ADP').head(30).iterrows():
-                    # Create a deep copy of the draft state for a clean simulation
-                    draft_sim = Draft(draft.players.copy(), draft.format, draft.teams, draft.rounds, draft.roster, draft.order)
-                    draft_sim.drafted_players = draft.drafted_players.copy()
-                    teams_list_sim = [Team(roster=t.roster.copy()) for t in teams_list]
-                    
-                    vona = calculate_vona(player_row, draft_sim, teams_list_sim, picks_to_simulate, draft.teams, current_pick_num, draft.order, original_big_board)
-                    vona_values[player_row.name] = vona
-                available_players.loc[:, 'VONA'] = pd.Series(vona_values)
+                picks_to_simulate = (next_user_pick_index - current_pick_num) if next_user_pick_index != -1 else 0
+                if picks_to_simulate > 0:
+                    print(f"Simulating {picks_to_simulate} picks until your next turn...")
+                    # One set of futures is shared by every candidate on the board
+                    vona = evaluate_vona(draft, teams_list, picks_to_simulate, current_pick_num, workers=workers)
+                    _apply_vona(available_players, vona)
 
             if non_interactive and not draft_id: # Auto-pick for simulation only
-                player_name = simulate_user_auto_pick(available_players, current_team, original_big_board)
+                with profiler.stage('user_auto_pick'):
+                    player_name = simulate_user_auto_pick(available_players, current_team)
                 print(f"Auto-drafting: {player_name}")
             else:
                 # Interactive sub-loop
@@ -153,16 +209,21 @@ def run_draft(
                 while True:
                     if position_filter in ['K', 'DEF']: sort_col = 'ADP'
                     print(f"\n--- Your Pick! (Filter: {position_filter}, Sorted by: {sort_col}) ---")
+                    if draft_id:
+                        # Pick up any refinement finished since the board was last shown
+                        vona, _, _, picks_made = speculator.latest()
+                        if vona is not None and picks_made == current_pick_num: _apply_vona(available_players, vona)
                     
-                    filtered_board = available_players.copy()
-                    if position_filter != 'ALL':
-                        if position_filter == 'FLEX': filtered_board = filtered_board[filtered_board['position'].isin(['RB', 'WR', 'TE'])]
-                        else: filtered_board = filtered_board[filtered_board['position'] == position_filter]
-
-                    display_cols = ['display_name', 'position', 'VORP', 'VONA', 'ADP']
-                    existing_cols = [c for c in display_cols if c in filtered_board.columns]
-                    ascending = sort_col == 'ADP'
-                    print(filtered_board.sort_values(by=sort_col, ascending=ascending).head(20)[existing_cols])
+                    with profiler.stage('interactive_board'):
+                        filtered_board = available_players.copy()
+                        if position_filter != 'ALL':
+                            if position_filter == 'FLEX': filtered_board = filtered_board[filtered_board['position'].isin(['RB', 'WR', 'TE'])]
+                            else: filtered_board = filtered_board[filtered_board['position'] == position_filter]
+
+                        display_cols = ['display_name', 'position', 'VORP', 'VONA', 'SURVIVAL', 'ADP']
+                        existing_cols = [c for c in display_cols if c in filtered_board.columns]
+                        ascending = sort_col == 'ADP'
+                        print(filtered_board.sort_values(by=sort_col, ascending=ascending).head(20)[existing_cols])
                     
                     cmd = input("\nEnter 'draft <name>', 'sort <col>', 'filter <pos>', 'help': ").lower()
                     if cmd.startswith('draft '):
@@ -175,9 +236,14 @@ def run_draft(
                     else: print("Invalid command.")
             
             # Draft the chosen player
-            pos = draft.draft_player(player_name)
+            with profiler.stage('draft_player'):
+                row_id = draft.find_available_row(player_name)
+                pos = draft.draft_row(row_id) if row_id is not None else None
             if pos:
                 current_team.add_player(player_name, pos)
+                # In live mode the pick is journaled once it appears on Sleeper
+                if journal and not draft_id: journal.append(current_pick_num, row_id, team_index)
+                profiler.record_pick(current_pick_num if not draft_id else current_pick_num + 1, 'user', time.perf_counter() - turn_started)
                 print(f"You drafted: {player_name} ({pos})")
                 if draft_id:
                     print("Waiting for pick to appear on Sleeper board...")
@@ -190,16 +256,26 @@ def run_draft(
             current_team = teams_list[team_index]
             available_players = draft.get_available_players()
             print(f"CPU (Team {team_index + 1}) is on the clock...")
-            cpu_pick_name = simulate_cpu_pick(available_players, current_team, original_big_board)
-            pos = draft.draft_player(cpu_pick_name)
+            with profiler.stage('cpu_pick'):
+                cpu_pick_name = simulate_cpu_pick(available_players, current_team)
+            with profiler.stage('draft_player'):
+                row_id = draft.find_available_row(cpu_pick_name)
+                pos = draft.draft_row(row_id) if row_id is not None else None
             if pos:
                 current_team.add_player(cpu_pick_name, pos)
+                if journal: journal.append(current_pick_num, row_id, team_index)
+                profiler.record_pick(current_pick_num, 'cpu', time.perf_counter() - turn_started)
                 print(f"CPU (Team {team_index + 1}) drafted: {cpu_pick_name} ({pos})")
             else:
                 print(f"CPU (Team {team_index + 1}) failed to draft a player.")
 
     # --- Post-Draft Summary ---
     print("\n--- Draft Complete! ---")
+    if draft_id:
+        speculator.stop()
+    profile_dir = profiler.dump()
+    if profile_dir:
+        print(f"Profile report and Chrome trace written to {profile_dir}")
     # ... (rest of summary logic can be added here)
 
 
@@ -208,12 +284,18 @@ def main():
     parser.add_argument("pick", type=int, help="Your pick slot (1-based)")
     parser.add_argument("--draft-id", type=str, help="Sleeper draft ID for live draft assistant mode")
     parser.add_argument("--non-interactive", action="store_true", help="Enable auto-picking for simulation mode")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for VONA simulations (default: 1)")
+    parser.add_argument("--profile", action="store_true", help="Record stage timings and memory, and write a report at draft end")
+    parser.add_argument("--journal", type=str, help="Pick journal file (live mode default: data/journals/<draft_id>.journal)")
+    parser.add_argument("--resume", action="store_true", help="Resume an interrupted draft from its journal")
     # Simulation-specific args
     parser.add_argument("--teams", type=int, help="Number of teams (for simulation)")
     parser.add_argument("--rounds", type=int, help="Number of rounds (for simulation)")
     parser.add_argument("--format", type=str, help="Scoring format (for simulation)")
     parser.add_argument("--order", choices=["snake", "normal"], help="Draft order (for simulation)")
     args = parser.parse_args()
+    if args.profile:
+        enable_profiling()
 
     # --- Mode Selection ---
     if args.draft_id:
@@ -241,21 +323,45 @@ def main():
 
     # --- Common Setup ---
     print("Creating big board...")
-    big_board = create_vbd_big_board(format=draft_format, teams=draft_teams)
+    with get_profiler().stage('create_big_board'):
+        big_board = create_vbd_big_board(format=draft_format, teams=draft_teams)
     if big_board.empty:
         print("[Error] Big board could not be created. Exiting.")
         return
 
     # Add sleeper_id to the big board if it's not there, crucial for live mode
     if 'sleeper_id' not in big_board.columns:
-        player_data = data_service.load_adp_data()[['normalized_name', 'sleeper_id']]
+        player_data = data_service.load_adp_data(columns=['normalized_name', 'sleeper_id'])
         big_board = pd.merge(big_board, player_data, on='normalized_name', how='left')
 
     draft = Draft(big_board, draft_format, draft_teams, draft_rounds, order=draft_order)
     teams_list = [Team() for _ in range(draft_teams)]
 
+    # --- Pick journal ---
+    journal = None
+    journal_path = args.journal or (config.JOURNAL_DIR / f"{args.draft_id}.journal" if args.draft_id else None)
+    if journal_path:
+        journal_exists = os.path.exists(journal_path) and os.path.getsize(journal_path) > 0
+        if journal_exists and not args.resume:
+            print(f"[Error] Journal {journal_path} already exists. Use --resume to continue that draft, or remove the file.")
+            return
+        if args.resume and not journal_exists:
+            print(f"[Error] No journal to resume at {journal_path}.")
+            return
+        try:
+            journal = DraftJournal(journal_path, big_board, draft_teams, draft_rounds)
+        except ValueError as e:
+            print(f"[Error] {e}")
+            return
+    elif args.resume:
+        print("[Error] --resume needs --journal in simulation mode.")
+        return
+
     # --- Run the unified draft function ---
-    run_draft(draft, teams_list, args.pick, user_picks, args.draft_id, args.non_interactive)
+    try:
+        run_draft(draft, teams_list, args.pick, user_picks, args.draft_id, args.non_interactive, args.workers, journal)
+    finally:
+        if journal: journal.close()
 
 
 if __name__ == "__main__":
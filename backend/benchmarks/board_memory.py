@@ -0,0 +1,64 @@
+"""
+Memory report for the compact big board schema on a synthetic universe.
+
+    python -m backend.benchmarks.board_memory
+    python -m backend.benchmarks.board_memory --size 5000 --copies 100
+
+Prints each column's bytes in the default and compact schemas, then the
+measured cost of `copies` board copies (as the VONA loop makes) and of the
+pickled board each simulation worker receives.
+"""
+import argparse
+import pickle
+import tracemalloc
+import pandas as pd
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services.board_schema import compact_board, memory_report
+
+
+def measure_copies(board: pd.DataFrame, copies: int) -> int:
+    """Bytes allocated while holding `copies` deep copies of the board at once."""
+    tracemalloc.start()
+    try:
+        held = [board.copy() for _ in range(copies)]
+        allocated, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del held
+    return allocated
+
+
+def board_memory(size: int = 600, format: str = 'PPR', copies: int = 50, seed: int = 0) -> dict:
+    """
+    Measures a synthetic board of `size` players in both schemas.
+
+    Returns:
+        The per-column report plus measured copy and pickle sizes for each schema.
+    """
+    board = create_synthetic_big_board(size=size, format=format, seed=seed)
+    compact = compact_board(board)
+    return {
+        'report': memory_report(board, compact),
+        'measured': pd.DataFrame({
+            f'{copies}_copies_bytes': [measure_copies(board, copies), measure_copies(compact, copies)],
+            'pickle_bytes': [len(pickle.dumps(board)), len(pickle.dumps(compact))],
+        }, index=['default', 'compact']),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memory report for the compact big board schema")
+    parser.add_argument("--size", type=int, default=600, help="Players in the synthetic universe (default: 600)")
+    parser.add_argument("--format", default='PPR', help="Scoring format (default: PPR)")
+    parser.add_argument("--copies", type=int, default=50, help="Board copies to hold at once (default: 50)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic universe")
+    args = parser.parse_args()
+
+    result = board_memory(args.size, args.format, args.copies, args.seed)
+    print(result['report'].to_string())
+    print()
+    print(result['measured'].to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Load test for the HTTP draft assistant (backend/server.py).
+
+    uvicorn backend.server:app --port 8000 &
+    python -m backend.benchmarks.load_test --url http://127.0.0.1:8000 --sessions 16 --queries 200
+
+Every simulated user opens a draft session and queries the board with
+varying filters and sorts, drafting the top player every few queries; some
+also request VONA so rollouts run while boards are being served. Board query
+latency is checked against config.LOAD_TEST_P50_MS and LOAD_TEST_P99_MS, and
+the run exits non-zero if either target is missed.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import requests
+from backend import config
+
+POSITION_FILTERS = [None, 'QB', 'RB', 'WR', 'TE', 'FLEX']
+SORTS = ['ADP', 'VORP', 'POINTS', 'VONA']
+
+
+def _ok(response) -> bool:
+    """Whether a requests- or httpx-style response is a 2xx."""
+    return 200 <= response.status_code < 300
+
+
+def run_user(client, base_url: str, user: int, queries: int, pick_every: int, vona_every: int, teams: int, seed: int) -> dict:
+    """
+    One simulated user: creates a session, then runs `queries` board queries.
+
+    Returns:
+        Board query latencies in seconds, plus VONA latencies and the number
+        of requests of any kind that did not succeed.
+    """
+    rng = random.Random(seed + user)
+    created = client.post(f"{base_url}/sessions", json={'teams': teams, 'rounds': 15, 'user_slot': user % teams + 1})
+    created.raise_for_status()
+    session = f"{base_url}/sessions/{created.json()['session_id']}"
+    board_latencies, vona_latencies, errors = [], [], 0
+    for query in range(queries):
+        params = {'sort': rng.choice(SORTS), 'limit': 20}
+        position = rng.choice(POSITION_FILTERS)
+        if position:
+            params['position'] = position
+        started = time.perf_counter()
+        response = client.get(f"{session}/board", params=params)
+        board_latencies.append(time.perf_counter() - started)
+        if not _ok(response):
+            errors += 1
+            continue
+
+        if pick_every and (query + 1) % pick_every == 0:
+            top = client.get(f"{session}/board", params={'sort': 'ADP', 'limit': 1})
+            if not _ok(top):
+                errors += 1
+            elif top.json()['players']:
+                pick = client.post(f"{session}/picks", json={'player': top.json()['players'][0]['display_name']})
+                errors += not _ok(pick)
+        if vona_every and (query + 1) % vona_every == 0:
+            started = time.perf_counter()
+            vona = client.post(f"{session}/vona", params={'futures': 100, 'seed': user})
+            vona_latencies.append(time.perf_counter() - started)
+            errors += not _ok(vona)
+    client.delete(session)
+    return {'board': board_latencies, 'vona': vona_latencies, 'errors': errors}
+
+
+def summarize(latencies: list[float]) -> dict:
+    """p50/p95/p99/max of latencies, in milliseconds."""
+    if not latencies:
+        return {'count': 0}
+    ms = np.asarray(latencies) * 1000
+    return {'count': len(ms), 'p50_ms': float(np.percentile(ms, 50)), 'p95_ms': float(np.percentile(ms, 95)),
+            'p99_ms': float(np.percentile(ms, 99)), 'max_ms': float(ms.max())}
+
+
+def run_load_test(
+    make_client=requests.Session,
+    base_url: str = "http://127.0.0.1:8000",
+    sessions: int = 16,
+    queries: int = 200,
+    pick_every: int = 5,
+    vona_every: int = 50,
+    teams: int = config.DEFAULT_TEAMS,
+    seed: int = 0
+) -> dict:
+    """
+    Runs `sessions` concurrent users, each with its own client from
+    `make_client` (anything with requests-style get/post/delete).
+
+    Returns:
+        Board and VONA latency summaries, errors, board queries per second and
+        whether the p50/p99 targets were met.
+    """
+    clients = threading.local()
+
+    def user(index: int) -> dict:
+        if not hasattr(clients, 'client'):
+            clients.client = make_client()
+        return run_user(clients.client, base_url, index, queries, pick_every, vona_every, teams, seed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        results = list(pool.map(user, range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    board = summarize([latency for result in results for latency in result['board']])
+    return {
+        'board': board,
+        'vona': summarize([latency for result in results for latency in result['vona']]),
+        'errors': sum(result['errors'] for result in results),
+        'queries_per_second': board['count'] / elapsed if elapsed > 0 else float('inf'),
+        'targets_met': board['count'] > 0 and board['p50_ms'] <= config.LOAD_TEST_P50_MS and board['p99_ms'] <= config.LOAD_TEST_P99_MS,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the draft assistant service")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Service base URL")
+    parser.add_argument("--sessions", type=int, default=16, help="Concurrent draft sessions (default: 16)")
+    parser.add_argument("--queries", type=int, default=200, help="Board queries per session (default: 200)")
+    parser.add_argument("--pick-every", type=int, default=5, help="Draft a player every N queries (0 to never)")
+    parser.add_argument("--vona-every", type=int, default=50, help="Request VONA every N queries (0 to never)")
+    parser.add_argument("--teams", type=int, default=config.DEFAULT_TEAMS, help="Teams per session")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the query mix")
+    args = parser.parse_args()
+
+    report = run_load_test(requests.Session, args.url.rstrip('/'), args.sessions, args.queries,
+                           args.pick_every, args.vona_every, args.teams, args.seed)
+    for name in ['board', 'vona']:
+        summary = report[name]
+        if summary['count']:
+            print(f"{name:<6} n={summary['count']:<6} p50={summary['p50_ms']:7.1f}ms p95={summary['p95_ms']:7.1f}ms "
+                  f"p99={summary['p99_ms']:7.1f}ms max={summary['max_ms']:7.1f}ms")
+    print(f"{report['queries_per_second']:.0f} board queries/s, {report['errors']} errors")
+    print(f"Targets p50 <= {config.LOAD_TEST_P50_MS:g}ms, p99 <= {config.LOAD_TEST_P99_MS:g}ms: "
+          f"{'met' if report['targets_met'] else 'MISSED'}")
+    sys.exit(0 if report['targets_met'] and not report['errors'] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+Offline benchmarks for the draft hot paths on synthetic player universes.
+
+    python -m backend.benchmarks.run_benchmarks
+    python -m backend.benchmarks.run_benchmarks --size 1000 --mix QB=0.1,RB=0.3,WR=0.35,TE=0.1,K=0.075,DEF=0.075
+    python -m backend.benchmarks.run_benchmarks --update-baseline
+
+Results are written to JSON and compared against the stored baseline for the
+same universe. Each benchmark is timed as the fastest of several samples, each
+sample long enough to time reliably, and divided by the time of a fixed
+reference kernel run the same way. These ratios, not wall times, are compared,
+so a baseline recorded on one machine still holds on another; any ratio above
+baseline * threshold fails the run.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from backend import config
+from backend.benchmarks.synthetic import DEFAULT_POSITION_MIX, create_synthetic_big_board
+from backend.services.draft import Draft, Team
+from backend.services.draft_service import get_user_picks
+from backend.services.simulation_service import calculate_draft_score, simulate_cpu_pick
+from backend.services.vbd_service import calculate_vona, calculate_vorp
+
+BASELINE_PATH = Path(__file__).parent / "baselines.json"
+DEFAULT_THRESHOLD = 1.5
+# Shortest timed sample; shorter workloads are run several times per sample
+MIN_SAMPLE_S = 0.2
+
+
+def _sample(run, setup, number: int) -> float:
+    """Total wall time of `number` calls to `run(*setup())`, excluding setup."""
+    total = 0.0
+    for _ in range(number):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        run(*args)
+        total += time.perf_counter() - start
+    return total
+
+
+def time_call(run, setup=None, repeat: int = 5, min_sample_s: float = MIN_SAMPLE_S) -> dict:
+    """
+    Times `run(*setup())`; setup is excluded from the timing. Like timeit's
+    autorange, the number of calls per sample doubles until a sample takes at
+    least `min_sample_s`, then `repeat` samples are taken.
+
+    Returns:
+        Per-call minimum and median wall time in seconds. The minimum is the
+        least disturbed by other load on the machine and is what is compared.
+    """
+    number = 1
+    while (first := _sample(run, setup, number)) < min_sample_s and number < 1024:
+        number *= 2
+    times = [first] + [_sample(run, setup, number) for _ in range(repeat - 1)]
+    return {'min_s': min(times) / number, 'median_s': statistics.median(times) / number,
+            'number': number, 'repeat': repeat}
+
+
+def cpu_model() -> str:
+    """The CPU model where the OS reports one, else the architecture."""
+    try:
+        with open('/proc/cpuinfo') as cpuinfo:
+            for line in cpuinfo:
+                if line.startswith('model name'):
+                    return line.split(':', 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def reference_kernel() -> None:
+    """
+    A fixed pandas and numpy workload, timed alongside the benchmarks so that
+    they can be expressed relative to the speed of the machine running them.
+    """
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({'group': rng.integers(0, 6, 2000), 'value': rng.random(2000)})
+    for _ in range(20):
+        frame.sort_values(by='value').groupby('group')['value'].rank(ascending=False)
+    sum(float(value) for value in frame['value'])
+
+
+def benchmark_cases(board, format: str, teams: int, rounds: int) -> dict:
+    """
+    The benchmarked workloads, as name -> (run, setup, repeat share). Each run
+    covers one realistic unit of work rather than a single call where a call
+    is too short to time reliably.
+    """
+    def fresh_draft():
+        np.random.seed(0)
+        return Draft(board, format, teams, rounds), [Team() for _ in range(teams)]
+
+    def vorp_all_positions(players):
+        for position in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
+            players = calculate_vorp(players, position, teams, format)
+
+    def cpu_picks(draft, teams_list):
+        # One round of CPU picks on the full board
+        for team in teams_list:
+            draft.draft_player(simulate_cpu_pick(draft.get_available_players(), team))
+
+    def vona_top_players(draft, teams_list):
+        for _, player in board.head(10).iterrows():
+            calculate_vona(player, draft, teams_list, 2 * teams - 2, teams, 1, 'snake')
+
+    def draft_by_name(draft, teams_list):
+        for name in board.sort_values(by='ADP')['display_name'].head(teams * rounds):
+            draft.draft_player(name)
+
+    def full_draft(draft, teams_list):
+        # Imported here: api is the top-level CLI module
+        from api import run_draft
+        user_picks = get_user_picks(1, 'snake', teams, rounds)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_draft(draft, teams_list, 1, user_picks, non_interactive=True)
+
+    return {
+        'calculate_vorp': (vorp_all_positions, lambda: (board.copy(),), 1.0),
+        'calculate_draft_score': (calculate_draft_score, lambda: (board,), 1.0),
+        'simulate_cpu_pick': (cpu_picks, fresh_draft, 1.0),
+        'calculate_vona': (vona_top_players, fresh_draft, 1.0),
+        'draft_player': (draft_by_name, fresh_draft, 1.0),
+        'run_draft': (full_draft, fresh_draft, 0.6),
+    }
+
+
+def run_benchmarks(
+    size: int = 600,
+    format: str = 'PPR',
+    teams: int = config.DEFAULT_TEAMS,
+    rounds: int = 15,
+    position_mix: dict | None = None,
+    seed: int = 0,
+    repeat: int = 5,
+    only: list | None = None,
+    min_sample_s: float = MIN_SAMPLE_S
+) -> dict:
+    """
+    Generates a synthetic universe and times every benchmark on it.
+
+    Returns:
+        A JSON-serialisable report with the universe settings and the timings.
+    """
+    position_mix = position_mix or DEFAULT_POSITION_MIX
+    board = create_synthetic_big_board(size, format, teams, position_mix, seed)
+    reference = time_call(reference_kernel, repeat=repeat, min_sample_s=min_sample_s)
+    results = {}
+    for name, (run, setup, repeat_share) in benchmark_cases(board, format, teams, rounds).items():
+        if only and name not in only:
+            continue
+        results[name] = time_call(run, setup, max(1, round(repeat * repeat_share)), min_sample_s)
+        results[name]['ratio'] = results[name]['min_s'] / reference['min_s']
+        logging.info(f"{name}: {results[name]['min_s'] * 1000:.1f} ms ({results[name]['ratio']:.1f}x reference)")
+    return {
+        'universe': {'size': size, 'format': format, 'teams': teams, 'rounds': rounds,
+                     'position_mix': position_mix, 'seed': seed},
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'cpu': cpu_model(),
+        'reference': reference,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'benchmarks': results,
+    }
+
+
+def find_regressions(report: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compares each benchmark's ratio to the reference kernel against a baseline
+    for the same universe.
+
+    Returns:
+        (name, baseline ratio, current ratio) for every benchmark whose ratio
+        exceeds baseline * threshold. Empty if the universes differ.
+    """
+    if baseline.get('universe') != report['universe']:
+        logging.warning("Baseline was recorded for a different universe; skipping comparison.")
+        return []
+    regressions = []
+    for name, result in report['benchmarks'].items():
+        base = baseline['benchmarks'].get(name)
+        if base and 'ratio' in base and result['ratio'] > base['ratio'] * threshold:
+            regressions.append((name, base['ratio'], result['ratio']))
+    return regressions
+
+
+def _parse_mix(text: str) -> dict:
+    """Parses 'QB=0.1,RB=0.3,...' into a position mix."""
+    return {pos: float(share) for pos, share in (item.split('=') for item in text.split(','))}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the offline draft benchmarks.")
+    parser.add_argument("--size", type=int, default=600, help="Players in the synthetic universe (default: 600)")
+    parser.add_argument("--mix", type=_parse_mix, help="Position mix, e.g. QB=0.1,RB=0.3,WR=0.35,TE=0.1,K=0.075,DEF=0.075")
+    parser.add_argument("--format", default='PPR', help="Scoring format (default: PPR)")
+    parser.add_argument("--teams", type=int, default=config.DEFAULT_TEAMS, help="Number of teams")
+    parser.add_argument("--rounds", type=int, default=15, help="Rounds in the full draft benchmark (default: 15)")
+    parser.add_argument("--seed", type=int, default=0, help="Universe seed (default: 0)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed samples per benchmark (default: 5)")
+    parser.add_argument("--only", nargs='+', help="Run only these benchmarks")
+    parser.add_argument("--output", type=Path, help="Results JSON (default: data/benchmarks/<timestamp>.json)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="Baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Fail if a ratio to the reference exceeds baseline * threshold (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the new baseline")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.size, args.format, args.teams, args.rounds, args.mix, args.seed, args.repeat, args.only)
+
+    output = args.output or config.DATA_DIR / "benchmarks" / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Results written to {output}")
+
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one.")
+        return
+    regressions = find_regressions(report, json.loads(args.baseline.read_text()), args.threshold)
+    for name, base, current in regressions:
+        print(f"REGRESSION {name}: {current:.2f}x reference vs baseline {base:.2f}x ({current / base:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
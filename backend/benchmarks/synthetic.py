@@ -0,0 +1,85 @@
+"""
+Synthetic player universes for offline benchmarks, shaped like the output of
+create_vbd_big_board so every hot path can run without ingested data.
+"""
+import numpy as np
+import pandas as pd
+from backend import config
+from backend.services.vbd_service import calculate_vorp
+
+DEFAULT_POSITION_MIX: dict = {'QB': 0.12, 'RB': 0.25, 'WR': 0.32, 'TE': 0.13, 'K': 0.09, 'DEF': 0.09}
+
+# Projected points of the best player at each position, and how fast they fall off
+TOP_POINTS: dict = {'QB': 380.0, 'RB': 330.0, 'WR': 330.0, 'TE': 250.0}
+POINTS_DECAY: dict = {'QB': 0.035, 'RB': 0.03, 'WR': 0.025, 'TE': 0.05}
+
+NFL_TEAMS = [
+    'ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+    'LAC', 'LAR', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS'
+]
+
+
+def create_synthetic_big_board(
+    size: int = 600,
+    format: str = 'PPR',
+    teams: int = config.DEFAULT_TEAMS,
+    position_mix: dict | None = None,
+    seed: int = 0
+) -> pd.DataFrame:
+    """
+    Generates a random big board with the same columns as create_vbd_big_board:
+    the players_adp columns for every format with the requested format's ADP
+    renamed to 'ADP', fantasy_points_{format} and VORP, sorted by VORP.
+
+    Projections fall off exponentially within each position, with noise. ADP
+    follows VORP plus noise, so CPU drafters behave roughly like real ones.
+    Kickers and defenses have no projection, as on the real board.
+
+    Args:
+        size: Number of players.
+        format: Scoring format for the points column and the 'ADP' column.
+        teams: League size used for replacement levels.
+        position_mix: Share of players per position. Defaults to DEFAULT_POSITION_MIX.
+        seed: Seed for the generator.
+    """
+    rng = np.random.default_rng(seed)
+    mix = position_mix or DEFAULT_POSITION_MIX
+    shares = np.array(list(mix.values()), dtype=float)
+    positions = rng.choice(list(mix.keys()), size=size, p=shares / shares.sum())
+
+    names = [f"Player {i:05d}" for i in range(size)]
+    board = pd.DataFrame({
+        'display_name': names,
+        'normalized_name': [name.lower() for name in names],
+        'team': rng.choice(NFL_TEAMS, size=size),
+        'position': positions,
+        'age': rng.integers(21, 36, size=size).astype(float),
+        'sleeper_id': [str(1000 + i) for i in range(size)],
+        'gsis_id': [f"00-{i:07d}" for i in range(size)],
+    })
+
+    points = np.full(size, np.nan)
+    for position, top in TOP_POINTS.items():
+        rows = np.flatnonzero(positions == position)
+        depth = np.arange(len(rows))
+        points[rows] = (top * np.exp(-POINTS_DECAY[position] * depth) + rng.normal(0, 12, len(rows))).round(1)
+    points_column = f"fantasy_points_{format.lower()}"
+    board[points_column] = points
+    for position in board['position'].unique():
+        board = calculate_vorp(board, position, teams, format)
+
+    # ADP tracks VORP with noise; K and DEF go late
+    value = board['VORP'].to_numpy() + rng.normal(0, 15, size)
+    value[np.isin(positions, ['K', 'DEF'])] = rng.uniform(-200, -100, np.isin(positions, ['K', 'DEF']).sum())
+    adp_columns = {}
+    for draft_format in config.DRAFT_FORMATS:
+        noisy = value + rng.normal(0, 5, size)
+        adp = pd.Series(-noisy).rank(method='first').to_numpy()
+        pos_rank = pd.Series(adp).groupby(positions).rank(method='first').astype(int)
+        adp_columns[f'ADP_{draft_format}'] = adp
+        adp_columns[f'pos_adp_{draft_format}'] = [f"{pos}{rank}" for pos, rank in zip(positions, pos_rank)]
+        adp_columns[f'avg_adp_{draft_format}'] = (adp + rng.normal(0, 1, size)).clip(1).round(1)
+    adp_df = pd.DataFrame(adp_columns).rename(columns={f'ADP_{format}': 'ADP'})
+
+    board = pd.concat([board.drop(columns=[points_column, 'VORP']), adp_df, board[[points_column, 'VORP']]], axis=1)
+    return board.sort_values(by='VORP', ascending=False)
@@ -8,6 +8,33 @@ PLAYERS_DIR = DATA_DIR / "sleeper_players"
 STATS_DIR = DATA_DIR / "nfl_stats"
 ADP_DIR = DATA_DIR / "fantasy_pros_adp"
 PLAYER_ADP_DIR = DATA_DIR / "players_adp"
+BOARD_CACHE_DIR = DATA_DIR / "big_boards"
+SIMULATIONS_DIR = DATA_DIR / "simulations"
+PROFILE_DIR = DATA_DIR / "profiles"
+JOURNAL_DIR = DATA_DIR / "journals"
+IDENTITY_DIR = DATA_DIR / "identity"
+ARROW_CACHE_DIR = DATA_DIR / "arrow_cache"
+
+# --- CACHE SETTINGS ---
+# Least recently used big boards are evicted beyond this size
+BOARD_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+
+# --- INGEST SETTINGS ---
+# Player directory deltas are compacted into a new full snapshot once this many exist
+PLAYER_DELTA_COMPACT_AFTER: int = 7
+
+# --- SLEEPER SETTINGS ---
+SLEEPER_API_URL: str = "https://api.sleeper.app/v1"
+# Live draft polling: fastest interval when the user is up next, slowest when far away
+POLL_MIN_SECONDS: float = 1.0
+POLL_MAX_SECONDS: float = 10.0
+
+# --- SERVER SETTINGS ---
+# Worker processes for VONA requests, so rollouts never run on the event loop
+SERVER_VONA_WORKERS: int = 2
+# Board query latency targets for backend.benchmarks.load_test, in milliseconds
+LOAD_TEST_P50_MS: float = 25.0
+LOAD_TEST_P99_MS: float = 150.0
 
 # --- DRAFT SETTINGS ---
 DEFAULT_ROSTER: List[str] = [
@@ -22,9 +49,27 @@ DEFAULT_ROSTER_POS: List[str] = [
     "K", "DEF", "BN", "BN", "BN", "BN", "BN", "BN", "BN", "BN"
 ]
 
+# Player positions in the order used for array-backed draft state
+POSITIONS: List[str] = ["QB", "RB", "WR", "TE", "K", "DEF"]
+# Positions eligible for a FLEX slot
+FLEX_POSITIONS: List[str] = ["RB", "WR", "TE"]
+
 DEFAULT_TEAMS: int = 12
 DEFAULT_ROUNDS: int = 20
 DEFAULT_DRAFT_FORMAT: str = 'STD'
+# Scoring formats with ADP and projection data
+DRAFT_FORMATS: List[str] = ['STD', 'HalfPPR', 'PPR']
+
+# Number of simulated futures behind each Monte Carlo VONA estimate
+VONA_FUTURES: int = 500
+# Futures per rollout batch; each batch gets its own seeded RNG stream
+VONA_BATCH_SIZE: int = 100
+# Longest wait, on the user's live turn, for the first estimate of the current picks
+SPECULATIVE_VONA_WAIT_SECONDS: float = 10.0
+
+# Batch league simulation: leagues per worker task (and output file), and per Parquet row group
+BATCH_CHUNK_LEAGUES: int = 200
+BATCH_ROW_GROUP_LEAGUES: int = 50
 
 # VORP positional adjustments
 POSITION_ADJUSTMENT: dict = {
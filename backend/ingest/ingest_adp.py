@@ -6,10 +6,11 @@ The final output is a single Parquet file containing player information
 and their ADP for each format (e.g., STD, HalfPPR, PPR).
 """
 from datetime import datetime, timezone
-import glob
 import pandas as pd
 from backend import config
-from backend.utils import normalize_name
+from backend.services import data_service
+from backend.services.identity_service import IdentityResolver
+from backend.utils import normalize_names
 import logging
 import re
 
@@ -27,17 +28,15 @@ def main() -> None:
     Main function to read player data and attach ADP data from multiple formats.
     """
     try:
-        # 1. Read the main player data file once
-        path = config.PLAYERS_DIR / "all_players_*.parquet"
-        files = sorted(glob.glob(str(path)))
-        if not files:
+        # 1. Read the main player data once: the latest snapshot plus its deltas
+        player_df = data_service.load_player_directory()
+        if player_df is None:
             raise FileNotFoundError("No player data files found in the specified directory.")
         
-        logging.info(f"Reading player data from {files[-1]}")
-        player_df = pd.read_parquet(files[-1])
-        
-        # 2. Select essential columns and remove duplicate players
-        player_df = player_df[['display_name', 'normalized_name', 'team', 'position', 'age', 'sleeper_id', 'gsis_id']].drop_duplicates(subset=['normalized_name'])
+        # 2. Select essential columns and give every player a player_uid
+        player_df = player_df[['display_name', 'normalized_name', 'team', 'position', 'age', 'sleeper_id', 'gsis_id']].drop_duplicates(subset=['sleeper_id'])
+        resolver = IdentityResolver.load()
+        player_df.insert(0, 'player_uid', resolver.register(player_df))
 
         # 3. Loop through formats and merge ADP data
         formats = ['STD', 'HalfPPR', 'PPR']
@@ -50,7 +49,9 @@ def main() -> None:
             
             # Process ADP dataframe
             adp_df['Rank'] = pd.to_numeric(adp_df['Rank'], errors='coerce')
-            adp_df['normalized_name'] = adp_df['Player'].apply(normalize_name)
+            adp_df['normalized_name'] = normalize_names(adp_df['Player'])
+            adp_df['player_uid'] = resolver.resolve(adp_df['Player'], adp_df.get('POS'), 'fantasypros')
+            adp_df = adp_df.dropna(subset=['player_uid']).drop_duplicates(subset=['player_uid']).astype({'player_uid': 'int64'})
             
             # Rename columns to be format-specific for the merge
             adp_df = adp_df.rename(columns={
@@ -61,14 +62,19 @@ def main() -> None:
             })
             
             # Select only the columns needed for the merge
-            adp_cols_to_merge = ['normalized_name', f'ADP_{_format}', f'pos_adp_{_format}', f'avg_adp_{_format}']
+            adp_cols_to_merge = ['player_uid', f'ADP_{_format}', f'pos_adp_{_format}', f'avg_adp_{_format}']
             adp_df_to_merge = adp_df[adp_cols_to_merge]
 
-            # Merge ADP data into the main player DataFrame using the normalized name
-            player_df = player_df.merge(adp_df_to_merge, on='normalized_name', how='left')
+            # Merge ADP data into the main player DataFrame on the resolved player ID
+            player_df = player_df.merge(adp_df_to_merge, on='player_uid', how='left')
 
         # Clean up the final dataframe by dropping players without any ADP data
         player_df.dropna(subset=[f'ADP_{f}' for f in formats], how='all', inplace=True)
+
+        # Keep the learned FantasyPros names and report the ones that matched nobody
+        resolver.save()
+        if resolver.unmatched:
+            logging.warning(f"Unmatched ADP rows written to {resolver.write_unmatched_report()}")
         
         # 4. Save the final merged dataframe
         output_path = config.PLAYER_ADP_DIR / f"{datetime.now(timezone.utc).date()}_adp.parquet"
@@ -1,9 +1,170 @@
+"""
+Runs every ingest stage as a small dependency graph.
+
+    python -m backend.ingest.ingest_all [--force] [--seasons 2023 2024] [--workers N]
+
+Stages whose dependencies are done run concurrently on a thread pool (the
+stages are network and I/O bound). A stage is skipped when its inputs and
+parameters are unchanged since its last successful run, its outputs still
+exist and no upstream stage ran this time. Fingerprints are kept in
+data/ingest_state.json.
+"""
+import glob
+import json
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from pathlib import Path
+from backend import config
 from backend.ingest import ingest_adp, ingest_players, ingest_stats
+from backend.services import data_service
+from backend.utils import file_fingerprint
+
+class Stage:
+    """
+    One ingest step: the callable that runs it, the stages it needs first, and
+    callables listing the files it reads and writes and any other parameters
+    that change its result.
+    """
+    def __init__(self, name: str, run, deps: list | None = None, inputs=None, outputs=None, params=None):
+        self.name = name
+        self.run = run
+        self.deps = deps or []
+        self.inputs = inputs or (lambda: [])
+        self.outputs = outputs or (lambda: [])
+        self.params = params or (lambda: {})
+
+    def fingerprint(self) -> dict:
+        return {'inputs': [file_fingerprint(path) for path in self.inputs()], 'params': self.params()}
+
+    def outputs_exist(self) -> bool:
+        outputs = self.outputs()
+        return bool(outputs) and all(path is not None and os.path.exists(path) for path in outputs)
+
+
+def state_path() -> Path:
+    return config.DATA_DIR / "ingest_state.json"
+
+
+def default_stages(seasons: list[int] = [2024]) -> list:
+    """The Sleeper player directory, FantasyPros ADP on top of it, and nflverse stats."""
+    def today():
+        return str(datetime.now(timezone.utc).date())
+
+    return [
+        Stage('players', lambda: ingest_players.main(force=True),
+              outputs=lambda: [ingest_players.todays_file()],
+              # The directory is refreshed once a day
+              params=lambda: {'date': today()}),
+        Stage('adp', ingest_adp.main, deps=['players'],
+              inputs=lambda: data_service.get_player_directory_paths() +
+                             sorted(glob.glob(str(config.ADP_DIR / "FantasyPros_*_ADP.parquet"))),
+              outputs=lambda: [data_service.get_latest_adp_path()]),
+        Stage('stats', lambda: ingest_stats.main(seasons),
+              outputs=lambda: [data_service.stats_dataset_dir() / f"season={season}" / f"position={position}"
+                               for season in seasons for position in ingest_stats.POSITION_STATS],
+              params=lambda: {'seasons': seasons}),
+    ]
+
+
+def _timed(stage: Stage) -> tuple:
+    """Runs a stage, returning its wall time and any exception it raised."""
+    start = time.perf_counter()
+    try:
+        stage.run()
+        error = None
+    except Exception as e:
+        error = e
+    return time.perf_counter() - start, error
+
+
+def run_pipeline(stages: list, force: bool = False, workers: int | None = None, state_file: str | Path | None = None) -> dict:
+    """
+    Runs the stages in dependency order, independent ones concurrently.
+
+    A stage that raises or leaves any of its outputs missing has failed, and
+    the stages that depend on it are blocked.
+
+    Returns:
+        {stage name: {'status': 'ran' | 'skipped' | 'failed' | 'blocked', 'seconds': float}}
+        in the order the stages finished.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        unknown = set(stage.deps) - names
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {sorted(unknown)}")
+
+    state_file = Path(state_file or state_path())
+    state = json.loads(state_file.read_text()) if state_file.exists() else {}
+    results: dict = {}
+    pending = list(stages)
+    running: dict = {}
+
+    with ThreadPoolExecutor(max_workers=workers or len(stages) or 1) as pool:
+        while pending or running:
+            # Start (or skip) every stage whose dependencies have finished
+            progress = True
+            while progress:
+                progress = False
+                for stage in list(pending):
+                    upstream = [results.get(dep) for dep in stage.deps]
+                    if any(result is None for result in upstream):
+                        continue
+                    pending.remove(stage)
+                    progress = True
+                    if any(result['status'] in ('failed', 'blocked') for result in upstream):
+                        results[stage.name] = {'status': 'blocked', 'seconds': 0.0}
+                        logging.warning(f"Ingest stage '{stage.name}' blocked by a failed dependency.")
+                        continue
+                    fingerprint = stage.fingerprint()
+                    upstream_ran = any(result['status'] == 'ran' for result in upstream)
+                    if not force and not upstream_ran and state.get(stage.name) == fingerprint and stage.outputs_exist():
+                        results[stage.name] = {'status': 'skipped', 'seconds': 0.0}
+                        logging.info(f"Ingest stage '{stage.name}' is up to date.")
+                        continue
+                    logging.info(f"Starting ingest stage '{stage.name}'")
+                    running[pool.submit(_timed, stage)] = (stage, fingerprint)
+
+            if not running:
+                if pending:
+                    raise ValueError(f"Dependency cycle between stages: {sorted(s.name for s in pending)}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, fingerprint = running.pop(future)
+                seconds, error = future.result()
+                if error is None and stage.outputs_exist():
+                    results[stage.name] = {'status': 'ran', 'seconds': seconds}
+                    state[stage.name] = fingerprint
+                    logging.info(f"Ingest stage '{stage.name}' finished in {seconds:.1f}s")
+                else:
+                    results[stage.name] = {'status': 'failed', 'seconds': seconds}
+                    state.pop(stage.name, None)
+                    logging.error(f"Ingest stage '{stage.name}' failed: {error or 'outputs missing'}")
+
+    state_file.parent.mkdir(parents=True, exist_ok=True)
+    state_file.write_text(json.dumps(state, indent=2, default=str))
+    return results
+
+
+def main(force: bool = False, seasons: list[int] = [2024], workers: int | None = None) -> dict:
+    started = time.perf_counter()
+    results = run_pipeline(default_stages(seasons), force=force, workers=workers)
+    for name, result in results.items():
+        print(f"{name:<10} {result['status']:<8} {result['seconds']:7.1f}s")
+    print(f"{'total':<10} {'':<8} {time.perf_counter() - started:7.1f}s")
+    return results
 
-def main():
-    ingest_players.main()
-    ingest_adp.main()
-    ingest_stats.main()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Run the ingest pipeline")
+    ap.add_argument("--force", action="store_true", help="Run every stage even if its inputs are unchanged")
+    ap.add_argument("--seasons", type=int, nargs='+', default=[2024], help="Seasons to ingest stats for (default: 2024)")
+    ap.add_argument("--workers", type=int, help="Stages to run at once (default: all that are ready)")
+    main(**vars(ap.parse_args()))
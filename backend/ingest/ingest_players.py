@@ -1,59 +1,187 @@
 from __future__ import annotations
+import codecs
+import json
 from pathlib import Path
 from datetime import datetime, timezone
 import requests
 import pandas as pd
 from backend import config
+from backend.services import data_service
+from backend.services.identity_service import IdentityResolver
+from backend.utils import normalize_names
 
 BASE_URL = "https://api.sleeper.app/v1/players/nfl"
-OUT_DIR  = Path.cwd() / "data" / "sleeper_players"
-OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+# Fields kept from each player object; everything else is skipped while parsing
+RAW_FIELDS = ['gsis_id', 'active', 'college', 'number', 'position', 'age', 'team', 'first_name', 'last_name']
+CHUNK_SIZE = 64 * 1024
 
 '''
-This script fetches the full player directory from the Sleeper API and saves it as a Parquet file.
-It includes functions to download the data, format it for Parquet storage, and persist it 
-in a specified output directory. The player directory contains information about 
-NFL players, including their IDs, names, and positions.
+This script fetches the full player directory from the Sleeper API and saves it as Parquet.
+The response is parsed as a stream into only the fields we keep. The first run writes a full
+snapshot (all_players_{date}.parquet); later runs diff against the current directory by
+sleeper_id and write only the changed rows as a delta partition (deltas/players_delta_{date}.parquet).
+Once enough deltas accumulate they are compacted into a new snapshot and old files are removed.
 '''
 
-# Fetch the full player directory from Sleeper API and save it as a Parquet file.
+def _decode_chunks(chunks):
+    """
+    Decodes UTF-8 byte chunks to text. The decoder is incremental, so a
+    character split across two chunks is decoded once both have arrived.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for chunk in chunks:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    yield decoder.decode(b'', final=True)
+
+def _iter_players(chunks):
+    """
+    Yields (sleeper_id, player) from the directory JSON, an object keyed by
+    sleeper_id, decoding one player at a time as the chunks arrive.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, started = "", 0, False
+    for text in _decode_chunks(chunks):
+        buffer = buffer[pos:] + text
+        pos = 0
+        while True:
+            # Skip the separators between entries
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if not started:
+                if pos == len(buffer):
+                    break
+                if buffer[pos] != '{':
+                    raise ValueError("Expected the player directory to be a JSON object.")
+                started, pos = True, pos + 1
+                continue
+            if pos < len(buffer) and buffer[pos] == '}':
+                return
+            try:
+                key, key_end = decoder.raw_decode(buffer, pos)
+                colon = buffer.index(':', key_end)
+                value_start = colon + 1
+                while value_start < len(buffer) and buffer[value_start] in ' \t\r\n':
+                    value_start += 1
+                player, pos_after = decoder.raw_decode(buffer, value_start)
+            except (json.JSONDecodeError, ValueError):
+                break # The entry continues in the next chunk
+            # A value that ends exactly at the buffer's end may be a truncated number
+            if pos_after == len(buffer) and not isinstance(player, (dict, list)):
+                break
+            pos = pos_after
+            yield key, player
+
 def _fetch() -> pd.DataFrame:
-    """Download the full player directory (~5 MB)."""
-    resp = requests.get(BASE_URL, timeout=30)
-    resp.raise_for_status()                     
-    data = resp.json()                           
-    return pd.DataFrame.from_dict(
-        data, orient="index"
-    ).reset_index(names="sleeper_id")
-
-# Persist the DataFrame to a Parquet file in the output directory.
+    """Stream the full player directory (~5 MB), keeping only RAW_FIELDS."""
+    columns: dict = {'sleeper_id': [], **{field: [] for field in RAW_FIELDS}}
+    with requests.get(BASE_URL, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        for sleeper_id, player in _iter_players(resp.iter_content(chunk_size=CHUNK_SIZE)):
+            columns['sleeper_id'].append(sleeper_id)
+            for field in RAW_FIELDS:
+                columns[field].append(player.get(field) if isinstance(player, dict) else None)
+    return pd.DataFrame(columns)
+
+def _today() -> str:
+    return str(datetime.now(timezone.utc).date())
+
+def _delta_dir() -> Path:
+    return config.PLAYERS_DIR / "deltas"
+
+def todays_file() -> Path | None:
+    """Today's snapshot or delta, if the directory was already ingested today."""
+    for path in [config.PLAYERS_DIR / f"all_players_{_today()}.parquet", _delta_dir() / f"players_delta_{_today()}.parquet"]:
+        if path.exists():
+            return path
+    return None
+
+# Persist the DataFrame to a full snapshot, replacing older snapshots and deltas.
 def _persist(df: pd.DataFrame) -> Path:
-    today = datetime.now(timezone.utc).date()
-    path = OUT_DIR / f"all_players_{today}.parquet"
+    config.PLAYERS_DIR.mkdir(parents=True, exist_ok=True)
+    path = config.PLAYERS_DIR / f"all_players_{_today()}.parquet"
     df.to_parquet(path, index=False)
+    for old in list(config.PLAYERS_DIR.glob("all_players_*.parquet")) + list(_delta_dir().glob("*.parquet")):
+        if old != path:
+            old.unlink()
+    return path
+
+def _diff(previous: pd.DataFrame, current: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rows of `current` that are new or changed since `previous`, plus a row
+    flagged `deleted` for every sleeper_id that disappeared. Only the columns
+    both share are compared; if `current` has columns `previous` lacks (a
+    snapshot from an older schema), every common row counts as changed.
+    """
+    previous = previous.drop(columns='deleted', errors='ignore').set_index('sleeper_id')
+    current = current.set_index('sleeper_id')
+    shared = current.columns.intersection(previous.columns)
+    common = current.index.intersection(previous.index)
+    before = previous.loc[common, shared].astype(object)
+    after = current.loc[common, shared].astype(object)
+    changed = ((before != after) & ~(before.isna() & after.isna())).any(axis=1)
+    if len(shared) < len(current.columns):
+        changed[:] = True
+
+    new_ids = current.index.difference(previous.index)
+    rows = current.loc[new_ids.append(changed.index[changed])].assign(deleted=False)
+    removed = previous.loc[previous.index.difference(current.index)].reindex(columns=current.columns).assign(deleted=True)
+    return pd.concat([rows, removed]).reset_index()
+
+def _schema_changed(previous: pd.DataFrame, current: pd.DataFrame) -> bool:
+    """Whether `previous` was written with different columns, e.g. before player_uid existed."""
+    return set(previous.columns.drop('deleted', errors='ignore')) != set(current.columns)
+
+def _persist_delta(delta: pd.DataFrame) -> Path:
+    _delta_dir().mkdir(parents=True, exist_ok=True)
+    path = _delta_dir() / f"players_delta_{_today()}.parquet"
+    if path.exists():
+        # A forced rerun on the same day adds to that day's delta
+        delta = pd.concat([pd.read_parquet(path), delta]).drop_duplicates(subset=['sleeper_id'], keep='last')
+    delta.to_parquet(path, index=False)
     return path
 
 # Format the DataFrame for Parquet storage, ensuring required fields are present.
 def _format_parquet(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.dropna(subset=['team'])
+    df = df.dropna(subset=['team']).copy()
     df.loc[:, 'display_name'] = df['first_name'] + ' ' + df['last_name']
-    df['normalized_name'] = df['display_name'].apply(normalize_name)
+    df['normalized_name'] = normalize_names(df['display_name'])
     df = df[['sleeper_id', 'gsis_id', 'active', 'college', 'number', 'position', 'age', 'team', 'display_name', 'normalized_name', 'first_name', 'last_name']]
     return df
 
+# Assign each player a stable player_uid and record their IDs in the crosswalk.
+def _register(df: pd.DataFrame) -> pd.DataFrame:
+    resolver = IdentityResolver.load()
+    df.insert(0, 'player_uid', resolver.register(df))
+    if resolver.changed:
+        resolver.save()
+    return df
+
 # Main function to fetch, format, and persist the player data.
-def main(force: bool = False) -> None:
-    today = datetime.now(timezone.utc).date()
-    already = config.PLAYERS_DIR / f"all_players_{today}.parquet"
-    if already.exists() and not force:
+def main(force: bool = False, full: bool = False, compact_after: int = config.PLAYER_DELTA_COMPACT_AFTER) -> None:
+    already = todays_file()
+    if already and not force:
         print(f"[info] Already cached: {already}")
         return
 
     df   = _fetch()
 
     df   = _format_parquet(df)
-    path = _persist(df)
-    print(f"[ok] Saved {len(df):,} rows to {path}")
+    df   = _register(df)
+    previous = None if full else data_service.load_player_directory()
+    if previous is None or _schema_changed(previous, df):
+        # Deltas are only written against a snapshot with the same columns
+        path = _persist(df)
+        print(f"[ok] Saved {len(df):,} rows to {path}")
+        return
+
+    delta = _diff(previous, df)
+    if len(list(_delta_dir().glob("*.parquet"))) + 1 >= compact_after:
+        path = _persist(df)
+        print(f"[ok] Compacted {len(delta):,} changed rows into {path}")
+        return
+    path = _persist_delta(delta)
+    print(f"[ok] Saved {len(delta):,} changed rows to {path}")
 
 
 if __name__ == "__main__":
@@ -62,5 +190,6 @@ if __name__ == "__main__":
     ap = argparse.ArgumentParser(description="Cache Sleeper all-players list")
     ap.add_argument("--force", action="store_true",
                     help="Ignore existing copy and refetch")
+    ap.add_argument("--full", action="store_true",
+                    help="Write a full snapshot instead of a delta")
     sys.exit(main(**vars(ap.parse_args())))
-    
\ No newline at end of file
@@ -1,72 +1,100 @@
 """
-This script processes NFL player statistics for a given season, separates them by position,
-and saves the data into position-specific Parquet files.
+This script ingests NFL seasonal player statistics for one or more seasons into a
+Hive-partitioned Parquet dataset (data/nfl_stats/seasonal/season=YYYY/position=XX/).
+
+Files are written with dictionary encoding and row-group statistics, so scans through
+data_service.scan_stats only read the partitions, columns and row groups a query needs.
+Re-ingesting a season replaces its partitions.
+
+    python -m backend.ingest.ingest_stats --seasons 2019 2020 2021 2022 2023 2024
 """
 import nfl_data_py as nfl
 import pandas as pd
-from backend import config
-from backend.utils import normalize_name
+import pyarrow as pa
+import pyarrow.dataset as ds
+from backend.services import data_service
+from backend.utils import normalize_names
 from .stat_columns import player_columns, qb_columns, rb_columns, wr_columns
 import logging
-import re
 
-def process_position(df: pd.DataFrame, position: str, columns: list[str], sort_by: str, season: int):
+# Stat columns and the column each position's rows are sorted by
+POSITION_STATS = {
+    'QB': {'cols': qb_columns, 'sort': 'passing_yards'},
+    'RB': {'cols': rb_columns, 'sort': 'rushing_yards'},
+    'WR': {'cols': wr_columns, 'sort': 'receiving_yards'},
+    'TE': {'cols': wr_columns, 'sort': 'receiving_yards'} # TEs use WR columns
+}
+PARTITIONING = ds.partitioning(pa.schema([('season', pa.int16()), ('position', pa.string())]), flavor='hive')
+ROWS_PER_GROUP = 16384
+
+def process_position(players_df: pd.DataFrame, seasonal_df: pd.DataFrame, position: str, columns: list[str], sort_by: str) -> pd.DataFrame:
     """
-    Filters, processes, and saves data for a specific position.
+    Joins one position's players to their seasonal stats, every season at once.
     """
     logging.info(f"Processing stats for {position}s...")
-    
-    # Filter for position and merge with stats
-    pos_df = df[df['position'] == position].copy()
-    pos_df = pos_df.merge(seasonal_data[columns], on='player_id', how='inner')
-    
-    # Clean and sort data
-    pos_df.dropna(subset=[sort_by, 'display_name'], inplace=True)
-    pos_df.sort_values(by=sort_by, ascending=False, inplace=True)
-    
-    # Save to file
-    output_path = config.STATS_DIR / f"nfl_stats_{position.lower()}s_{season}.parquet"
-    pos_df.to_parquet(output_path, index=False)
-    logging.info(f"Saved {position} stats to {output_path}")
+    pos_df = players_df[players_df['position'] == position]
+    pos_df = pos_df.merge(seasonal_df[columns], on='player_id', how='inner')
 
-def main(season: int = 2024) -> None:
+    # Clean and sort data; sorted row groups give tight min/max statistics
+    pos_df = pos_df.dropna(subset=[sort_by, 'display_name'])
+    return pos_df.sort_values(by=['season', sort_by], ascending=[True, False])
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
     """
-    Main function to ingest and process seasonal NFL stats.
+    Converts the stats frame to Arrow with a fixed schema, so files written
+    by different runs always agree: numbers as float64, everything else as string.
     """
+    stat_columns = {c for details in POSITION_STATS.values() for c in details['cols']} - {'player_id', 'season', 'season_type'}
+    df = df.copy()
+    for column in df.columns:
+        if column in stat_columns:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('float64')
+        elif column == 'season':
+            df[column] = df[column].astype('int16')
+        elif pd.api.types.is_numeric_dtype(df[column]) and not pd.api.types.is_bool_dtype(df[column]):
+            df[column] = df[column].astype('float64')
+        else:
+            df[column] = df[column].astype('string')
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+def _write(table: pa.Table) -> None:
+    ds.write_dataset(
+        table,
+        data_service.stats_dataset_dir(),
+        format='parquet',
+        partitioning=PARTITIONING,
+        basename_template='part-{i}.parquet',
+        existing_data_behavior='delete_matching',
+        max_rows_per_group=ROWS_PER_GROUP,
+        file_options=ds.ParquetFileFormat().make_write_options(use_dictionary=True, write_statistics=True, compression='zstd'),
+    )
+
+def main(seasons: list[int] | int = 2024) -> None:
+    """
+    Main function to ingest and process seasonal NFL stats for the given seasons.
+    """
+    seasons = [seasons] if isinstance(seasons, int) else list(seasons)
     try:
-        config.STATS_DIR.mkdir(parents=True, exist_ok=True)
+        # 1. Import base data once for every season
+        logging.info(f"Importing seasonal data for {seasons}...")
+        seasonal_df = nfl.import_seasonal_data(seasons)
 
-        # 1. Import base data once
-        logging.info(f"Importing seasonal data for {season}...")
-        global seasonal_data
-        seasonal_data = nfl.import_seasonal_data([season])
-        
         logging.info("Importing player data...")
         players_df = nfl.import_players()[player_columns].rename(columns={'gsis_id': 'player_id'})
-        players_df['normalized_name'] = players_df['display_name'].apply(normalize_name) # Apply normalization here
-
-        # 2. Define position-specific processing details
-        positions_to_process = {
-            'QB': {'cols': qb_columns, 'sort': 'passing_yards'},
-            'RB': {'cols': rb_columns, 'sort': 'rushing_yards'},
-            'WR': {'cols': wr_columns, 'sort': 'receiving_yards'},
-            'TE': {'cols': wr_columns, 'sort': 'receiving_yards'} # TEs use WR columns
-        }
+        players_df['normalized_name'] = normalize_names(players_df['display_name'])
 
-        # 3. Loop and process each position
-        for position, details in positions_to_process.items():
-            process_position(
-                df=players_df,
-                position=position,
-                columns=details['cols'],
-                sort_by=details['sort'],
-                season=season
-            )
-
-        logging.info("All positions processed successfully.")
+        # 2. Join each position to its stats and write every partition in one pass
+        frames = [process_position(players_df, seasonal_df, position, details['cols'], details['sort'])
+                  for position, details in POSITION_STATS.items()]
+        _write(_to_table(pd.concat(frames, ignore_index=True)))
+        logging.info(f"Saved stats for seasons {seasons} to {data_service.stats_dataset_dir()}")
 
     except Exception as e:
         logging.error(f"An unexpected error occurred in ingest_stats: {e}")
 
 if __name__ == "__main__":
-    main(2024)
\ No newline at end of file
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Ingest NFL seasonal stats into the partitioned stats dataset")
+    ap.add_argument("--seasons", type=int, nargs='+', default=[2024], help="Seasons to ingest (default: 2024)")
+    main(**vars(ap.parse_args()))
@@ -1,48 +1,74 @@
+"""
+Queries the ingested data from the command line.
+
+    python -m backend.print_parquet players --name allen --pos QB
+    python -m backend.print_parquet stats --pos RB --season 2023 2024 --columns display_name season rushing_yards
+    python -m backend.print_parquet adp --format HalfPPR --pos WR --limit 24 --output csv > wr_adp.csv
+
+Name, position and season filters and the column list are pushed down into
+the Parquet scans, so only the matching row groups and requested columns are read.
+"""
+import sys
 import pandas as pd
+import pyarrow as pa
 from backend.services import data_service
 
-def print_parquet_file(folder: str, pos: str = "QB", format: str = "PPR", player_name: str = None, season: int = 2024) -> None:
-    """Print the contents of a Parquet file, optionally filtering by player name."""
-    df = None
-    print(f"Attempting to load data for folder: '{folder}'")
+FOLDERS = ["players", "stats", "adp", "players_adp"]
+OUTPUTS = ["table", "csv", "json"]
 
+def query(folder: str, pos: str | None = None, format: str = "PPR", player_name: str | None = None,
+          season: int | list[int] = 2024, columns: list[str] | None = None, limit: int | None = None) -> pd.DataFrame | None:
+    """Runs one query against a data folder, returning None if it has no data."""
     if folder == "players":
-        df = data_service.load_all_players()
+        return data_service.load_all_players(player_name, pos, columns, limit)
     elif folder == "stats":
-        df = data_service.load_stats_data(pos, season)
+        return data_service.load_stats_data(pos, season, player_name, columns, limit)
     elif folder == "adp":
-        df = data_service.load_raw_adp_data(format)
+        return data_service.load_raw_adp_data(format, player_name, pos, columns, limit)
     elif folder == "players_adp":
-        df = data_service.load_adp_data()
-    else:
-        raise ValueError("Invalid folder specified. Choose from 'players', 'stats', 'adp', or 'players_adp'.")
+        return data_service.load_adp_data(columns, player_name, pos, limit)
+    raise ValueError(f"Invalid folder specified. Choose from {', '.join(repr(f) for f in FOLDERS)}.")
 
-    if df is None:
-        print(f"No data found for the specified criteria.")
+def print_parquet_file(folder: str, pos: str | None = None, format: str = "PPR", player_name: str | None = None,
+                       season: int | list[int] = 2024, columns: list[str] | None = None, limit: int | None = None,
+                       output: str = "table") -> None:
+    """
+    Prints the rows of a data folder matching the filters. Without a name
+    filter only the first 10 rows are read unless `limit` says otherwise.
+    """
+    if limit is None and not player_name:
+        limit = 10
+    try:
+        df = query(folder, pos, format, player_name, season, columns, limit)
+    except (pa.ArrowInvalid, KeyError) as e:
+        print(f"[Error] {e}", file=sys.stderr)
         return
 
-    if player_name:
-        # Filter by player name if provided
-        filtered_df = df[df['display_name'].str.contains(player_name, case=False, na=False)]
-        if not filtered_df.empty:
-            print(filtered_df)
-        else:
-            print(f"No player found with the name '{player_name}'.")
+    if df is None or df.empty:
+        print("No data found for the specified criteria.", file=sys.stderr)
+        return
+
+    if output == "csv":
+        df.to_csv(sys.stdout, index=False)
+    elif output == "json":
+        print(df.to_json(orient='records'))
     else:
-        print(df.head(10))  # Print first 10 rows for brevity
-    
-    print("\nColumns:", df.columns.tolist())  # Print column names
+        print(df.to_string(index=False))
+        print("\nColumns:", df.columns.tolist())
 
 if __name__ == "__main__":
     import argparse
-    parser = argparse.ArgumentParser(description="Print contents of a Parquet file.")
-    parser.add_argument("folder", choices=["players", "stats", "adp", "players_adp"], help="Folder to read from")
-    parser.add_argument("--pos", default="QB", help="Position for stats (default: QB)")
-    parser.add_argument("--format", default="PPR", help="Format for ADP (default: PPR)")
-    parser.add_argument("--name", help="Filter by player name (case-insensitive)")
-    parser.add_argument("--season", type=int, default=2024, help="Season for stats (default: 2024)")
+    parser = argparse.ArgumentParser(description="Query the ingested Parquet data.")
+    parser.add_argument("folder", choices=FOLDERS, help="Folder to read from")
+    parser.add_argument("--pos", help="Only players at this position")
+    parser.add_argument("--format", default="PPR", help="Format for raw ADP (default: PPR)")
+    parser.add_argument("--name", help="Filter by player name (case-insensitive substring)")
+    parser.add_argument("--season", type=int, nargs='+', default=[2024], help="Season(s) for stats (default: 2024)")
+    parser.add_argument("--columns", nargs='+', help="Columns to read (default: all)")
+    parser.add_argument("--limit", type=int, help="Maximum rows (default: 10, or every match with --name)")
+    parser.add_argument("--output", choices=OUTPUTS, default="table", help="Output format (default: table)")
 
     args = parser.parse_args()
 
-    print_parquet_file(args.folder, args.pos, args.format, player_name=args.name, season=args.season)
-
+    print_parquet_file(args.folder, args.pos, args.format, player_name=args.name, season=args.season,
+                       columns=args.columns, limit=args.limit, output=args.output)
@@ -0,0 +1,137 @@
+"""
+HTTP draft assistant: the big board, picks and VONA for many concurrent
+draft sessions, served from warm in-memory boards.
+
+    uvicorn backend.server:app --port 8000
+
+Board queries and picks are answered on the event loop from the session's
+arrays. Boards that were not warmed are built on a thread, and VONA rollouts
+run in a process pool (config.SERVER_VONA_WORKERS) that is given the warm
+boards once at startup, so neither delays another session's board query.
+"""
+import asyncio
+import math
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Literal
+import pandas as pd
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+from backend import config
+from backend.services.session_service import DraftSession, SessionStore, init_worker, run_vona
+
+
+class SessionCreate(BaseModel):
+    format: str = config.DEFAULT_DRAFT_FORMAT
+    teams: int = Field(config.DEFAULT_TEAMS, ge=2, le=32)
+    rounds: int = Field(config.DEFAULT_ROUNDS, ge=1, le=40)
+    order: Literal['snake', 'normal'] = 'snake'
+    user_slot: int = Field(1, ge=1)
+
+
+class PickCreate(BaseModel):
+    player: str | None = None
+    sleeper_id: str | None = None
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    """DataFrame rows as JSON-safe dicts: NaN and missing values become None."""
+    records = df.reset_index(drop=True).to_dict('records')
+    return [{key: None if value is None or (isinstance(value, float) and math.isnan(value)) or value is pd.NA else value
+             for key, value in record.items()} for record in records]
+
+
+def create_app(store: SessionStore | None = None, executor: Executor | None = None, warm: bool = True) -> FastAPI:
+    """
+    Builds the service around a session store. Without an executor a process
+    pool of config.SERVER_VONA_WORKERS is started with the app, holding the
+    boards built so far, and shut down with it. With `warm`, the default
+    boards are built before serving.
+    """
+    store = store or SessionStore()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        if warm:
+            store.warm()
+        if executor is None:
+            pool = ProcessPoolExecutor(max_workers=config.SERVER_VONA_WORKERS, initializer=init_worker, initargs=(dict(store.boards),))
+            app.state.worker_boards = frozenset(store.boards)
+        else:
+            pool = executor
+            app.state.worker_boards = frozenset()
+        app.state.executor = pool
+        try:
+            yield
+        finally:
+            if executor is None:
+                pool.shutdown(cancel_futures=True)
+
+    app = FastAPI(title="Ground Game draft assistant", lifespan=lifespan)
+    app.state.store = store
+
+    def get_session(session_id: str) -> DraftSession:
+        try:
+            return store.get(session_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail=f"No session '{session_id}'.")
+
+    @app.post("/sessions", status_code=201)
+    async def create_session(request: SessionCreate) -> dict:
+        try:
+            # A board that was not warmed takes seconds to build, so it is built off the event loop
+            session = await asyncio.to_thread(store.create, request.format, request.teams, request.rounds,
+                                              request.order, request.user_slot)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return session.summary()
+
+    @app.get("/sessions/{session_id}")
+    async def get_session_summary(session_id: str) -> dict:
+        session = get_session(session_id)
+        return dict(session.summary(), picks=session.picks)
+
+    @app.delete("/sessions/{session_id}", status_code=204)
+    async def delete_session(session_id: str) -> None:
+        get_session(session_id)
+        store.delete(session_id)
+
+    @app.post("/sessions/{session_id}/picks", status_code=201)
+    async def make_pick(session_id: str, request: PickCreate) -> dict:
+        session = get_session(session_id)
+        try:
+            pick = session.pick(request.player, request.sleeper_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        except LookupError as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        return dict(pick, session=session.summary())
+
+    @app.get("/sessions/{session_id}/board")
+    async def get_board(session_id: str, position: str | None = None, sort: str | None = None,
+                        ascending: bool | None = None, limit: int = 20, offset: int = 0) -> dict:
+        session = get_session(session_id)
+        try:
+            board = session.board(position, sort, ascending, max(1, min(limit, 500)), max(0, offset))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {'pick_count': session.pick_count, 'players': _records(board)}
+
+    @app.post("/sessions/{session_id}/vona")
+    async def request_vona(session_id: str, futures: int = config.VONA_FUTURES, seed: int | None = None) -> dict:
+        session = get_session(session_id)
+        picks = session.pick_count
+        vona = await run_vona(session, app.state.executor, max(1, min(futures, 10 * config.VONA_FUTURES)), seed,
+                              app.state.worker_boards)
+        if vona is None:
+            raise HTTPException(status_code=409, detail="No later user turn to compare against.")
+        board = session.draft.players
+        result = vona.assign(row_id=board.index.get_indexer(vona.index), display_name=board['display_name'].reindex(vona.index))
+        result = result.sort_values(by='VONA', ascending=False, kind='stable')
+        return {'pick_count': picks, 'current': session.pick_count == picks,
+                'players': _records(result[['row_id', 'display_name', 'VONA', 'SURVIVAL']])}
+
+    return app
+
+
+app = create_app()
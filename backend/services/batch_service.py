@@ -0,0 +1,288 @@
+"""
+Headless batch league simulation: runs many fully automated drafts across
+worker processes and streams the pick logs and final rosters to Parquet.
+"""
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from backend import config
+from .draft import Draft, Team
+from .draft_service import get_team_index, get_user_picks
+from .simulation_service import cpu_pick_kernel, user_auto_pick_kernel
+from .vona_service import evaluate_vona
+
+# Output tables are Hive-partitioned by draft slot (slot=1, slot=2, ...), so
+# the slot is stored in the directory name rather than in the files.
+PARTITION_COLUMN = 'slot'
+
+PICK_SCHEMA = pa.schema([
+    ('league_id', pa.int64()),
+    ('pick', pa.int16()),
+    ('round', pa.int16()),
+    ('sleeper_id', pa.string()),
+    ('display_name', pa.string()),
+    ('position', pa.string()),
+    ('points', pa.float64()),
+    ('VORP', pa.float64()),
+    ('ADP', pa.float64()),
+])
+
+ROSTER_SCHEMA = pa.schema([
+    ('league_id', pa.int64()),
+    ('roster_slot', pa.string()),
+    ('display_name', pa.string()),
+    ('position', pa.string()),
+    ('points', pa.float64()),
+    ('VORP', pa.float64()),
+])
+
+
+class PartitionedWriter:
+    """
+    Buffers rows for one output table and writes them out one row group per
+    flush, with a Parquet file per draft slot partition. Only the current
+    buffer is held in memory, however many leagues are written.
+    """
+    def __init__(self, root: Path, schema: pa.Schema, file_name: str):
+        self.root = root
+        self.schema = schema
+        self.file_name = file_name
+        self.columns = {name: [] for name in [PARTITION_COLUMN] + schema.names}
+        self.writers: dict = {}
+        self.rows_written = 0
+
+    def append(self, slot: int, row: tuple) -> None:
+        """Buffers one row, given in schema column order."""
+        self.columns[PARTITION_COLUMN].append(slot)
+        for name, value in zip(self.schema.names, row):
+            self.columns[name].append(value)
+
+    def flush(self) -> None:
+        """Writes the buffered rows as one row group in each slot's file."""
+        slots = np.asarray(self.columns[PARTITION_COLUMN])
+        if len(slots) == 0:
+            return
+        table = pa.table({name: self.columns[name] for name in self.schema.names}, schema=self.schema)
+        for slot in np.unique(slots):
+            writer = self.writers.get(slot)
+            if writer is None:
+                partition_dir = self.root / f"{PARTITION_COLUMN}={slot}"
+                partition_dir.mkdir(parents=True, exist_ok=True)
+                writer = pq.ParquetWriter(partition_dir / self.file_name, self.schema)
+                self.writers[slot] = writer
+            writer.write_table(table.filter(pa.array(slots == slot)))
+        self.rows_written += len(slots)
+        self.columns = {name: [] for name in self.columns}
+
+    def close(self) -> None:
+        """Flushes any buffered rows and closes every partition file."""
+        self.flush()
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+
+def simulate_league(
+    draft: Draft,
+    rng: np.random.Generator,
+    auto_slot: int | None = None,
+    vona_futures: int = 0
+) -> tuple[list, list]:
+    """
+    Runs one complete draft with no console output. Every team is a CPU except
+    `auto_slot` (1-based), which drafts with the user auto-pick logic. Picks go
+    through the same kernels as `simulate_cpu_pick` and `simulate_user_auto_pick`,
+    applied to the draft's arrays rather than a filtered DataFrame per pick.
+
+    Args:
+        draft: A fresh draft; it is modified in place.
+        rng: Generator for every random draw in the league.
+        auto_slot: Draft slot that auto-picks like the user, or None for all CPUs.
+        vona_futures: Futures behind the auto-pick's VONA estimate. With 0 the
+            auto-pick ranks on VORP, ADP and need alone.
+
+    Returns:
+        The pick log as (slot, row) pairs in PICK_SCHEMA order, and the final
+        rosters as (slot, row) pairs in ROSTER_SCHEMA order without league_id.
+    """
+    players, state = draft.players, draft.state
+    adp = state.adp if state.has_adp else None
+    teams_list = [Team(draft.roster) for _ in range(draft.teams)]
+    auto_picks = get_user_picks(auto_slot, draft.order, draft.teams, draft.rounds) if auto_slot else []
+    # Row ID of the player in each filled roster slot, per team; names can repeat
+    slot_rows: list[dict] = [{} for _ in range(draft.teams)]
+    picks = []
+
+    for pick_num in range(1, draft.teams * draft.rounds + 1):
+        team_index = get_team_index(pick_num, draft.teams, draft.order)
+        team = teams_list[team_index]
+        ids = draft.available_ids()
+        if len(ids) == 0:
+            break
+
+        position = state.position[ids]
+        needs = team.starting_needs_mask()
+        qb_count = team.count_players_at_position('QB')
+        if pick_num in auto_picks:
+            vona = np.zeros(len(ids))
+            next_index = auto_picks.index(pick_num) + 1
+            picks_to_simulate = auto_picks[next_index] - 1 - pick_num if next_index < len(auto_picks) else 0
+            if vona_futures > 0 and picks_to_simulate > 0:
+                vona = evaluate_vona(draft, teams_list, picks_to_simulate, pick_num,
+                                     n_futures=vona_futures, seed=int(rng.integers(2**63)))['VONA'].to_numpy()
+            pick_index = user_auto_pick_kernel(position, vona, state.vorp[ids], state.adp[ids], needs, qb_count)
+        else:
+            pick_index = cpu_pick_kernel(position, state.vorp[ids], None if adp is None else adp[ids], needs, qb_count, rng)
+
+        row_id = ids[pick_index]
+        player_name = players['display_name'].iat[row_id]
+        pos = draft.draft_row(row_id)
+        slot = team.add_player(player_name, pos)
+        if slot is not None:
+            slot_rows[team_index][slot] = row_id
+        picks.append((team_index + 1, (
+            pick_num, (pick_num - 1) // draft.teams + 1, _sleeper_id(players, row_id), player_name, pos,
+            state.points[row_id], state.vorp[row_id], state.adp[row_id]
+        )))
+
+    rosters = []
+    for team_index, team in enumerate(teams_list):
+        for slot, (roster_slot, player_name) in enumerate(team.roster.items()):
+            row_id = slot_rows[team_index].get(slot)
+            if row_id is None:
+                rosters.append((team_index + 1, (roster_slot, player_name, None, np.nan, np.nan)))
+            else:
+                rosters.append((team_index + 1, (
+                    roster_slot, player_name, players['position'].iat[row_id],
+                    state.points[row_id], state.vorp[row_id]
+                )))
+    return picks, rosters
+
+
+def _sleeper_id(players: pd.DataFrame, row_id: int) -> str | None:
+    if 'sleeper_id' not in players.columns:
+        return None
+    value = players['sleeper_id'].iat[row_id]
+    return None if pd.isna(value) else str(value)
+
+
+def run_chunk(
+    draft: Draft,
+    output_dir: Path,
+    chunk_id: int,
+    first_league: int,
+    n_leagues: int,
+    seed_sequence: np.random.SeedSequence,
+    auto_slot: int | None = None,
+    vona_futures: int = 0,
+    row_group_leagues: int = config.BATCH_ROW_GROUP_LEAGUES
+) -> int:
+    """
+    Simulates a contiguous block of leagues from a fresh copy of `draft` each,
+    writing part-{chunk_id} files under output_dir/picks and output_dir/rosters.
+
+    Returns:
+        The number of leagues simulated.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    file_name = f"part-{chunk_id:05d}.parquet"
+    pick_writer = PartitionedWriter(Path(output_dir) / "picks", PICK_SCHEMA, file_name)
+    roster_writer = PartitionedWriter(Path(output_dir) / "rosters", ROSTER_SCHEMA, file_name)
+    try:
+        for i in range(n_leagues):
+            league_id = first_league + i
+            picks, rosters = simulate_league(draft.copy(), rng, auto_slot, vona_futures)
+            for slot, row in picks:
+                pick_writer.append(slot, (league_id,) + row)
+            for slot, row in rosters:
+                roster_writer.append(slot, (league_id,) + row)
+            if (i + 1) % row_group_leagues == 0:
+                pick_writer.flush()
+                roster_writer.flush()
+    finally:
+        pick_writer.close()
+        roster_writer.close()
+    return n_leagues
+
+
+# The base draft shipped to each worker process by the pool initializer
+_worker_draft: Draft | None = None
+
+
+def _init_worker(draft: Draft) -> None:
+    global _worker_draft
+    _worker_draft = draft
+
+
+def _run_chunk(*args) -> int:
+    return run_chunk(_worker_draft, *args)
+
+
+def simulate_leagues(
+    draft: Draft,
+    n_leagues: int,
+    output_dir: str | Path,
+    seed: int | None = None,
+    workers: int = 1,
+    auto_slot: int | None = None,
+    vona_futures: int = 0,
+    chunk_leagues: int = config.BATCH_CHUNK_LEAGUES,
+    row_group_leagues: int = config.BATCH_ROW_GROUP_LEAGUES
+) -> dict:
+    """
+    Runs `n_leagues` independent drafts from the same starting board and
+    streams the results to Hive-partitioned Parquet under `output_dir`:
+
+        picks/slot=<n>/part-<chunk>.parquet    one row per pick
+        rosters/slot=<n>/part-<chunk>.parquet  one row per roster slot
+
+    Leagues run in chunks of `chunk_leagues`, each with its own RNG stream
+    spawned from `seed`, so the output does not depend on `workers`.
+
+    Args:
+        draft: The undrafted starting draft; it is copied for every league.
+        n_leagues: Number of leagues to simulate.
+        output_dir: Destination directory. It must not already contain results.
+        seed: Root seed for the chunk streams.
+        workers: Worker processes; 1 runs in this process.
+        auto_slot: Draft slot that auto-picks like the user, or None for all CPUs.
+        vona_futures: Futures behind the auto-pick's VONA estimate.
+        chunk_leagues: Leagues per task and per output file.
+        row_group_leagues: Leagues per Parquet row group.
+
+    Returns:
+        A summary with the league count, elapsed seconds and drafts per second.
+    """
+    output_dir = Path(output_dir)
+    if output_dir.exists() and any(output_dir.iterdir()):
+        raise FileExistsError(f"Output directory {output_dir} is not empty.")
+
+    starts = list(range(0, n_leagues, chunk_leagues))
+    sizes = [min(chunk_leagues, n_leagues - start) for start in starts]
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    chunk_args = [
+        (output_dir, chunk_id, start, size, seed_sequence, auto_slot, vona_futures, row_group_leagues)
+        for chunk_id, (start, size, seed_sequence) in enumerate(zip(starts, sizes, seeds))
+    ]
+
+    started = time.perf_counter()
+    if workers <= 1 or len(chunk_args) <= 1:
+        completed = sum(run_chunk(draft, *args) for args in chunk_args)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(draft,)) as pool:
+            completed = sum(pool.map(_run_chunk, *zip(*chunk_args)))
+    elapsed = time.perf_counter() - started
+
+    drafts_per_second = completed / elapsed if elapsed > 0 else float('inf')
+    logging.info(f"Simulated {completed} leagues in {elapsed:.1f}s ({drafts_per_second:.2f} drafts/s)")
+    return {
+        'leagues': completed,
+        'seconds': elapsed,
+        'drafts_per_second': drafts_per_second,
+        'output_dir': str(output_dir),
+    }
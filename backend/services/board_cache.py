@@ -0,0 +1,86 @@
+"""
+On-disk cache of built big boards, keyed on league settings and the input
+files they were built from.
+"""
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+import pandas as pd
+from backend import config
+from backend.utils import file_fingerprint
+
+# Bump when the big board build logic changes so old entries are ignored
+CACHE_VERSION = 3
+
+# The board's row labels are written as an ordinary column so they round-trip
+# identically whichever parquet engine pandas picks.
+INDEX_COLUMN = '__board_index__'
+
+
+def cache_key(settings: dict, input_files: list) -> str:
+    """
+    Builds a cache key from the board settings and the fingerprints of its input
+    files. Any new or rewritten input produces a different key.
+    """
+    payload = {
+        'version': CACHE_VERSION,
+        'settings': settings,
+        'inputs': [file_fingerprint(path) for path in input_files],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()[:32]
+
+
+def _entry_path(key: str) -> Path:
+    return config.BOARD_CACHE_DIR / f"{key}.parquet"
+
+
+def load(key: str) -> pd.DataFrame | None:
+    """Loads a cached board, marking it as recently used. Returns None on a miss."""
+    path = _entry_path(key)
+    if not path.exists():
+        return None
+    try:
+        board = pd.read_parquet(path).set_index(INDEX_COLUMN).rename_axis(None)
+    except Exception as e:
+        logging.warning(f"Ignoring unreadable cached big board {path}: {e}")
+        return None
+    os.utime(path) # Recency for LRU eviction
+    logging.info(f"Loaded big board from cache: {path}")
+    return board
+
+
+def store(key: str, board: pd.DataFrame) -> Path:
+    """Writes a board to the cache atomically, then evicts old entries."""
+    config.BOARD_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _entry_path(key)
+    tmp_path = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+    board.rename_axis(INDEX_COLUMN).reset_index().to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    prune()
+    return path
+
+
+def prune(max_bytes: int | None = None) -> list:
+    """
+    Deletes least recently used entries until the cache fits in `max_bytes`
+    (config.BOARD_CACHE_MAX_BYTES by default).
+
+    Returns:
+        The paths that were removed.
+    """
+    max_bytes = config.BOARD_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    if not config.BOARD_CACHE_DIR.exists():
+        return []
+    entries = sorted(config.BOARD_CACHE_DIR.glob("*.parquet"), key=lambda p: p.stat().st_mtime_ns)
+    total = sum(p.stat().st_size for p in entries)
+    removed = []
+    for path in entries:
+        if total <= max_bytes:
+            break
+        total -= path.stat().st_size
+        path.unlink()
+        removed.append(path)
+    return removed
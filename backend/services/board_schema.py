@@ -0,0 +1,114 @@
+"""
+Compact in-memory schema for big boards.
+
+Batch and parallel simulations keep many boards alive at once and ship them
+to worker processes, so the default pandas dtypes (Python strings, float64)
+dominate their memory. compact_board stores the same board with categorical
+strings, float32 values and small-int ranks, without changing any pick.
+"""
+import logging
+import numpy as np
+import pandas as pd
+
+# Value columns that may be stored as float32
+FLOAT_PREFIXES = ('fantasy_points_', 'VORP', 'avg_adp_', 'age')
+# Rank columns that may be stored as small nullable integers
+RANK_PREFIXES = ('ADP',)
+
+
+def _distinct(values: np.ndarray) -> int:
+    return len(np.unique(values[~np.isnan(values)]))
+
+
+def _compact_floats(column: pd.Series) -> pd.Series:
+    """
+    float32 copy of a column, or the column unchanged if the cast would make
+    two different values equal. Rounding to float32 never reorders values, so
+    without new ties every sort, rank and pick on the column is unchanged.
+    Even values that differ only by float64 rounding noise count: the CPU
+    pick averages the ranks of tied values, so a new tie can change a pick.
+    """
+    values = pd.to_numeric(column, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    compact = values.astype(np.float32)
+    if _distinct(compact) != _distinct(values):
+        logging.info(f"Keeping '{column.name}' as float64: float32 would merge distinct values.")
+        return column
+    return pd.Series(compact, index=column.index, name=column.name)
+
+
+def _compact_ranks(column: pd.Series) -> pd.Series:
+    """Whole-number ranks as Int16 (nullable); anything else is treated as a float column."""
+    values = pd.to_numeric(column, errors='coerce')
+    present = values.dropna()
+    if len(present) and (present == present.round()).all() and present.abs().max() <= np.iinfo(np.int16).max:
+        return values.astype('Int16')
+    return _compact_floats(column)
+
+
+def _is_string_column(column: pd.Series) -> bool:
+    if isinstance(column.dtype, pd.StringDtype):
+        return True
+    if column.dtype != object:
+        return False
+    present = column.dropna()
+    return len(present) > 0 and present.map(type).eq(str).all()
+
+
+def compact_board(board: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns a copy of a big board in the compact schema:
+
+    - string columns (names, position, team, IDs) become categoricals, so each
+      distinct string is stored once in a side table and rows hold small codes
+    - points, VORP and average ADP become float32
+    - ADP ranks become Int16
+    - integer columns are downcast to the smallest integer type
+
+    Row order, index and column names are unchanged, so row IDs and every
+    lookup by name or Sleeper ID still match the original board.
+    """
+    compact = {}
+    for name in board.columns:
+        column = board[name]
+        if _is_string_column(column):
+            compact[name] = column.astype('category')
+        elif name.startswith(RANK_PREFIXES) and pd.api.types.is_numeric_dtype(column):
+            compact[name] = _compact_ranks(column)
+        elif name.startswith(FLOAT_PREFIXES) and pd.api.types.is_numeric_dtype(column):
+            compact[name] = _compact_floats(column)
+        elif pd.api.types.is_integer_dtype(column) and not pd.api.types.is_extension_array_dtype(column):
+            compact[name] = pd.to_numeric(column, downcast='integer')
+        else:
+            compact[name] = column
+    return pd.DataFrame(compact, index=board.index)
+
+
+def _copy_bytes(column: pd.Series) -> int:
+    """
+    Bytes a deep copy of the column allocates: its value, pointer or code
+    arrays. String objects and a categorical's side table are shared.
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.nbytes
+    return column.memory_usage(index=False, deep=False)
+
+
+def memory_report(board: pd.DataFrame, compact: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Measures each column of a board in the original and compact schemas:
+    'bytes' is everything the column holds, strings included, and
+    'copy_bytes' is what each further `copy()` of the board allocates for it.
+    The last row is the total.
+    """
+    compact = compact_board(board) if compact is None else compact
+    report = pd.DataFrame({
+        'dtype': board.dtypes.astype(str),
+        'bytes': board.memory_usage(index=False, deep=True),
+        'copy_bytes': [_copy_bytes(board[name]) for name in board.columns],
+        'compact_dtype': compact.dtypes.astype(str),
+        'compact_bytes': compact.memory_usage(index=False, deep=True),
+        'compact_copy_bytes': [_copy_bytes(compact[name]) for name in compact.columns],
+    }, index=board.columns)
+    totals = report.select_dtypes('number').sum()
+    report.loc['total'] = ['', totals['bytes'], totals['copy_bytes'], '', totals['compact_bytes'], totals['compact_copy_bytes']]
+    return report
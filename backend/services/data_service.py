@@ -1,35 +1,335 @@
 """
 Service for loading data from the file system.
+
+Lookups of the latest file in a directory are kept in a small in-process
+manifest that is revalidated against the directory's mtime, and Parquet files
+are loaded through memory-mapped Arrow IPC copies (data/arrow_cache/), so
+repeated loads of the same snapshot cost neither a glob nor a Parquet decode.
 """
 import glob
+import hashlib
 import logging
 import os
+import threading
+import uuid
+from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 from backend import config
+from backend.utils import file_fingerprint
+
+# Columns of The Athletic's projection CSVs that the big board reads
+ATHLETIC_SCHEMA = pa.schema([('Player', pa.string()), ('FPS', pa.float64())])
+
+_lock = threading.Lock()
+# glob pattern -> (directory mtime_ns, latest matching file)
+_manifest: dict = {}
+# source path -> (file fingerprint, memory-mapped Arrow table)
+_tables: dict = {}
+
+def clear_catalog() -> None:
+    """Forgets every memoized lookup and loaded table."""
+    with _lock:
+        _manifest.clear()
+        _tables.clear()
 
 def _get_latest_file(path_pattern: str) -> str | None:
-    """Gets the most recent file matching a glob pattern."""
+    """
+    Gets the most recent file matching a glob pattern. The answer is reused
+    until the directory's mtime changes, i.e. until a file is added or removed.
+    """
+    try:
+        version = os.stat(os.path.dirname(path_pattern)).st_mtime_ns
+    except FileNotFoundError:
+        version = None
+    with _lock:
+        entry = _manifest.get(path_pattern)
+    if version is not None and entry is not None and entry[0] == version:
+        return entry[1]
+
     files = glob.glob(path_pattern)
-    if not files:
+    latest = max(files, key=os.path.getctime) if files else None
+    if latest is None:
         logging.warning(f"No files found matching pattern: {path_pattern}")
+    if version is not None:
+        with _lock:
+            _manifest[path_pattern] = (version, latest)
+    return latest
+
+def _arrow_cache_path(path: str | Path, fingerprint: list) -> Path:
+    source = hashlib.sha256(str(Path(path).resolve()).encode()).hexdigest()[:8]
+    version = hashlib.sha256(repr(fingerprint).encode()).hexdigest()[:16]
+    return config.ARROW_CACHE_DIR / f"{Path(path).stem}-{source}-{version}.arrow"
+
+def _map_arrow(source: str | Path, fingerprint: list, read) -> pa.Table:
+    """
+    Memory-maps the Arrow IPC copy of a source, writing it with `read()`
+    first if this version of the source has not been converted yet.
+    """
+    cache_path = _arrow_cache_path(source, fingerprint)
+    if not cache_path.exists():
+        table = read()
+        config.ARROW_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        with pa.OSFile(str(tmp_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        os.replace(tmp_path, cache_path)
+        # Copies of older versions of the same source are no longer needed
+        prefix = cache_path.name.rsplit('-', 1)[0]
+        for old in config.ARROW_CACHE_DIR.glob(f"{prefix}-*.arrow"):
+            if old != cache_path:
+                try:
+                    old.unlink()
+                except OSError:
+                    pass
+    return pa.ipc.open_file(pa.memory_map(str(cache_path))).read_all()
+
+def _cached_table(source: str | Path, fingerprint: list, read) -> pa.Table:
+    """The memoized, memory-mapped table for one version of a source."""
+    with _lock:
+        entry = _tables.get(str(source))
+    if entry is not None and entry[0] == fingerprint:
+        return entry[1]
+    table = _map_arrow(source, fingerprint, read)
+    with _lock:
+        _tables[str(source)] = (fingerprint, table)
+    return table
+
+def load_table(path: str | Path, columns: list[str] | None = None) -> pa.Table:
+    """
+    Loads a Parquet file as an Arrow table. The table is memoized per file
+    version and backed by a memory map, so repeated loads do not read or copy
+    the file again;
+    `columns` selects columns without reading the others.
+    """
+    table = _cached_table(path, file_fingerprint(path), lambda: pq.read_table(path))
+    return table.select(columns) if columns is not None else table
+
+def load_frame(path: str | Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    Loads a Parquet file through load_table as a DataFrame the caller may
+    modify. Only the Arrow table is memory-mapped: converting it copies the
+    selected columns into pandas-owned blocks. `self_destruct` cannot be used
+    because the table is shared with later loads, nor `split_blocks`, whose
+    zero-copy columns would be read-only views of the map.
+    """
+    return load_table(path, columns).to_pandas()
+
+def get_latest_adp_path() -> str | None:
+    """Returns the path of the latest player ADP file."""
+    return _get_latest_file(str(config.PLAYER_ADP_DIR / "*_adp.parquet"))
+
+def name_filter(name: str, column: str = 'display_name') -> ds.Expression:
+    """Case-insensitive substring match on a name column, for use as a scan filter."""
+    return pc.match_substring(ds.field(column), name, ignore_case=True)
+
+def _all_of(*expressions) -> ds.Expression | None:
+    """ANDs together the expressions that are not None."""
+    combined = None
+    for expression in expressions:
+        if expression is not None:
+            combined = expression if combined is None else combined & expression
+    return combined
+
+def _scan(dataset: ds.Dataset, columns: list[str] | None = None, filter: ds.Expression | None = None,
+          limit: int | None = None) -> pa.Table:
+    """
+    Scans a dataset, reading only `columns` and the row groups `filter` can
+    match, and stops once `limit` matching rows have been found.
+    """
+    scanner = dataset.scanner(columns=columns, filter=filter)
+    return scanner.head(limit) if limit is not None else scanner.to_table()
+
+def _query(dataset: ds.Dataset, columns: list[str] | None = None, filter: ds.Expression | None = None,
+           limit: int | None = None) -> pd.DataFrame:
+    """_scan as a DataFrame."""
+    return _scan(dataset, columns, filter, limit).to_pandas()
+
+def load_adp_data(columns: list[str] | None = None, name: str | None = None, position: str | None = None,
+                  limit: int | None = None) -> pd.DataFrame | None:
+    """
+    Loads the latest player ADP data, optionally only some of its columns and
+    only the players matching a name and position. Unfiltered loads come from
+    the memory-mapped copy; filtered ones scan the Parquet file, so only the
+    row groups that can match are read.
+    """
+    latest_file = get_latest_adp_path()
+    if not latest_file:
         return None
-    return max(files, key=os.path.getctime)
+    logging.info(f"Loading ADP data from: {latest_file}")
+    if name is None and position is None and limit is None:
+        return load_frame(latest_file, columns)
+    filter = _all_of(name_filter(name) if name else None, ds.field('position') == position if position else None)
+    return _query(ds.dataset(latest_file, format='parquet'), columns, filter, limit)
 
-def load_adp_data() -> pd.DataFrame | None:
-    """Loads the latest player ADP data."""
-    path_pattern = str(config.PLAYER_ADP_DIR / "*_adp.parquet")
-    latest_file = _get_latest_file(path_pattern)
-    if latest_file:
-        logging.info(f"Loading ADP data from: {latest_file}")
-        return pd.read_parquet(latest_file)
-    return None
+def get_raw_adp_path(format: str) -> str | None:
+    """Returns the path of the latest FantasyPros ADP export for a scoring format."""
+    format = next((f for f in config.DRAFT_FORMATS if f.lower() == format.lower()), format)
+    return _get_latest_file(str(config.ADP_DIR / f"FantasyPros_*_{format}_ADP.parquet"))
+
+def load_raw_adp_data(format: str, name: str | None = None, position: str | None = None,
+                      columns: list[str] | None = None, limit: int | None = None) -> pd.DataFrame | None:
+    """
+    Scans the FantasyPros ADP export for a format. `position` matches the
+    position part of FantasyPros' positional rank (RB matches RB1, RB2, ...).
+    """
+    path = get_raw_adp_path(format)
+    if not path:
+        return None
+    filter = _all_of(name_filter(name, 'Player') if name else None,
+                     pc.starts_with(ds.field('POS'), position.upper()) if position else None)
+    return _query(ds.dataset(path, format='parquet'), columns, filter, limit)
+
+def get_player_directory_paths() -> list[str]:
+    """
+    The latest full Sleeper player directory snapshot followed by the delta
+    partitions written since, oldest first. Empty if nothing was ingested.
+    """
+    snapshots = sorted(glob.glob(str(config.PLAYERS_DIR / "all_players_*.parquet")))
+    if not snapshots:
+        return []
+    return snapshots[-1:] + sorted(glob.glob(str(config.PLAYERS_DIR / "deltas" / "players_delta_*.parquet")))
+
+def load_player_directory() -> pd.DataFrame | None:
+    """Loads the Sleeper player directory: the latest snapshot with its deltas applied."""
+    paths = get_player_directory_paths()
+    if not paths:
+        logging.warning(f"No player directory found in {config.PLAYERS_DIR}")
+        return None
+    frames = [load_frame(path) for path in paths]
+    if len(frames) == 1:
+        return frames[0]
+    # Later rows replace earlier ones; players flagged deleted drop out
+    players = pd.concat(frames, ignore_index=True).drop_duplicates(subset=['sleeper_id'], keep='last')
+    deleted = players['deleted'].fillna(False).astype(bool)
+    return players[~deleted].drop(columns='deleted').reset_index(drop=True)
+
+def load_all_players(name: str | None = None, position: str | None = None, columns: list[str] | None = None,
+                     limit: int | None = None) -> pd.DataFrame | None:
+    """
+    Queries the Sleeper player directory. Filters and columns are pushed down
+    into the Parquet scan of the snapshot and of each delta. A matching row is
+    kept only if no later delta has a row for the same player, so renamed or
+    removed players are current, and rows come back in load_player_directory's
+    order.
+    """
+    paths = get_player_directory_paths()
+    if not paths:
+        logging.warning(f"No player directory found in {config.PLAYERS_DIR}")
+        return None
+    filter = _all_of(name_filter(name) if name else None, ds.field('position') == position if position else None)
+    if len(paths) == 1:
+        return _query(ds.dataset(paths[0], format='parquet'), columns, filter, limit)
+
+    # IDs each delta supersedes: only the small delta files are read in full
+    datasets = [ds.dataset(path, format='parquet') for path in paths]
+    delta_ids = [_scan(dataset, ['sleeper_id']).column('sleeper_id') for dataset in datasets[1:]]
+    scan_columns = None if columns is None else list(dict.fromkeys([*columns, 'sleeper_id']))
+    tables = []
+    for i, dataset in enumerate(datasets):
+        later = pa.concat_arrays([ids.combine_chunks() for ids in delta_ids[i:]]) if i < len(delta_ids) else None
+        current = _all_of(filter, ~ds.field('deleted') if i > 0 else None)
+        # Up to len(later) of the rows read may be dropped as superseded
+        table = _scan(dataset, scan_columns, current, None if limit is None else limit + (len(later) if later is not None else 0))
+        if later is not None and len(later):
+            table = table.filter(pc.invert(pc.is_in(table.column('sleeper_id'), value_set=later)))
+        tables.append(table.select(scan_columns) if scan_columns is not None else table.drop_columns(['deleted'] if i > 0 else []))
+    players = pa.concat_tables(tables, promote_options='default').to_pandas()
+    players = players[columns] if columns is not None else players
+    return (players.head(limit) if limit is not None else players).reset_index(drop=True)
+
+def get_athletic_projections_path(position: str, format: str) -> Path:
+    """Returns the path of The Athletic's projections for a position and format."""
+    return config.DATA_DIR / "projections" / f"athletic_{position.lower()}_projections_{format.lower()}.csv"
+
+def _read_athletic_csv(path: Path) -> pa.Table:
+    """
+    Parses one Athletic projections CSV with fixed types for the columns the
+    board uses; any other columns keep Arrow's inferred types.
+    """
+    table = pacsv.read_csv(
+        path,
+        parse_options=pacsv.ParseOptions(delimiter='\t'),
+        convert_options=pacsv.ConvertOptions(column_types=ATHLETIC_SCHEMA, null_values=['', '-', 'NA', 'N/A']),
+    )
+    missing = [field.name for field in ATHLETIC_SCHEMA if field.name not in table.column_names]
+    if missing:
+        raise ValueError(f"Athletic projections {path} are missing columns: {missing}")
+    return table
+
+def _athletic_table(position: str, format: str) -> pa.Table | None:
+    """The typed, memory-mapped projections for one position and format, refreshed when the CSV changes."""
+    path = get_athletic_projections_path(position, format)
+    if not path.exists():
+        return None
+    return _cached_table(path, file_fingerprint(path), lambda: _read_athletic_csv(path))
 
 def load_athletic_projections(position: str, format: str) -> pd.DataFrame | None:
     """Loads The Athletic's projections for a given position and format."""
-    file_path = config.DATA_DIR / "projections" / f"athletic_{position.lower()}_projections_{format.lower()}.csv"
-    if file_path.exists():
-        return pd.read_csv(file_path, sep='\t')
-    return None
+    table = _athletic_table(position, format)
+    return table.to_pandas() if table is not None else None
+
+def load_athletic_projections_table(formats: list[str], positions: list[str]) -> pd.DataFrame:
+    """
+    Every format's and position's projections in one long table with format,
+    position, Player and FPS columns. The combined table is cached like the
+    per-file ones and rebuilt whenever any of the CSVs changes.
+    """
+    pairs = [(format, position) for format in formats for position in positions]
+    fingerprint = [file_fingerprint(get_athletic_projections_path(position, format)) for format, position in pairs]
 
+    def combine() -> pa.Table:
+        tables = []
+        for format, position in pairs:
+            table = _athletic_table(position, format)
+            if table is not None:
+                table = table.select([field.name for field in ATHLETIC_SCHEMA])
+                tables.append(table.add_column(0, 'format', pa.array([format] * len(table), pa.string()))
+                                   .add_column(1, 'position', pa.array([position] * len(table), pa.string())))
+        if not tables:
+            return pa.schema([('format', pa.string()), ('position', pa.string()), *ATHLETIC_SCHEMA]).empty_table()
+        return pa.concat_tables(tables)
 
+    return _cached_table("athletic_projections", fingerprint, combine).to_pandas()
+
+def stats_dataset_dir() -> Path:
+    """Root of the Hive-partitioned seasonal stats dataset (season=/position=)."""
+    return config.STATS_DIR / "seasonal"
+
+def scan_stats(
+    seasons: list[int] | range | None = None,
+    positions: list[str] | None = None,
+    columns: list[str] | None = None,
+    filter: ds.Expression | None = None,
+    limit: int | None = None
+) -> pd.DataFrame | None:
+    """
+    Scans the seasonal stats dataset. Season and position filters prune whole
+    partitions, `columns` limits the columns read, and `filter` (a pyarrow
+    expression, e.g. `ds.field('rushing_yards') > 1000`) is checked against
+    row-group statistics before any rows are decoded. The scan stops after
+    `limit` matching rows.
+
+    Returns:
+        The matching rows, with season and position as ordinary columns, or
+        None if no stats have been ingested.
+    """
+    root = stats_dataset_dir()
+    if not root.exists():
+        logging.warning(f"No stats dataset found at {root}")
+        return None
+    dataset = ds.dataset(root, format='parquet', partitioning='hive')
+    expression = _all_of(filter, *[ds.field(field).isin(list(values))
+                                   for field, values in [('season', seasons), ('position', positions)] if values is not None])
+    return _query(dataset, columns, expression, limit)
 
+def load_stats_data(pos: str | None = None, season: int | list[int] | None = None, name: str | None = None,
+                    columns: list[str] | None = None, limit: int | None = None) -> pd.DataFrame | None:
+    """Queries seasonal stats for a position and season(s), optionally by player name."""
+    seasons = [season] if isinstance(season, int) else season
+    return scan_stats(seasons, [pos.upper()] if pos else None, columns,
+                      name_filter(name) if name else None, limit)
@@ -1,11 +1,18 @@
+from functools import lru_cache
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Set
-from backend import config
+from typing import List, Dict, FrozenSet, Set, Tuple
+from backend import config, utils
+from .draft_state import DraftState, POSITION_CODES, OTHER_POSITION
+from .vorp_index import VorpIndex
 
 class Draft:
     """
     Manages the state of a fantasy football draft, including available players,
     drafted players, and draft settings.
+
+    Availability is tracked in an array-backed DraftState keyed by row ID, so
+    simulation code can work on indices instead of filtered DataFrames.
     """
     def __init__(self, players: pd.DataFrame, format: str = config.DEFAULT_DRAFT_FORMAT, teams: int = config.DEFAULT_TEAMS, rounds: int = config.DEFAULT_ROUNDS, roster: List[str] = config.DEFAULT_ROSTER, order: str = 'snake'):
         self.players = players
@@ -14,13 +21,140 @@ class Draft:
         self.rounds = rounds
         self.roster = roster
         self.order = order
-        self.drafted_players: Set[str] = set()
+        self.state = DraftState(players, format)
+        self.vorp_index: VorpIndex | None = None
+        self._drafted_players: Set[str] = set()
+
+        # Lookup indexes: each key maps to its row IDs in big board order, so
+        # duplicate names always resolve to the earliest undrafted row.
+        self._rows_by_name = _build_index(players, 'display_name')
+        self._rows_by_normalized_name = _build_index(players, 'normalized_name')
+        self._rows_by_sleeper_id = _build_index(players, 'sleeper_id')
+
+    @property
+    def drafted_players(self) -> FrozenSet[str]:
+        """
+        The normalized names of all drafted players. Read-only: draft players
+        with `draft_player` or assign a new set to keep the board in sync.
+        """
+        return frozenset(self._drafted_players)
+
+    @drafted_players.setter
+    def drafted_players(self, drafted: Set[str]) -> None:
+        self._drafted_players = set(drafted)
+        self.state.set_drafted_names(self._drafted_players)
+        if self.vorp_index is not None:
+            self.vorp_index.rebuild()
+
+    def set_available(self, available: np.ndarray) -> None:
+        """
+        Replaces the availability mask, e.g. with one restored from a snapshot,
+        and keeps the drafted names and VORP index in sync with it.
+        """
+        state = self.state
+        state.available = np.asarray(available, dtype=bool).copy()
+        self._drafted_players = set(state.group_names[np.unique(state.name_group[~state.available])])
+        if self.vorp_index is not None:
+            self.vorp_index.rebuild()
+
+    def copy(self) -> "Draft":
+        """
+        Returns an independent copy of the draft for simulation. The big board
+        itself is shared; only the drafted set and availability mask are copied.
+        """
+        clone = object.__new__(Draft)
+        clone.__dict__.update(self.__dict__)
+        clone.state = self.state.copy()
+        clone._drafted_players = self._drafted_players.copy()
+        if self.vorp_index is not None:
+            clone.vorp_index = self.vorp_index.copy(clone.state)
+        return clone
+
+    def track_vorp(self, roster_config: List[str] = config.DEFAULT_ROSTER_POS) -> VorpIndex:
+        """
+        Starts maintaining VORP incrementally as players are drafted.
+        Forked drafts from `copy()` inherit the index.
+        """
+        if self.vorp_index is None:
+            self.vorp_index = VorpIndex(self.state, self.teams, roster_config)
+        return self.vorp_index
+
+    def update_projection(self, row_id: int, points: float) -> None:
+        """
+        Changes a player's projected points mid-draft. Only the VORP of that
+        player's position is recomputed.
+        """
+        points_col = f"fantasy_points_{self.format.lower()}"
+        # Copy-on-write: the board frame is shared with forked drafts
+        self.players = self.players.copy()
+        self.players.iloc[row_id, self.players.columns.get_loc(points_col)] = points
+        self.state.set_points(row_id, points)
+        if self.vorp_index is not None:
+            self.vorp_index.update_points(row_id)
 
     def get_available_players(self) -> pd.DataFrame:
         """
         Returns a DataFrame of players who have not yet been drafted.
+
+        The frame is built on demand from the availability mask; simulation
+        hot paths should use `available_ids()` instead.
+        """
+        return self.players[self.state.available]
+
+    def available_ids(self) -> np.ndarray:
+        """Returns the row IDs of players who have not yet been drafted."""
+        return self.state.available_ids()
+
+    def draft_row(self, row_id: int) -> str | None:
         """
-        return self.players[~self.players['normalized_name'].isin(self.drafted_players)]
+        Marks the player at a row ID as drafted.
+
+        Args:
+            row_id: The player's row position in the big board.
+
+        Returns:
+            The position of the drafted player if successful, otherwise None.
+        """
+        if not self.state.available[row_id]:
+            return None
+        self._drafted_players.add(self.state.group_names[self.state.name_group[row_id]])
+        marked = self.state.mark_drafted(row_id)
+        if self.vorp_index is not None:
+            for drafted_id in marked:
+                self.vorp_index.remove(drafted_id)
+        return self.players['position'].iat[row_id]
+
+    def draft_rows(self, row_ids: np.ndarray) -> np.ndarray:
+        """
+        Marks many rows as drafted in one pass, e.g. when replaying a journal.
+        Rows that are already drafted are ignored.
+
+        Returns:
+            The positions of the given rows.
+        """
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        groups = np.unique(self.state.name_group[row_ids])
+        self._drafted_players.update(self.state.group_names[groups])
+        self.state.available &= ~np.isin(self.state.name_group, groups)
+        if self.vorp_index is not None:
+            self.vorp_index.rebuild()
+        return self.players['position'].to_numpy()[row_ids]
+
+    def find_rows(self, player_name: str) -> List[int]:
+        """
+        Returns the row IDs matching a player name, in big board order. Exact
+        display names are tried first, then the normalized form of the name, so
+        lower-case input from the CLI still resolves.
+        """
+        rows = self._rows_by_name.get(player_name)
+        if rows is None:
+            rows = self._rows_by_normalized_name.get(utils.normalize_name(player_name), [])
+        return rows
+
+    def row_for_sleeper_id(self, sleeper_id: str) -> int | None:
+        """Returns the row ID for a Sleeper player ID, or None if it is not on the board."""
+        rows = self._rows_by_sleeper_id.get(str(sleeper_id))
+        return rows[0] if rows else None
 
     def draft_player(self, player_name: str) -> str | None:
         """
@@ -32,101 +166,152 @@ class Draft:
         Returns:
             The position of the drafted player if successful, otherwise None.
         """
-        # player_name is display_name. Find the corresponding row.
-        player_rows = self.players[self.players['display_name'] == player_name]
-        
-        if player_rows.empty:
-            return None # Player not found
+        row_id = self.find_available_row(player_name)
+        if row_id is None:
+            return None # Player not found or already drafted
+        return self.draft_row(row_id)
+
+    def find_available_row(self, player_name: str) -> int | None:
+        """Returns the first undrafted row ID for a player name, or None."""
+        for row_id in self.find_rows(player_name):
+            if self.state.available[row_id]:
+                return row_id
+        return None
+
+
+def _build_index(players: pd.DataFrame, column: str) -> Dict[str, List[int]]:
+    """Maps each non-null value of a column (as a string) to its row IDs."""
+    index: Dict[str, List[int]] = {}
+    if column not in players.columns:
+        return index
+    for row_id, value in enumerate(players[column].to_numpy()):
+        if pd.isna(value):
+            continue
+        if isinstance(value, float) and value.is_integer():
+            value = int(value) # IDs read back as floats after a merge with gaps
+        index.setdefault(str(value), []).append(row_id)
+    return index
+
+
+@lru_cache(maxsize=None)
+def roster_layout(roster: Tuple[str, ...]) -> "RosterLayout":
+    """Returns the shared RosterLayout for a roster config."""
+    return RosterLayout(roster)
+
+
+class RosterLayout:
+    """
+    Slot structure derived once from a roster config and shared by every Team
+    built from it. Slots are grouped by the name they share once trailing digits
+    are stripped (QB1 -> QB, BN3 -> BN).
+    """
+    def __init__(self, roster: Tuple[str, ...]):
+        self.slots = roster
+        groups: Dict[str, List[int]] = {}
+        for index, slot in enumerate(roster):
+            groups.setdefault(slot.rstrip('0123456789'), []).append(index)
 
-        # Find the first non-drafted player with this name
-        for index, row in player_rows.iterrows():
-            normalized_name = row['normalized_name']
-            if normalized_name not in self.drafted_players:
-                self.drafted_players.add(normalized_name)
-                return row['position']
+        # Position-specific slots by position code, filled in roster order
+        self.position_slots: Dict[int, List[int]] = {}
+        self.capacity = np.zeros(OTHER_POSITION + 1, dtype=np.int16)
+        for group, indices in groups.items():
+            if group in POSITION_CODES:
+                self.position_slots[POSITION_CODES[group]] = indices
+                self.capacity[POSITION_CODES[group]] = len(indices)
+        self.flex_slots: List[int] = groups.get('FLEX', [])
+        self.bench_slots: List[int] = groups.get('BN', [])
+
+        # Bitmask of the slots in each starting group, for needs checks
+        self.starting_groups = [(group, sum(1 << i for i in indices)) for group, indices in groups.items() if group != 'BN']
 
-        return None # Player already drafted
 
 class Team:
     """
     Represents a single team in the fantasy draft, managing its roster.
+
+    Rosters are kept as per-position counters and a bitmask of filled slots
+    over a shared RosterLayout, so needs, counts and slot placement are
+    constant-time and `copy()` is cheap enough to fork thousands of teams.
     """
     def __init__(self, roster: List[str] = config.DEFAULT_ROSTER):
-        self.roster: Dict[str, str | None] = {slot: None for slot in roster}
-    
-    def add_player(self, player: str, pos: str):
+        self.layout = roster_layout(tuple(roster))
+        self.slot_players: List[str | None] = [None] * len(self.layout.slots)
+        self.slot_mask = 0
+        # Players in position-specific slots, and all rostered players, by position code
+        self.filled = np.zeros(OTHER_POSITION + 1, dtype=np.int16)
+        self.position_counts = np.zeros(OTHER_POSITION + 1, dtype=np.int16)
+        self.flex_filled = 0
+        self.bench_filled = 0
+
+    @property
+    def roster(self) -> Dict[str, str | None]:
+        """
+        The roster as a slot -> player mapping. This is built on demand; change
+        the roster through `add_player`.
+        """
+        return dict(zip(self.layout.slots, self.slot_players))
+
+    def copy(self) -> "Team":
+        """Returns an independent copy that shares the roster layout."""
+        clone = object.__new__(Team)
+        clone.__dict__.update(self.__dict__)
+        clone.slot_players = self.slot_players.copy()
+        clone.filled = self.filled.copy()
+        clone.position_counts = self.position_counts.copy()
+        return clone
+
+    def add_player(self, player: str, pos: str) -> int | None:
         """
         Adds a player to the first available roster slot for their position.
+
+        Returns:
+            The index of the slot filled, or None if the roster is full.
         """
-        # Find a position-specific slot first
-        for slot in self.roster:
-            if slot.startswith(pos) and self.roster[slot] is None:
-                self.roster[slot] = player
-                return
+        layout = self.layout
+        code = POSITION_CODES.get(pos, OTHER_POSITION)
 
+        # Find a position-specific slot first
+        if self.filled[code] < layout.capacity[code]:
+            slot = layout.position_slots[code][self.filled[code]]
+            self.filled[code] += 1
         # If no position-specific slot, try a FLEX spot for eligible positions
-        if pos in ('WR', 'RB', 'TE'):
-            for slot in self.roster:
-                if slot.startswith('FLEX') and self.roster[slot] is None:
-                    self.roster[slot] = player
-                    return
-        
+        elif pos in config.FLEX_POSITIONS and self.flex_filled < len(layout.flex_slots):
+            slot = layout.flex_slots[self.flex_filled]
+            self.flex_filled += 1
         # If still no slot, place them on the bench
-        for slot in self.roster:
-            if slot.startswith('BN') and self.roster[slot] is None:
-                self.roster[slot] = player
-                return
+        elif self.bench_filled < len(layout.bench_slots):
+            slot = layout.bench_slots[self.bench_filled]
+            self.bench_filled += 1
+        else:
+            return None
+
+        self.slot_players[slot] = player
+        self.slot_mask |= 1 << slot
+        self.position_counts[code] += 1
+        return slot
 
     def get_positional_needs(self) -> List[str]:
         """
-        Identifies all unfilled positions on the roster, including bench.
-        """
-        needs = []
-        # Use a set to avoid duplicate position checks
-        positions_to_check = set(cfg.rstrip('0123456789') for cfg in self.roster.keys())
-        
-        for pos in positions_to_check:
-            if pos == 'BN': continue # Skip bench
-            
-            slots_for_pos = [s for s in self.roster.keys() if s.startswith(pos)]
-            filled_slots = [s for s in slots_for_pos if self.roster[s] is not None]
-            
-            if len(filled_slots) < len(slots_for_pos):
-                needs.append(pos)
-        return needs
+        Identifies all unfilled positions on the roster. Bench slots are
+        skipped, so these are the starting needs.
+        """
+        return self.get_starting_positional_needs()
 
     def get_starting_positional_needs(self) -> List[str]:
         """
         Identifies unfilled positions in the starting lineup only.
         """
-        needs = []
-        # Exclude bench slots from consideration
-        starting_slots = [slot for slot in self.roster.keys() if not slot.startswith('BN')]
-        positions_to_check = set(cfg.rstrip('0123456789') for cfg in starting_slots)
+        return [group for group, mask in self.layout.starting_groups if mask & ~self.slot_mask]
 
-        for pos in positions_to_check:
-            slots_for_pos = [s for s in starting_slots if s.startswith(pos)]
-            filled_slots = [s for s in slots_for_pos if self.roster[s] is not None]
-            
-            if len(filled_slots) < len(slots_for_pos):
-                needs.append(pos)
-        return needs
+    def starting_needs_mask(self) -> np.ndarray:
+        """
+        Boolean vector indexed by position code, True where a position-specific
+        starting slot is still open.
+        """
+        return self.filled < self.layout.capacity
 
-    def count_players_at_position(self, pos: str, player_df: pd.DataFrame) -> int:
+    def count_players_at_position(self, pos: str) -> int:
         """
         Counts the number of players of a specific position on the team.
         """
-        count = 0
-        # Get the display names of players on the roster
-        rostered_players = [name for name in self.roster.values() if name is not None]
-        if not rostered_players:
-            return 0
-        
-        # Filter the main player DataFrame to get the positions of rostered players
-        roster_details = player_df[player_df['display_name'].isin(rostered_players)]
-        
-        # Count how many have the specified position
-        if not roster_details.empty:
-            count = roster_details[roster_details['position'] == pos].shape[0]
-            
-        return count
\ No newline at end of file
+        return int(self.position_counts[POSITION_CODES.get(pos, OTHER_POSITION)])
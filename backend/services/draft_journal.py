@@ -0,0 +1,158 @@
+"""
+Append-only pick journal and compact binary snapshots of draft state, so a
+draft can be resumed after a crash or restart, and simulations can
+checkpoint and fork.
+
+A journal file is a fixed header followed by one 8-byte record per pick:
+
+    header  magic b"GGJ1", version, board fingerprint, teams, rounds
+    record  pick number (u16), board row ID (u32), team index (u16)
+
+Row IDs are positions in the big board, so the header carries a fingerprint
+of the board and a journal is only replayed onto the board it was written for.
+"""
+import hashlib
+import logging
+import os
+import struct
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .draft import Draft, Team
+
+JOURNAL_MAGIC = b"GGJ1"
+SNAPSHOT_MAGIC = b"GGS1"
+VERSION = 1
+JOURNAL_HEADER = struct.Struct("<4sH16sHH")
+SNAPSHOT_HEADER = struct.Struct("<4sH16sHHII")
+RECORD_DTYPE = np.dtype([('pick', '<u2'), ('row_id', '<u4'), ('team', '<u2')])
+
+# Row ID / team index for a pick that could not be matched to the big board
+NO_ROW = 0xFFFFFFFF
+NO_TEAM = 0xFFFF
+
+
+def board_fingerprint(players: pd.DataFrame) -> bytes:
+    """Identifies a big board by its size and the name and position of every row."""
+    digest = hashlib.sha256(str(len(players)).encode())
+    for column in ['normalized_name', 'position']:
+        if column in players.columns:
+            digest.update(players[column].astype(str).str.cat(sep='\x1f').encode())
+    return digest.digest()[:16]
+
+
+class DraftJournal:
+    """
+    Append-only journal of the picks in one draft. Every record is flushed to
+    disk as it is written; a record cut short by a crash is dropped when the
+    journal is reopened.
+    """
+    def __init__(self, path: str | Path, players: pd.DataFrame, teams: int, rounds: int):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        header = JOURNAL_HEADER.pack(JOURNAL_MAGIC, VERSION, board_fingerprint(players), teams, rounds)
+
+        if self.path.exists() and self.path.stat().st_size > 0:
+            with open(self.path, 'rb') as f:
+                existing = f.read(JOURNAL_HEADER.size)
+            if existing != header:
+                raise ValueError(f"Journal {self.path} was written for a different board or league settings.")
+            size = self.path.stat().st_size
+            complete = JOURNAL_HEADER.size + (size - JOURNAL_HEADER.size) // RECORD_DTYPE.itemsize * RECORD_DTYPE.itemsize
+            if complete != size:
+                logging.warning(f"Dropping a partial record at the end of {self.path}")
+                os.truncate(self.path, complete)
+            self._file = open(self.path, 'ab')
+        else:
+            self._file = open(self.path, 'wb')
+            self._file.write(header)
+            self._file.flush()
+
+    def append(self, pick_num: int, row_id: int | None, team_index: int | None) -> None:
+        """Records one pick; pass None for a pick that is not on the big board."""
+        record = np.array([(pick_num, NO_ROW if row_id is None else row_id,
+                            NO_TEAM if team_index is None else team_index)], dtype=RECORD_DTYPE)
+        self._file.write(record.tobytes())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def records(self) -> np.ndarray:
+        """Reads every complete record as a structured array."""
+        self._file.flush()
+        data = self.path.read_bytes()[JOURNAL_HEADER.size:]
+        usable = len(data) // RECORD_DTYPE.itemsize * RECORD_DTYPE.itemsize
+        return np.frombuffer(data[:usable], dtype=RECORD_DTYPE)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def replay(draft: Draft, teams_list: list[Team], records: np.ndarray) -> None:
+    """
+    Rebuilds draft and roster state from journal records: availability in one
+    vectorized pass, then each team's roster in pick order.
+    """
+    matched = records[records['row_id'] != NO_ROW]
+    if len(matched) == 0:
+        return
+    row_ids = matched['row_id'].astype(np.int64)
+    positions = draft.draft_rows(row_ids)
+    names = draft.players['display_name'].to_numpy()[row_ids]
+    for team_index, name, pos in zip(matched['team'], names, positions):
+        if team_index != NO_TEAM:
+            teams_list[team_index].add_player(name, pos)
+
+
+def reconcile(draft: Draft, records: np.ndarray, picks: list) -> list[int]:
+    """
+    Compares journaled picks with the Sleeper pick list they were read from.
+
+    Returns:
+        The pick numbers whose journaled row does not match the player Sleeper
+        reports for that pick.
+    """
+    mismatched = []
+    for record, pick in zip(records, picks):
+        if pick is None:
+            continue
+        player_id = pick.get('player_id')
+        row_id = draft.row_for_sleeper_id(player_id) if player_id else None
+        if (NO_ROW if row_id is None else row_id) != record['row_id']:
+            mismatched.append(int(record['pick']))
+    return mismatched
+
+
+def snapshot(draft: Draft, records: np.ndarray) -> bytes:
+    """
+    Packs a draft's state into a compact binary snapshot: the pick records
+    that built the rosters plus the availability mask, one bit per player.
+    """
+    records = np.ascontiguousarray(records, dtype=RECORD_DTYPE)
+    header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, VERSION, board_fingerprint(draft.players),
+                                  draft.teams, draft.rounds, len(records), len(draft.state))
+    return header + records.tobytes() + np.packbits(draft.state.available).tobytes()
+
+
+def restore_snapshot(data: bytes, draft: Draft, teams_list: list[Team]) -> np.ndarray:
+    """
+    Restores a snapshot into a fresh draft on the same board and its empty
+    teams.
+
+    Returns:
+        The pick records stored in the snapshot.
+    """
+    magic, version, fingerprint, teams, rounds, n_records, n_players = SNAPSHOT_HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != VERSION:
+        raise ValueError("Not a draft snapshot.")
+    if fingerprint != board_fingerprint(draft.players) or (teams, rounds) != (draft.teams, draft.rounds):
+        raise ValueError("Snapshot was taken on a different board or league settings.")
+
+    offset = SNAPSHOT_HEADER.size
+    records = np.frombuffer(data, dtype=RECORD_DTYPE, count=n_records, offset=offset)
+    offset += records.nbytes
+    available = np.unpackbits(np.frombuffer(data, dtype=np.uint8, offset=offset), count=n_players).astype(bool)
+
+    replay(draft, teams_list, records)
+    # The mask also covers players removed outside of recorded picks
+    draft.set_available(available)
+    return records
@@ -13,4 +13,30 @@ def get_user_picks(pick: int, order: str = 'snake', teams: int = config.DEFAULT_
             user_picks.append((i * teams) + pick)
     return user_picks
 
+def get_team_index(pick_num: int, teams: int = config.DEFAULT_TEAMS, order: str = 'snake') -> int:
+    """
+    Returns the 0-based index of the team making an overall pick (1-based).
+    """
+    current_round = (pick_num - 1) // teams + 1
+    if order == 'snake' and current_round % 2 == 0:
+        return teams - ((pick_num - 1) % teams) - 1
+    return (pick_num - 1) % teams
 
+def vona_window(picks_made: int, user_turns: list[int]) -> tuple[int, int] | None:
+    """
+    Returns (picks_to_simulate, current_pick) for the VONA of the user's next
+    turn, given how many picks have been made and the 0-based overall indices
+    of the user's picks.
+
+    On the clock this is exact: the picks between the user's pick and their
+    following one. While other teams pick, it speculates by simulating every
+    pick from now to the user's following turn, their own included. Returns
+    None if the user has no later turn to compare against.
+    """
+    upcoming = [turn for turn in user_turns if turn >= picks_made][:2]
+    if len(upcoming) < 2:
+        return None
+    turn, following = upcoming
+    if turn == picks_made:
+        return following - turn - 1, turn + 1
+    return following - picks_made, picks_made
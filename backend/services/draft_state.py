@@ -0,0 +1,116 @@
+"""
+Array-backed draft state used by the simulation hot paths.
+"""
+import numpy as np
+import pandas as pd
+from backend import config
+
+# Integer code for each position; anything unrecognised maps to OTHER_POSITION.
+POSITION_CODES: dict = {pos: code for code, pos in enumerate(config.POSITIONS)}
+OTHER_POSITION: int = len(config.POSITIONS)
+
+
+def encode_positions(positions: pd.Series) -> np.ndarray:
+    """Maps a Series of position strings to int8 position codes."""
+    return positions.map(POSITION_CODES).fillna(OTHER_POSITION).to_numpy(dtype=np.int8)
+
+
+def position_mask(positions: list) -> np.ndarray:
+    """Returns a boolean vector indexed by position code, True for the given positions."""
+    mask = np.zeros(OTHER_POSITION + 1, dtype=bool)
+    for pos in positions:
+        if pos in POSITION_CODES:
+            mask[POSITION_CODES[pos]] = True
+    return mask
+
+
+def _float_column(players: pd.DataFrame, column: str) -> np.ndarray:
+    """Returns a column as a contiguous float64 array, or all-NaN if it is missing."""
+    if column not in players.columns:
+        return np.full(len(players), np.nan)
+    return np.ascontiguousarray(pd.to_numeric(players[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan))
+
+
+class DraftState:
+    """
+    Holds the columns the simulator reads (position, points, VORP, ADP) as
+    contiguous NumPy arrays indexed by row ID, plus a boolean availability mask.
+
+    A row ID is the player's position in the big board passed to the
+    constructor, so `players.iloc[row_id]` is always the matching row.
+    """
+    def __init__(self, players: pd.DataFrame, format: str = config.DEFAULT_DRAFT_FORMAT):
+        n = len(players)
+        self.position = encode_positions(players['position']) if 'position' in players.columns else np.full(n, OTHER_POSITION, dtype=np.int8)
+        self.points = _float_column(players, f"fantasy_points_{format.lower()}")
+        self.vorp = _float_column(players, 'VORP')
+        self.adp = _float_column(players, 'ADP')
+        self.has_adp = 'ADP' in players.columns
+        self.available = np.ones(n, dtype=bool)
+
+        # Players sharing a normalized_name are drafted together, matching the
+        # name-based semantics of Draft.drafted_players.
+        if 'normalized_name' in players.columns:
+            self.name_group, self.group_names = pd.factorize(players['normalized_name'], use_na_sentinel=False)
+        else:
+            self.name_group, self.group_names = np.arange(n), pd.Index(range(n))
+        counts = np.bincount(self.name_group, minlength=len(self.group_names))
+        self._siblings: dict = {}
+        for row_id in np.flatnonzero(counts[self.name_group] > 1):
+            self._siblings.setdefault(self.name_group[row_id], []).append(row_id)
+
+    def __len__(self) -> int:
+        return len(self.available)
+
+    def copy(self) -> "DraftState":
+        """
+        Returns a copy that shares the read-only column arrays but owns its
+        availability mask, so simulations can fork the state cheaply.
+        """
+        clone = object.__new__(DraftState)
+        clone.__dict__.update(self.__dict__)
+        clone.available = self.available.copy()
+        return clone
+
+    def available_ids(self) -> np.ndarray:
+        """Returns the row IDs of all undrafted players."""
+        return np.flatnonzero(self.available)
+
+    def available_at_position(self, position: str) -> np.ndarray:
+        """Returns the row IDs of undrafted players at a position."""
+        code = POSITION_CODES.get(position, OTHER_POSITION)
+        return np.flatnonzero(self.available & (self.position == code))
+
+    def mark_drafted(self, row_id: int) -> list:
+        """
+        Marks a row, and any rows sharing its normalized name, as drafted.
+
+        Returns:
+            The row IDs that were newly marked unavailable.
+        """
+        siblings = self._siblings.get(self.name_group[row_id], [row_id])
+        marked = [r for r in siblings if self.available[r]]
+        self.available[marked] = False
+        return marked
+
+    def set_points(self, row_id: int, points: float) -> None:
+        """
+        Changes one player's projected points. The points array is copied first
+        because it is shared with any forked states.
+        """
+        self.points = self.points.copy()
+        self.points[row_id] = points
+
+    def set_drafted_names(self, drafted_names: set) -> None:
+        """Rebuilds the availability mask from a set of normalized names."""
+        drafted_groups = self.group_names.isin(drafted_names)
+        self.available = ~drafted_groups[self.name_group]
+
+    def best_points_at_position(self, position: str) -> float:
+        """
+        Returns the highest projected points among undrafted players at a position,
+        or NaN if none have a projection.
+        """
+        points = self.points[self.available_at_position(position)]
+        points = points[~np.isnan(points)]
+        return points.max() if len(points) else np.nan
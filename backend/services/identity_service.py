@@ -0,0 +1,205 @@
+"""
+Player identity resolution.
+
+Every player gets a stable integer player_uid. A persisted crosswalk maps each
+source's identifier to it: Sleeper and GSIS IDs, the player's canonical
+normalized name, and the names FantasyPros and The Athletic use, which are
+learned as they are resolved. Joins between sources go through player_uid
+rather than names, so same-name players at different positions stay apart
+and rows that cannot be matched are reported instead of silently dropped.
+"""
+import difflib
+import logging
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from backend import config, utils
+
+# Sources keyed by an ID or canonical name registered from a player directory
+ID_SOURCES = {'sleeper': 'sleeper_id', 'gsis': 'gsis_id', 'name': 'normalized_name'}
+CROSSWALK_COLUMNS = ['player_uid', 'source', 'key', 'position']
+
+# Minimum difflib similarity for a fuzzy name match
+FUZZY_CUTOFF = 0.9
+
+
+def crosswalk_path() -> Path:
+    return config.IDENTITY_DIR / "crosswalk.parquet"
+
+
+def unmatched_report_path() -> Path:
+    return config.IDENTITY_DIR / "unmatched.csv"
+
+
+def normalize_positions(positions: pd.Series) -> pd.Series:
+    """Maps source position labels onto Sleeper's, e.g. 'WR12' -> 'WR' and 'DST' -> 'DEF'."""
+    return positions.astype('string').str.upper().str.rstrip('0123456789').replace({'DST': 'DEF', 'D/ST': 'DEF', 'PK': 'K'})
+
+
+def _id_keys(values: pd.Series) -> pd.Series:
+    """IDs as strings; IDs read back as floats after a merge with gaps lose their '.0'."""
+    keys = values.astype('string')
+    return keys.str.replace(r'\.0$', '', regex=True)
+
+
+class IdentityResolver:
+    """
+    Resolves player identifiers from any source to player_uid.
+
+    Lookups are vectorized joins against the crosswalk. Names with no exact
+    match fall back to a fuzzy search over the canonical names at the same
+    position, which is memoized per name. Names resolved that way are added
+    to the crosswalk as aliases, so `save()` makes them exact next time.
+    `changed` tells whether anything was learned since loading or saving.
+    """
+    def __init__(self, crosswalk: pd.DataFrame | None = None):
+        if crosswalk is None:
+            crosswalk = pd.DataFrame({c: pd.Series(dtype='string') for c in CROSSWALK_COLUMNS[1:]})
+            crosswalk.insert(0, 'player_uid', pd.Series(dtype='int64'))
+        self.crosswalk = crosswalk[CROSSWALK_COLUMNS].reset_index(drop=True)
+        self.unmatched: list = []
+        self.changed = False
+        self._fuzzy_cache: dict = {}
+        self._lookups: dict = {}
+        self._names_by_position: dict | None = None
+
+    @classmethod
+    def load(cls, path: str | Path | None = None) -> "IdentityResolver":
+        """Loads the persisted crosswalk, or starts an empty one."""
+        path = Path(path or crosswalk_path())
+        if not path.exists():
+            return cls()
+        crosswalk = pd.read_parquet(path)
+        crosswalk = crosswalk.astype({'player_uid': 'int64', 'source': 'string', 'key': 'string', 'position': 'string'})
+        return cls(crosswalk)
+
+    def save(self, path: str | Path | None = None) -> Path:
+        path = Path(path or crosswalk_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.crosswalk.astype({'source': object, 'key': object, 'position': object}).to_parquet(path, index=False)
+        self.changed = False
+        logging.info(f"Saved {self.crosswalk['player_uid'].nunique():,} player identities to {path}")
+        return path
+
+    def _add_keys(self, keys: pd.DataFrame) -> None:
+        """Adds crosswalk rows, keeping the existing mapping for any key already present."""
+        keys = keys[CROSSWALK_COLUMNS].dropna(subset=['key'])
+        combined = pd.concat([self.crosswalk, keys.astype(self.crosswalk.dtypes.to_dict())], ignore_index=True)
+        combined = combined.drop_duplicates(subset=['source', 'key', 'position'], keep='first').reset_index(drop=True)
+        if len(combined) == len(self.crosswalk):
+            return
+        self.crosswalk = combined
+        self.changed = True
+        self._lookups.clear()
+        self._names_by_position = None
+
+    def lookup(self, source: str, keys: pd.Series) -> pd.Series:
+        """Maps a source's IDs to player_uid (nullable Int64, <NA> if unknown)."""
+        if source not in self._lookups:
+            rows = self.crosswalk[self.crosswalk['source'] == source].drop_duplicates(subset=['key'])
+            self._lookups[source] = pd.Series(rows['player_uid'].to_numpy(), index=rows['key'].to_numpy())
+        return _id_keys(keys).map(self._lookups[source]).astype('Int64')
+
+    def register(self, players: pd.DataFrame) -> pd.Series:
+        """
+        Assigns a player_uid to every row of a player directory (columns
+        sleeper_id, gsis_id, normalized_name and position, where available).
+        Known players keep their ID, matched by Sleeper ID, then GSIS ID;
+        anyone else gets a new one.
+
+        Returns:
+            The player_uid of each row, aligned with `players`.
+        """
+        uids = pd.Series(pd.NA, index=players.index, dtype='Int64')
+        for source in ['sleeper', 'gsis']:
+            column = ID_SOURCES[source]
+            if column in players.columns:
+                uids = uids.fillna(self.lookup(source, players[column]))
+        if not ({'sleeper_id', 'gsis_id'} & set(players.columns)) and 'normalized_name' in players.columns:
+            uids = uids.fillna(self._resolve_exact(players['normalized_name'], players.get('position'), 'name'))
+
+        self._fuzzy_cache.clear() # New players may now be the closer match
+        missing = uids.isna().to_numpy()
+        next_uid = int(self.crosswalk['player_uid'].max()) + 1 if len(self.crosswalk) else 1
+        uids[missing] = np.arange(next_uid, next_uid + missing.sum())
+        uids = uids.astype('int64')
+
+        position = normalize_positions(players['position']) if 'position' in players.columns else pd.Series(pd.NA, index=players.index, dtype='string')
+        keys = []
+        for source, column in ID_SOURCES.items():
+            if column in players.columns:
+                key = players[column] if source == 'name' else _id_keys(players[column])
+                keys.append(pd.DataFrame({'player_uid': uids, 'source': source, 'key': key, 'position': position}))
+        if keys:
+            self._add_keys(pd.concat(keys, ignore_index=True))
+        return uids
+
+    def _resolve_exact(self, names: pd.Series, positions: pd.Series | None, source: str) -> pd.Series:
+        """Joins normalized names to one source's keys, on position as well where it is known."""
+        rows = self.crosswalk[self.crosswalk['source'] == source]
+        frame = pd.DataFrame({'key': names.astype('string').to_numpy(),
+                              'position': (normalize_positions(positions) if positions is not None else pd.Series(pd.NA, index=names.index, dtype='string')).to_numpy()})
+        # Same-name players at one position resolve to the first registered
+        by_position = rows.drop_duplicates(subset=['key', 'position'])
+        uids = frame.merge(by_position, on=['key', 'position'], how='left')['player_uid']
+        # Without a position, or without a match at it, a name only resolves if it is unique
+        unique_names = rows.drop_duplicates(subset=['key', 'player_uid']).drop_duplicates(subset=['key'], keep=False)
+        fallback = frame[['key']].merge(unique_names[['key', 'player_uid']], on='key', how='left')['player_uid']
+        return pd.Series(uids.fillna(fallback).to_numpy(), index=names.index).astype('Int64')
+
+    def _fuzzy_match(self, name: str, position) -> int | None:
+        """Best canonical name at the same position above FUZZY_CUTOFF; memoized."""
+        cache_key = (name, position)
+        if cache_key in self._fuzzy_cache:
+            return self._fuzzy_cache[cache_key]
+        if self._names_by_position is None:
+            names = self.crosswalk[self.crosswalk['source'] == 'name'].drop_duplicates(subset=['key', 'position'])
+            self._names_by_position = {pos: dict(zip(group['key'], group['player_uid']))
+                                       for pos, group in names.groupby(names['position'].fillna(''))}
+        candidates = self._names_by_position.get('' if pd.isna(position) else position, {})
+        match = difflib.get_close_matches(name, list(candidates), n=1, cutoff=FUZZY_CUTOFF)
+        uid = int(candidates[match[0]]) if match else None
+        self._fuzzy_cache[cache_key] = uid
+        return uid
+
+    def resolve(self, names: pd.Series, positions: pd.Series | None, source: str) -> pd.Series:
+        """
+        Resolves a source's player names (and positions, if known) to player_uid.
+        Tries names already learned for the source, then exact canonical names,
+        then fuzzy matches. Unresolved rows are <NA> and added to `unmatched`.
+
+        Returns:
+            Nullable Int64 player_uids aligned with `names`.
+        """
+        normalized = utils.normalize_names(names)
+        uids = self._resolve_exact(normalized, positions, source)
+        learned = uids.isna()
+        uids = uids.fillna(self._resolve_exact(normalized, positions, 'name'))
+
+        position_values = normalize_positions(positions) if positions is not None else pd.Series(pd.NA, index=names.index, dtype='string')
+        for i in np.flatnonzero(uids.isna().to_numpy() & normalized.notna().to_numpy()):
+            uid = self._fuzzy_match(normalized.iat[i], position_values.iat[i])
+            if uid is not None:
+                uids.iat[i] = uid
+
+        resolved = learned & uids.notna()
+        self._add_keys(pd.DataFrame({'player_uid': uids[resolved].astype('int64'), 'source': source,
+                                     'key': normalized[resolved], 'position': position_values[resolved]}))
+        unresolved = uids.isna()
+        if unresolved.any():
+            self.unmatched.extend({'source': source, 'name': name, 'position': pos}
+                                  for name, pos in zip(names[unresolved], position_values[unresolved]))
+            logging.warning(f"{int(unresolved.sum())} {source} rows could not be matched to a player.")
+        return uids
+
+    def unmatched_report(self) -> pd.DataFrame:
+        """Every unresolved row so far, with how many times it was seen."""
+        report = pd.DataFrame(self.unmatched, columns=['source', 'name', 'position'])
+        return (report.astype({'position': object}).fillna({'position': ''})
+                .groupby(['source', 'name', 'position']).size().rename('rows').reset_index())
+
+    def write_unmatched_report(self, path: str | Path | None = None) -> Path:
+        path = Path(path or unmatched_report_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.unmatched_report().to_csv(path, index=False)
+        return path
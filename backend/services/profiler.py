@@ -0,0 +1,225 @@
+"""
+Opt-in timing and memory instrumentation for the draft loop.
+
+Profiling is off by default and the active profiler is then a NullProfiler
+whose methods do nothing. Enable it with `enable_profiling()` (the CLI's
+--profile flag) or by setting the GROUND_GAME_PROFILE environment variable.
+"""
+import contextlib
+import functools
+import json
+import logging
+import math
+import os
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from backend import config
+
+PROFILE_ENV_VAR = "GROUND_GAME_PROFILE"
+
+# Upper edges of the per-pick latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000, 60000]
+
+
+class NullProfiler:
+    """The disabled profiler: every hook is a no-op."""
+    enabled = False
+    _null_stage = contextlib.nullcontext()
+
+    def stage(self, name: str, **args):
+        return self._null_stage
+
+    def record_pick(self, pick_num: int, kind: str, seconds: float) -> None:
+        pass
+
+    def dump(self, output_dir: str | Path | None = None) -> None:
+        return None
+
+
+class Profiler:
+    """
+    Records stage timings, the memory each stage allocates, per-pick latency
+    and a Chrome trace-event timeline.
+
+    Memory comes from tracemalloc, which is started when the profiler is
+    created. A stage's peak is the highest traced memory above its starting
+    point, including any nested stages.
+    """
+    enabled = True
+
+    def __init__(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.started = time.perf_counter()
+        self.start_snapshot = tracemalloc.take_snapshot()
+        self.stages: dict = {}
+        self.picks: list = []
+        self.trace_events: list = []
+        self._memory_stack: list = []
+        self._pid = os.getpid()
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **args):
+        """Times a block and records the memory it allocates."""
+        current, _ = tracemalloc.get_traced_memory()
+        frame = [current, current]  # start, highest seen so far
+        self._memory_stack.append(frame)
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            current, peak = tracemalloc.get_traced_memory()
+            self._memory_stack.pop()
+            frame[1] = max(frame[1], peak)
+            # reset_peak() in a nested stage hides earlier peaks from the outer ones
+            for outer in self._memory_stack:
+                outer[1] = max(outer[1], frame[1])
+            self._record_stage(name, start, elapsed, frame[1] - frame[0], current - frame[0], args)
+
+    def _record_stage(self, name: str, start: float, elapsed: float, peak: int, allocated: int, args: dict) -> None:
+        stats = self.stages.setdefault(name, {'count': 0, 'total_s': 0.0, 'max_s': 0.0, 'times_s': [],
+                                              'peak_bytes': 0, 'net_allocated_bytes': 0})
+        stats['count'] += 1
+        stats['total_s'] += elapsed
+        stats['max_s'] = max(stats['max_s'], elapsed)
+        stats['times_s'].append(elapsed)
+        stats['peak_bytes'] = max(stats['peak_bytes'], peak)
+        stats['net_allocated_bytes'] += allocated
+        self.trace_events.append({
+            'name': name, 'cat': 'stage', 'ph': 'X', 'pid': self._pid, 'tid': threading.get_ident(),
+            'ts': (start - self.started) * 1e6, 'dur': elapsed * 1e6,
+            'args': dict(args, peak_bytes=peak, allocated_bytes=allocated),
+        })
+
+    def record_pick(self, pick_num: int, kind: str, seconds: float) -> None:
+        """Records how long a pick that just finished took, e.g. kind 'user', 'cpu' or 'live'."""
+        self.picks.append({'pick': pick_num, 'kind': kind, 'seconds': seconds})
+        self.trace_events.append({
+            'name': f"pick {pick_num}", 'cat': f"pick.{kind}", 'ph': 'X', 'pid': self._pid, 'tid': 0,
+            'ts': (time.perf_counter() - seconds - self.started) * 1e6, 'dur': seconds * 1e6,
+        })
+
+    def report(self) -> dict:
+        """Builds the JSON report: stage summaries, pick histograms and top allocation sites."""
+        stages = {}
+        for name, stats in self.stages.items():
+            times = sorted(stats['times_s'])
+            stages[name] = {
+                'count': stats['count'],
+                'total_s': stats['total_s'],
+                'mean_s': stats['total_s'] / stats['count'],
+                'p50_s': _percentile(times, 50),
+                'p95_s': _percentile(times, 95),
+                'max_s': stats['max_s'],
+                'peak_bytes': stats['peak_bytes'],
+                'net_allocated_bytes': stats['net_allocated_bytes'],
+            }
+
+        picks = {}
+        for kind in sorted({p['kind'] for p in self.picks}):
+            times = sorted(p['seconds'] for p in self.picks if p['kind'] == kind)
+            picks[kind] = {
+                'count': len(times),
+                'p50_s': _percentile(times, 50),
+                'p95_s': _percentile(times, 95),
+                'max_s': times[-1],
+                'histogram_ms': _histogram([t * 1000 for t in times]),
+            }
+
+        snapshot = tracemalloc.take_snapshot()
+        top_allocations = [
+            {'location': str(stat.traceback), 'size_diff_bytes': stat.size_diff, 'count_diff': stat.count_diff}
+            for stat in snapshot.compare_to(self.start_snapshot, 'lineno')[:15]
+        ]
+        current, _ = tracemalloc.get_traced_memory()
+        return {
+            'wall_s': time.perf_counter() - self.started,
+            'traced_memory_bytes': current,
+            'stages': stages,
+            'picks': picks,
+            'pick_log': self.picks,
+            'top_allocations': top_allocations,
+        }
+
+    def dump(self, output_dir: str | Path | None = None) -> Path:
+        """
+        Writes report.json and a Chrome trace (trace.json, open it in
+        chrome://tracing or Perfetto) to a new timestamped directory.
+        """
+        output_dir = Path(output_dir or config.PROFILE_DIR / datetime.now().strftime("%Y%m%d_%H%M%S"))
+        output_dir.mkdir(parents=True, exist_ok=True)
+        (output_dir / "report.json").write_text(json.dumps(self.report(), indent=2))
+        (output_dir / "trace.json").write_text(json.dumps({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}))
+        logging.info(f"Profile written to {output_dir}")
+        return output_dir
+
+
+def _percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def _histogram(values_ms: list) -> dict:
+    """Counts values into LATENCY_BUCKETS_MS, keyed by each bucket's upper edge."""
+    counts = {f"<={edge}": 0 for edge in LATENCY_BUCKETS_MS}
+    counts[f">{LATENCY_BUCKETS_MS[-1]}"] = 0
+    for value in values_ms:
+        for edge in LATENCY_BUCKETS_MS:
+            if value <= edge:
+                counts[f"<={edge}"] += 1
+                break
+        else:
+            counts[f">{LATENCY_BUCKETS_MS[-1]}"] += 1
+    return counts
+
+
+_active_profiler: Profiler | NullProfiler = NullProfiler()
+
+
+def get_profiler() -> Profiler | NullProfiler:
+    """Returns the active profiler; a NullProfiler unless profiling is enabled."""
+    return _active_profiler
+
+
+def enable_profiling() -> Profiler:
+    """Starts profiling, replacing the NullProfiler. Returns the active profiler."""
+    global _active_profiler
+    if not _active_profiler.enabled:
+        _active_profiler = Profiler()
+    return _active_profiler
+
+
+def disable_profiling() -> None:
+    """Stops profiling and tracemalloc."""
+    global _active_profiler
+    if _active_profiler.enabled:
+        tracemalloc.stop()
+    _active_profiler = NullProfiler()
+
+
+def profiled(name: str):
+    """
+    Decorator that runs a function inside a profiler stage. When profiling is
+    off it adds one attribute check per call.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _active_profiler.enabled:
+                return func(*args, **kwargs)
+            with _active_profiler.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+if os.environ.get(PROFILE_ENV_VAR, "") not in ("", "0"):
+    enable_profiling()
@@ -0,0 +1,257 @@
+"""
+Draft sessions for the HTTP service: many concurrent drafts sharing one warm
+big board per league setup.
+"""
+import asyncio
+import logging
+import uuid
+from concurrent.futures import Executor
+import numpy as np
+import pandas as pd
+from backend import config
+from backend.services.draft import Draft, Team
+from backend.services.draft_service import get_team_index, get_user_picks, vona_window
+from backend.services.draft_state import POSITION_CODES
+from backend.services.vbd_service import create_vbd_big_board
+from backend.services.vona_service import evaluate_vona
+
+# Columns returned by board queries, where the board has them
+BOARD_COLUMNS = ['display_name', 'position', 'team', 'VORP', 'ADP', 'VONA', 'SURVIVAL', 'sleeper_id']
+SORTABLE_COLUMNS = ['VORP', 'ADP', 'VONA', 'SURVIVAL', 'POINTS']
+
+
+def canonical_format(format: str) -> str:
+    """Matches a scoring format case-insensitively against config.DRAFT_FORMATS."""
+    for known in config.DRAFT_FORMATS:
+        if known.lower() == format.lower():
+            return known
+    raise ValueError(f"Unknown format '{format}'. Choose from {config.DRAFT_FORMATS}.")
+
+
+class DraftSession:
+    """
+    One draft: its availability and rosters, the user's slot, and the latest
+    VONA estimate. The big board itself is shared with every other session
+    on the same league setup.
+    """
+    def __init__(self, session_id: str, board: pd.DataFrame, format: str, teams: int, rounds: int, order: str, user_slot: int):
+        if not 1 <= user_slot <= teams:
+            raise ValueError(f"user_slot must be between 1 and {teams}.")
+        self.id = session_id
+        self.draft = Draft(board, format, teams, rounds, order=order)
+        self.teams_list = [Team() for _ in range(teams)]
+        self.user_slot = user_slot
+        self.user_picks = get_user_picks(user_slot, order, teams, rounds)
+        self.picks: list[dict] = []
+        # VONA estimate and the number of picks it was computed after
+        self.vona: pd.DataFrame | None = None
+        self.vona_picks: int | None = None
+
+    @property
+    def board_key(self) -> tuple:
+        """The (format, teams) the shared board was built for."""
+        return (self.draft.format, self.draft.teams)
+
+    @property
+    def pick_count(self) -> int:
+        return len(self.picks)
+
+    @property
+    def complete(self) -> bool:
+        return self.pick_count >= self.draft.teams * self.draft.rounds
+
+    def on_the_clock(self) -> int | None:
+        """The 0-based index of the team making the next pick, or None once the draft is over."""
+        if self.complete:
+            return None
+        return get_team_index(self.pick_count + 1, self.draft.teams, self.draft.order)
+
+    def summary(self) -> dict:
+        team_index = self.on_the_clock()
+        return {
+            'session_id': self.id,
+            'format': self.draft.format,
+            'teams': self.draft.teams,
+            'rounds': self.draft.rounds,
+            'order': self.draft.order,
+            'user_slot': self.user_slot,
+            'pick_count': self.pick_count,
+            'on_the_clock': None if team_index is None else team_index + 1,
+            'user_on_the_clock': team_index == self.user_slot - 1,
+            'complete': self.complete,
+        }
+
+    def pick(self, player: str | None = None, sleeper_id: str | None = None) -> dict:
+        """
+        Drafts a player for the team on the clock, by name or Sleeper ID.
+
+        Raises:
+            ValueError: If the draft is over or no player was given.
+            LookupError: If the player is not on the board or already drafted.
+        """
+        team_index = self.on_the_clock()
+        if team_index is None:
+            raise ValueError("The draft is complete.")
+        if sleeper_id is not None:
+            row_id = self.draft.row_for_sleeper_id(sleeper_id)
+            if row_id is not None and not self.draft.state.available[row_id]:
+                row_id = None
+        elif player:
+            row_id = self.draft.find_available_row(player)
+        else:
+            raise ValueError("Give a player name or a sleeper_id.")
+        if row_id is None:
+            raise LookupError(f"'{player or sleeper_id}' is not available.")
+
+        name = self.draft.players['display_name'].iat[row_id]
+        position = self.draft.draft_row(row_id)
+        self.teams_list[team_index].add_player(name, position)
+        record = {'pick': self.pick_count + 1, 'team': team_index + 1, 'row_id': int(row_id),
+                  'display_name': name, 'position': position}
+        self.picks.append(record)
+        return record
+
+    def board(self, position: str | None = None, sort: str | None = None, ascending: bool | None = None,
+              limit: int = 20, offset: int = 0) -> pd.DataFrame:
+        """
+        The available players, optionally at one position (or FLEX), sorted
+        like the CLI: ADP ascending, anything else descending. VONA and
+        SURVIVAL are included when the last estimate is still current.
+
+        Raises:
+            ValueError: For a column that cannot be sorted on.
+        """
+        state = self.draft.state
+        mask = state.available.copy()
+        if position and position.upper() != 'ALL':
+            positions = config.FLEX_POSITIONS if position.upper() == 'FLEX' else [position.upper()]
+            mask &= np.isin(state.position, [POSITION_CODES.get(pos, -1) for pos in positions])
+        board = self.draft.players.iloc[np.flatnonzero(mask)]
+        board = board[[column for column in BOARD_COLUMNS if column in board.columns]].copy()
+        board.insert(0, 'row_id', np.flatnonzero(mask))
+        board['points'] = state.points[mask]
+        if self.vona is not None and self.vona_picks == self.pick_count:
+            board['VONA'] = self.vona['VONA'].reindex(board.index)
+            board['SURVIVAL'] = self.vona['SURVIVAL'].reindex(board.index)
+
+        sort = (sort or 'ADP').upper()
+        if sort not in SORTABLE_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort}'. Choose from {SORTABLE_COLUMNS}.")
+        column = 'points' if sort == 'POINTS' else sort
+        if column not in board.columns:
+            column = 'VORP' # e.g. VONA before it has been requested
+        if ascending is None:
+            ascending = column == 'ADP'
+        return board.sort_values(by=column, ascending=ascending, kind='stable').iloc[offset:offset + limit]
+
+    def vona_request(self, n_futures: int, seed: int | None) -> tuple | None:
+        """
+        Arguments for `compute_vona` on a snapshot of the draft, or None if the
+        user has no later turn to compare against. The snapshot holds only
+        this session's state: the board is looked up by `board_key`.
+        """
+        window = vona_window(self.pick_count, [pick - 1 for pick in self.user_picks])
+        if window is None:
+            return None
+        picks_to_simulate, current_pick = window
+        return (self.board_key, self.draft.rounds, self.draft.order, self.draft.state.available.copy(),
+                [team.copy() for team in self.teams_list], picks_to_simulate, current_pick, n_futures, seed)
+
+
+# Boards shipped to each worker process by the pool initializer, and the
+# drafts built on them, by (format, teams) and (format, teams, rounds, order)
+_worker_boards: dict = {}
+_worker_drafts: dict = {}
+
+
+def init_worker(boards: dict) -> None:
+    """Pool initializer: gives each VONA worker the shared boards once."""
+    global _worker_boards
+    _worker_boards = boards
+
+
+def _session_draft(board_key: tuple, rounds: int, order: str, board: pd.DataFrame | None) -> Draft:
+    """A fresh copy of the base draft for a league setup, built once per worker."""
+    key = (*board_key, rounds, order)
+    base = _worker_drafts.get(key)
+    if base is None or (board is not None and base.players is not board):
+        format, teams = board_key
+        base = Draft(_worker_boards[board_key] if board is None else board, format, teams, rounds, order=order)
+        _worker_drafts[key] = base
+    return base.copy()
+
+
+def compute_vona(board_key: tuple, rounds: int, order: str, available: np.ndarray, teams_list: list[Team],
+                 picks_to_simulate: int, current_pick: int, n_futures: int, seed: int | None,
+                 board: pd.DataFrame | None = None) -> pd.DataFrame:
+    """
+    Runs VONA for a session snapshot; a module function so worker processes
+    can run it. `board` is only needed when the worker was not given the
+    board for `board_key` by `init_worker`.
+    """
+    draft = _session_draft(board_key, rounds, order, board)
+    draft.set_available(available)
+    return evaluate_vona(draft, teams_list, picks_to_simulate, current_pick, n_futures=n_futures, seed=seed)[['VONA', 'SURVIVAL']]
+
+
+async def run_vona(session: DraftSession, executor: Executor | None, n_futures: int = config.VONA_FUTURES,
+                   seed: int | None = None, shared_boards: frozenset = frozenset()) -> pd.DataFrame | None:
+    """
+    Computes VONA for the session's next user turn on `executor`, keeping the
+    event loop free. Boards in `shared_boards` were given to the workers by
+    `init_worker` and are not sent again; any other board is sent with the
+    request. The estimate is kept on the session unless picks were made
+    while it ran.
+    """
+    picks = session.pick_count
+    request = session.vona_request(n_futures, seed)
+    if request is None:
+        return None
+    board = None if session.board_key in shared_boards else session.draft.players
+    vona = await asyncio.get_running_loop().run_in_executor(executor, compute_vona, *request, board)
+    if session.pick_count == picks:
+        session.vona, session.vona_picks = vona, picks
+    return vona
+
+
+class SessionStore:
+    """
+    Live sessions plus one warm big board per (format, teams). Boards come
+    from `board_factory`, create_vbd_big_board by default.
+    """
+    def __init__(self, board_factory=None):
+        self.board_factory = board_factory or (lambda format, teams: create_vbd_big_board(format=format, teams=teams))
+        self.boards: dict = {}
+        self.sessions: dict[str, DraftSession] = {}
+
+    def board(self, format: str, teams: int) -> pd.DataFrame:
+        format = canonical_format(format)
+        key = (format, teams)
+        if key not in self.boards:
+            board = self.board_factory(format, teams)
+            if board is None or board.empty:
+                raise ValueError(f"No big board could be built for {format} with {teams} teams.")
+            self.boards[key] = board
+        return self.boards[key]
+
+    def warm(self, formats: list[str] = config.DRAFT_FORMATS, teams: int = config.DEFAULT_TEAMS) -> None:
+        """Builds the default boards up front so the first session does not wait."""
+        for format in formats:
+            try:
+                self.board(format, teams)
+            except ValueError as e:
+                logging.warning(f"Could not warm the {format} board: {e}")
+
+    def create(self, format: str = config.DEFAULT_DRAFT_FORMAT, teams: int = config.DEFAULT_TEAMS,
+               rounds: int = config.DEFAULT_ROUNDS, order: str = 'snake', user_slot: int = 1) -> DraftSession:
+        format = canonical_format(format)
+        session = DraftSession(uuid.uuid4().hex, self.board(format, teams), format, teams, rounds, order, user_slot)
+        self.sessions[session.id] = session
+        return session
+
+    def get(self, session_id: str) -> DraftSession:
+        """Raises KeyError for an unknown session."""
+        return self.sessions[session_id]
+
+    def delete(self, session_id: str) -> None:
+        del self.sessions[session_id]
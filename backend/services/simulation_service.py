@@ -1,6 +1,168 @@
 import pandas as pd
 import numpy as np
 from .draft import Team
+from .draft_state import POSITION_CODES, encode_positions
+
+# Probability of taking each of the top 10 players by draft_score
+CPU_PICK_PROBABILITIES = np.array([0.60, 0.20, 0.10, 0.05, 0.02, 0.01, 0.005, 0.005, 0.005, 0.005])
+SCARCITY_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+QB_CODE = POSITION_CODES['QB']
+
+
+def average_rank(values: np.ndarray, ascending: bool = True) -> np.ndarray:
+    """
+    Ranks values like `Series.rank(method='average', na_option='bottom')`.
+    """
+    ranks = np.empty(len(values))
+    missing = np.isnan(values)
+    valid = np.flatnonzero(~missing)
+    keys = values[valid] if ascending else -values[valid]
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+
+    # Tied values share the mean of the ranks they span
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    ends = np.r_[starts[1:], len(sorted_keys)]
+    ranks[valid[order]] = np.repeat((starts + 1 + ends) / 2.0, ends - starts)
+    ranks[missing] = (len(valid) + 1 + len(values)) / 2.0
+    return ranks
+
+
+def _scarcity_bonus_index(position: np.ndarray, vorp: np.ndarray) -> int:
+    """
+    Array version of the scarcity bonus: returns the index of the top-VORP player
+    at the scarcest position, or -1 if that position has no players.
+    """
+    scarcity = {}
+    for pos in SCARCITY_POSITIONS:
+        pos_vorp = vorp[position == POSITION_CODES[pos]]
+        if len(pos_vorp) > 1:
+            # Scarcity is the VORP difference between the best and second-best player
+            valid = pos_vorp[~np.isnan(pos_vorp)]
+            if len(valid) > 1:
+                top_two = np.partition(valid, len(valid) - 2)[-2:]
+                scarcity[pos] = top_two[1] - top_two[0]
+            else:
+                scarcity[pos] = np.nan
+        else:
+            scarcity[pos] = 0
+
+    scarcest_position = max(scarcity, key=scarcity.get)
+    candidates = np.flatnonzero(position == POSITION_CODES[scarcest_position])
+    if len(candidates) == 0:
+        return -1
+    # Same tie-breaking as sort_values(ascending=False): NaN last, ties reversed
+    candidate_vorp = vorp[candidates]
+    valid = candidates[~np.isnan(candidate_vorp)][::-1]
+    if len(valid) == 0:
+        return candidates[0]
+    return valid[np.argsort(vorp[valid])[-1]]
+
+
+def top_candidates(score: np.ndarray) -> np.ndarray:
+    """
+    Indices of the best (lowest) scores, best first, one per CPU pick
+    probability. The sort is stable, so tied scores rank in board order.
+    """
+    return np.argsort(score, kind='stable')[:len(CPU_PICK_PROBABILITIES)]
+
+
+def cpu_draft_scores(
+    position: np.ndarray,
+    vorp: np.ndarray,
+    adp: np.ndarray | None,
+    needs: np.ndarray,
+    qb_count: int
+) -> np.ndarray:
+    """
+    Array version of the draft_score used by `simulate_cpu_pick`, including the
+    QB penalty, starter bonus and scarcity bonus. Lower is better.
+    """
+    # 1. Blend VORP and ADP ranks, giving more weight to ADP
+    score = average_rank(vorp, ascending=False)
+    if adp is not None:
+        adp_rank = average_rank(np.where(np.isnan(adp), 999, adp))
+        score = (0.10 * score) + (0.90 * adp_rank)
+
+    # 2. Apply penalties and bonuses
+    if qb_count >= 2:
+        score[position == QB_CODE] *= 5.0
+    score[needs[position]] *= 0.70
+    scarce_index = _scarcity_bonus_index(position, vorp)
+    if scarce_index >= 0:
+        score[scarce_index] -= 10
+    return score
+
+
+def cpu_pick_kernel(
+    position: np.ndarray,
+    vorp: np.ndarray,
+    adp: np.ndarray | None,
+    needs: np.ndarray,
+    qb_count: int,
+    rng: np.random.Generator | None = None
+) -> int:
+    """
+    Array version of `simulate_cpu_pick` with the same scoring.
+
+    Args:
+        position: Position codes of the available players.
+        vorp: VORP of the available players.
+        adp: ADP of the available players, or None if the board has no ADP.
+        needs: Boolean vector indexed by position code, True for open starting slots.
+        qb_count: Number of QBs already on the team.
+        rng: Generator for the top-10 draw. Defaults to the global NumPy RNG.
+
+    Returns:
+        The index of the chosen player within the input arrays, or -1 if empty.
+    """
+    if len(position) == 0:
+        return -1
+    score = cpu_draft_scores(position, vorp, adp, needs, qb_count)
+
+    # 3. Draw from the top 10 by adjusted score, ranked like FutureSimulator._draw
+    top_10 = top_candidates(score)
+    probabilities = CPU_PICK_PROBABILITIES
+    if len(top_10) < len(probabilities):
+        probabilities = probabilities[:len(top_10)] / probabilities[:len(top_10)].sum()
+    if rng is None:
+        return top_10[np.random.choice(len(top_10), p=probabilities)]
+    return top_10[rng.choice(len(top_10), p=probabilities)]
+
+
+def user_auto_pick_kernel(
+    position: np.ndarray,
+    vona: np.ndarray,
+    vorp: np.ndarray,
+    adp: np.ndarray,
+    needs: np.ndarray,
+    qb_count: int
+) -> int:
+    """
+    Array version of `simulate_user_auto_pick` with the same scoring.
+
+    Returns:
+        The index of the chosen player within the input arrays, or -1 if empty.
+    """
+    if len(position) == 0:
+        return -1
+
+    score = (0.5 * average_rank(vona, ascending=False)) + \
+            (0.2 * average_rank(vorp, ascending=False)) + \
+            (0.3 * average_rank(np.where(np.isnan(adp), 999, adp)))
+
+    if qb_count >= 2:
+        score[position == QB_CODE] *= 5.0
+    score[needs[position]] *= 0.75
+    scarce_index = _scarcity_bonus_index(position, vorp)
+    if scarce_index >= 0:
+        score[scarce_index] -= 5
+
+    return int(np.argsort(score, kind='stable')[0])
+
+
+def _column_array(players: pd.DataFrame, column: str) -> np.ndarray:
+    return pd.to_numeric(players[column], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
 
 def calculate_positional_scarcity(players: pd.DataFrame) -> dict:
     """
@@ -36,93 +198,40 @@ def calculate_draft_score(players: pd.DataFrame) -> pd.DataFrame:
         
     return players
 
-def simulate_cpu_pick(available_players: pd.DataFrame, team: Team, full_player_df: pd.DataFrame) -> str:
+def simulate_cpu_pick(available_players: pd.DataFrame, team: Team) -> str:
     """
     Simulates a CPU pick using a balanced approach of Best Player Available (BPA),
     positional need, and positional scarcity.
-    """
-    # 1. Calculate draft_score for all available players to establish a BPA baseline.
-    players = calculate_draft_score(available_players)
 
-    # 2. Apply penalties and bonuses
-    # QB Penalty: If team has 2 QBs, heavily penalize drafting another
-    if team.count_players_at_position('QB', full_player_df) >= 2:
-        players.loc[players['position'] == 'QB', 'draft_score'] *= 5.0 # Heavy penalty
-
-    # Starter Bonus: Prioritize filling starting spots
-    starting_needs = team.get_starting_positional_needs()
-    if starting_needs:
-        needed_indices = players[players['position'].isin(starting_needs)].index
-        players.loc[needed_indices, 'draft_score'] *= 0.70 # Significant bonus
-
-    # Scarcity Bonus
-    scarcity = calculate_positional_scarcity(players)
-    if scarcity:
-        scarcest_position = max(scarcity, key=scarcity.get)
-        top_player_at_scarcest = players[players['position'] == scarcest_position].sort_values(by='VORP', ascending=False).head(1)
-        if not top_player_at_scarcest.empty:
-            player_index = top_player_at_scarcest.index[0]
-            players.loc[player_index, 'draft_score'] -= 10
-
-    # 3. Make the pick based on the adjusted score.
-    top_10 = players.sort_values(by='draft_score', ascending=True).head(10)
-    
-    if top_10.empty:
+    This is a DataFrame wrapper around `cpu_pick_kernel`.
+    """
+    if available_players.empty:
         return "No players available"
-        
-    choices = top_10['display_name'].tolist()
-    
-    probabilities = [0.60, 0.20, 0.10, 0.05, 0.02, 0.01, 0.005, 0.005, 0.005, 0.005]
-    
-    if len(choices) < len(probabilities):
-        probabilities = probabilities[:len(choices)]
-        prob_sum = sum(probabilities)
-        if prob_sum > 0:
-            probabilities = [p / prob_sum for p in probabilities]
-        else:
-            probabilities = [1 / len(choices)] * len(choices)
 
-    return np.random.choice(choices, p=probabilities)
+    pick_index = cpu_pick_kernel(
+        encode_positions(available_players['position']),
+        _column_array(available_players, 'VORP'),
+        _column_array(available_players, 'ADP') if 'ADP' in available_players.columns else None,
+        team.starting_needs_mask(),
+        team.count_players_at_position('QB')
+    )
+    return available_players['display_name'].iat[pick_index]
 
-def simulate_user_auto_pick(available_players: pd.DataFrame, team: Team, full_player_df: pd.DataFrame) -> str:
+def simulate_user_auto_pick(available_players: pd.DataFrame, team: Team) -> str:
     """
     Simulates a user's auto-pick using a VONA-enhanced hybrid score.
+
+    This is a DataFrame wrapper around `user_auto_pick_kernel`.
     """
     if available_players.empty:
         return "No players available"
 
-    # 1. Create ranks for VONA, VORP, and ADP
-    players = available_players.copy()
-    players['vona_rank'] = players['VONA'].rank(ascending=False, na_option='bottom')
-    players['vorp_rank'] = players['VORP'].rank(ascending=False, na_option='bottom')
-    players['adp_rank'] = players['ADP'].fillna(999).rank(ascending=True, na_option='bottom')
-
-    # 2. Calculate the hybrid auto_pick_score
-    players['auto_pick_score'] = (0.5 * players['vona_rank']) + \
-                                 (0.2 * players['vorp_rank']) + \
-                                 (0.3 * players['adp_rank'])
-
-    # 3. Apply penalties and bonuses
-    # QB Penalty
-    if team.count_players_at_position('QB', full_player_df) >= 2:
-        players.loc[players['position'] == 'QB', 'auto_pick_score'] *= 5.0
-
-    # Starter Bonus
-    starting_needs = team.get_starting_positional_needs()
-    if starting_needs:
-        needed_indices = players[players['position'].isin(starting_needs)].index
-        players.loc[needed_indices, 'auto_pick_score'] *= 0.75
-
-    # Scarcity Bonus
-    scarcity = calculate_positional_scarcity(players)
-    if scarcity:
-        scarcest_position = max(scarcity, key=scarcity.get)
-        top_player_at_scarcest = players[players['position'] == scarcest_position].sort_values(by='VORP', ascending=False).head(1)
-        if not top_player_at_scarcest.empty:
-            player_index = top_player_at_scarcest.index[0]
-            players.loc[player_index, 'auto_pick_score'] -= 5
-
-    # 4. Make the pick based on the best (lowest) auto_pick_score
-    best_pick = players.sort_values(by='auto_pick_score', ascending=True).iloc[0]
-    
-    return best_pick['display_name']
\ No newline at end of file
+    pick_index = user_auto_pick_kernel(
+        encode_positions(available_players['position']),
+        _column_array(available_players, 'VONA'),
+        _column_array(available_players, 'VORP'),
+        _column_array(available_players, 'ADP'),
+        team.starting_needs_mask(),
+        team.count_players_at_position('QB')
+    )
+    return available_players['display_name'].iat[pick_index]
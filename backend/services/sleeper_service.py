@@ -3,9 +3,148 @@ Service for interacting with the Sleeper API.
 """
 import logging
 import requests
-import pandas as pd
-from . import data_service
-from backend import utils
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from backend import config
+
+def _parse_draft_settings(data: dict) -> dict:
+    """Extracts the settings the draft tool needs from a Sleeper draft object."""
+    return {
+        'rounds': data.get('settings', {}).get('rounds', 15),
+        'teams': data.get('settings', {}).get('teams', 12),
+        'order': data.get('type', 'snake'),
+        'format': data.get('metadata', {}).get('scoring_type', 'std').upper(),
+        'slot_to_roster_id': data.get('slot_to_roster_id', {})
+    }
+
+def create_session() -> requests.Session:
+    """
+    Creates a pooled session that keeps its connection to Sleeper alive between
+    polls and retries transient failures with backoff.
+    """
+    session = requests.Session()
+    retries = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=['GET'])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+def poll_interval(picks_until_turn: int) -> float:
+    """
+    Seconds to wait before the next poll: POLL_MIN_SECONDS when the user is
+    next or one pick away, growing with the distance up to POLL_MAX_SECONDS.
+    """
+    return min(config.POLL_MAX_SECONDS, config.POLL_MIN_SECONDS * max(1, picks_until_turn))
+
+
+class SleeperClient:
+    """
+    Client for one Sleeper draft. It reuses a pooled session, sends
+    If-None-Match with the last ETag so unchanged resources cost a 304 with no
+    body, and tracks the picks already seen so callers only handle new ones.
+    """
+    def __init__(self, draft_id: str, base_url: str | None = None, session: requests.Session | None = None, timeout: float = 10):
+        self.draft_id = draft_id
+        self.base_url = (base_url or config.SLEEPER_API_URL).rstrip('/')
+        self.session = session or create_session()
+        self.timeout = timeout
+        self.picks: list = []
+        self._etags: dict = {}
+        self._bodies: dict = {}
+
+    def _fetch(self, path: str) -> requests.Response | None:
+        """
+        Fetches a resource, revalidating with its last ETag.
+
+        Returns:
+            The response, or None if the resource is unchanged (a 304, whose
+            body is empty).
+        """
+        url = f"{self.base_url}{path}"
+        headers = {'If-None-Match': self._etags[url]} if url in self._etags else {}
+        response = self.session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        if response.headers.get('ETag'):
+            self._etags[url] = response.headers['ETag']
+        return response
+
+    def _get_json(self, path: str) -> tuple:
+        """
+        Fetches a JSON resource, revalidating with its last ETag and keeping
+        the decoded body to return when it is unchanged.
+
+        Returns:
+            The decoded body and whether it changed since the last fetch.
+        """
+        url = f"{self.base_url}{path}"
+        response = self._fetch(path)
+        if response is None:
+            return self._bodies[url], False
+        data = response.json()
+        if url in self._etags:
+            self._bodies[url] = data
+        return data, True
+
+    def get_draft_settings(self) -> dict | None:
+        """
+        Fetches the settings for the draft.
+
+        Returns:
+            A dictionary with the draft settings or None if an error occurs.
+        """
+        try:
+            data, _ = self._get_json(f"/draft/{self.draft_id}")
+            settings = _parse_draft_settings(data)
+            logging.info(f"Successfully fetched draft settings: {settings}")
+            return settings
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to fetch draft settings from Sleeper API: {e}")
+            return None
+        except Exception as e:
+            logging.error(f"An unexpected error occurred in get_draft_settings: {e}")
+            return None
+
+    def resume(self, pick_count: int) -> None:
+        """
+        Marks the first `pick_count` picks as already processed, e.g. after
+        replaying a journal, so the next fetch returns only the picks made
+        since. `picks` holds None for them until that fetch fills them in.
+        """
+        self.picks = [None] * pick_count
+
+    def get_new_picks(self) -> list:
+        """
+        Fetches the pick list and returns only the picks made since the last
+        call, in pick order. Returns an empty list if nothing changed or the
+        request failed; the next call picks up where this one left off.
+
+        An unchanged list costs a 304 and returns before any body is read.
+        Sleeper only serves the full list, so when it has changed the whole
+        body is decoded and the new picks are sliced off afterwards.
+        """
+        try:
+            response = self._fetch(f"/draft/{self.draft_id}/picks")
+            if response is None:
+                return []
+            picks_data = response.json()
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Failed to fetch picks from Sleeper API: {e}")
+            return []
+        except Exception as e:
+            logging.error(f"An unexpected error occurred in get_new_picks: {e}")
+            return []
+        if len(picks_data) < len(self.picks):
+            logging.warning(f"Sleeper pick list shrank from {len(self.picks)} to {len(picks_data)} picks; keeping the picks already processed.")
+            return []
+
+        new_picks = picks_data[len(self.picks):]
+        # Replaces any placeholders left by resume()
+        self.picks = picks_data[:len(self.picks)] + new_picks
+        logging.debug(f"Fetched {len(new_picks)} new picks from Sleeper ({len(self.picks)} total).")
+        return new_picks
+
 
 def get_draft_settings(draft_id: str) -> dict | None:
     """
@@ -17,50 +156,19 @@ def get_draft_settings(draft_id: str) -> dict | None:
     Returns:
         A dictionary with the draft settings or None if an error occurs.
     """
-    api_url = f"https://api.sleeper.app/v1/draft/{draft_id}"
-    try:
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        
-        # Extract the relevant settings
-        settings = {
-            'rounds': data.get('settings', {}).get('rounds', 15),
-            'teams': data.get('settings', {}).get('teams', 12),
-            'order': data.get('type', 'snake'),
-            'format': data.get('metadata', {}).get('scoring_type', 'std').upper(),
-            'slot_to_roster_id': data.get('slot_to_roster_id', {})
-        }
-        logging.info(f"Successfully fetched draft settings: {settings}")
-        return settings
-        
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to fetch draft settings from Sleeper API: {e}")
-        return None
-    except Exception as e:
-        logging.error(f"An unexpected error occurred in get_draft_settings: {e}")
-        return None
+    return SleeperClient(draft_id).get_draft_settings()
 
 def get_all_picks(draft_id: str) -> list:
     """
     Fetches all picks that have been made in a Sleeper draft.
-    
+
+    For repeated polling use SleeperClient.get_new_picks, which keeps the
+    connection open and skips unchanged responses.
+
     Args:
         draft_id: The ID of the Sleeper draft.
 
     Returns:
         A list of pick objects.
     """
-    api_url = f"https://api.sleeper.app/v1/draft/{draft_id}/picks"
-    try:
-        response = requests.get(api_url, timeout=10)
-        response.raise_for_status()
-        picks_data = response.json()
-        logging.info(f"Successfully fetched {len(picks_data)} picks from Sleeper.")
-        return picks_data
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to fetch picks from Sleeper API: {e}")
-        return []
-    except Exception as e:
-        logging.error(f"An unexpected error occurred in get_all_picks: {e}")
-        return []
+    return SleeperClient(draft_id).get_new_picks()
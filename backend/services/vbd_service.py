@@ -1,20 +1,28 @@
 import pandas as pd
 from backend import config
-from backend.services import data_service
+from backend.services import board_cache, data_service, identity_service
 from backend import utils
 import logging
 from .draft import Draft, Team
-from .simulation_service import simulate_cpu_pick
+from .draft_service import get_team_index
+from .profiler import profiled
+from .simulation_service import cpu_pick_kernel
+from .vorp_index import replacement_rank
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='[%(levelname)s] %(message)s')
 
+# Positions with projected fantasy points
+SKILL_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+
+@profiled("calculate_vorp")
 def calculate_vorp(
     df: pd.DataFrame, 
     position: str, 
     teams: int = config.DEFAULT_TEAMS, 
     format: str = config.DEFAULT_DRAFT_FORMAT,
-    roster_config = config.DEFAULT_ROSTER_POS
+    roster_config = config.DEFAULT_ROSTER_POS,
+    output_column: str = 'VORP'
 ) -> pd.DataFrame:
     """
     Calculates Value Over Replacement Player (VORP) for a given position and merges it back.
@@ -25,11 +33,12 @@ def calculate_vorp(
         teams: The number of teams in the league.
         format: The scoring format (e.g., 'STD', 'PPR').
         roster_config: A list representing the league's roster construction.
+        output_column: The column to write VORP to, e.g. 'VORP_PPR' on a multi-format board.
 
     Returns:
-        The original DataFrame with a 'VORP' column updated for the specified position.
+        The original DataFrame with the VORP column updated for the specified position.
     """
-    if format not in ['STD', 'PPR', 'HalfPPR']:
+    if format not in config.DRAFT_FORMATS:
         raise ValueError(f"Unsupported format: {format}")
 
     points_column = f"fantasy_points_{format.lower()}"
@@ -37,18 +46,11 @@ def calculate_vorp(
         raise KeyError(f"Points column '{points_column}' not found in DataFrame.")
 
     # Ensure VORP column exists
-    if 'VORP' not in df.columns:
-        df['VORP'] = 0.0
+    if output_column not in df.columns:
+        df[output_column] = 0.0
 
     # Determine replacement level based on roster settings
-    num_starters = roster_config.count(position)
-    num_flex = roster_config.count('FLEX')
-
-    # A simple approach to FLEX: assume a 50/50 split between RB and WR
-    if position == 'RB' or position == 'WR':
-        replacement_level = (num_starters * teams) + int(num_flex * teams * 0.5)
-    else:
-        replacement_level = num_starters * teams
+    replacement_level = replacement_rank(position, teams, roster_config)
 
     # Sort players by fantasy points for the specified position
     df_pos = df[df['position'] == position].copy()
@@ -66,12 +68,13 @@ def calculate_vorp(
     df_pos['VORP_pos'] = (df_pos[points_column] - replacement_value) * adjustment_factor
     
     # Update the main DataFrame's VORP column for the specific position
-    df.loc[df_pos.index, 'VORP'] = df_pos['VORP_pos']
+    df.loc[df_pos.index, output_column] = df_pos['VORP_pos']
     
     return df
 
 
-def calculate_vona(player_to_eval: pd.Series, draft_sim: Draft, teams_list_sim: list[Team], picks_to_simulate: int, teams: int, current_pick: int, draft_order: str, full_player_df: pd.DataFrame) -> float:
+@profiled("calculate_vona")
+def calculate_vona(player_to_eval: pd.Series, draft_sim: Draft, teams_list_sim: list[Team], picks_to_simulate: int, teams: int, current_pick: int, draft_order: str) -> float:
     """
     Calculates a more accurate VONA by simulating the draft picks until the user's next turn.
     If the calculated VONA is NaN or negative, it returns 0.
@@ -80,41 +83,36 @@ def calculate_vona(player_to_eval: pd.Series, draft_sim: Draft, teams_list_sim:
     points_col = f"fantasy_points_{draft_sim.format.lower()}"
     player_points = player_to_eval[points_col]
     player_position = player_to_eval['position']
-    # Simulate the picks
-    for i in range(picks_to_simulate):
-        pick_num = current_pick + i + 1
-        current_round = (pick_num - 1) // teams + 1
 
-        if draft_order == 'snake' and current_round % 2 == 0:
-            team_index = teams - ((pick_num - 1) % teams) - 1
-        else:
-            team_index = (pick_num - 1) % teams
+    # VORP is maintained incrementally instead of recalculated on every pick
+    vorp_index = draft_sim.track_vorp()
+    state = draft_sim.state
 
+    # Simulate the picks
+    for i in range(picks_to_simulate):
+        team_index = get_team_index(current_pick + i + 1, teams, draft_order)
         cpu_team = teams_list_sim[team_index]
 
         # Simulate the pick for the CPU team
-        available_for_cpu = draft_sim.get_available_players()
-        if available_for_cpu.empty:
+        available_ids = draft_sim.available_ids()
+        if len(available_ids) == 0:
             break # No more players to draft
 
-        # Ensure VORP is calculated for the simulation frame
-        for position in ['QB', 'RB', 'WR', 'TE']:
-            available_for_cpu = calculate_vorp(available_for_cpu, position, teams=draft_sim.teams, format=draft_sim.format)
-
-        cpu_pick_name = simulate_cpu_pick(available_for_cpu, cpu_team, full_player_df)
-        pos = draft_sim.draft_player(cpu_pick_name)
+        pick_index = cpu_pick_kernel(
+            state.position[available_ids],
+            vorp_index.vorp(available_ids),
+            state.adp[available_ids] if state.has_adp else None,
+            cpu_team.starting_needs_mask(),
+            cpu_team.count_players_at_position('QB')
+        )
+        row_id = available_ids[pick_index]
+        pos = draft_sim.draft_row(row_id)
         if pos:
-            cpu_team.add_player(cpu_pick_name, pos)
+            cpu_team.add_player(draft_sim.players['display_name'].iat[row_id], pos)
 
-    # After simulation, find the best available player at the same position
-    remaining_players = draft_sim.get_available_players()
-    best_remaining_at_pos = remaining_players[remaining_players['position'] == player_position]
-
-    if best_remaining_at_pos.empty:
-        # If no players are left at the position, the value is 0 per new requirement
-        return 0.0
-
-    next_best_points = best_remaining_at_pos.sort_values(by=points_col, ascending=False).iloc[0][points_col]
+    # After simulation, find the best available player at the same position.
+    # If no players are left at the position, the value is 0 per new requirement.
+    next_best_points = draft_sim.state.best_points_at_position(player_position)
 
     vona_value = player_points - next_best_points
 
@@ -125,11 +123,80 @@ def calculate_vona(player_to_eval: pd.Series, draft_sim: Draft, teams_list_sim:
         return vona_value
 
 
-def create_vbd_big_board(season: int = 2024, format: str = config.DEFAULT_DRAFT_FORMAT, teams: int = config.DEFAULT_TEAMS) -> pd.DataFrame:
+@profiled("create_big_boards")
+def create_vbd_big_boards(season: int = 2024, teams: int = config.DEFAULT_TEAMS, formats: list = config.DRAFT_FORMATS, use_cache: bool = True) -> pd.DataFrame:
+    """
+    Creates one big board covering several scoring formats from a single load
+    and merge of the inputs. Each format gets its own ADP_{format},
+    fantasy_points_{format} and VORP_{format} columns; rows stay in ADP file
+    order. Use select_format to slice out the board for one format.
+
+    Finished boards are cached on disk, keyed on the league settings and the
+    input files (the identity crosswalk included, since it decides the joins),
+    so a warm start skips the load/normalize/merge entirely.
+    """
+    formats = list(formats)
+    input_files = [data_service.get_latest_adp_path(), identity_service.crosswalk_path()] + \
+        [data_service.get_athletic_projections_path(position, format) for format in formats for position in SKILL_POSITIONS]
+    settings = {
+        'season': season,
+        'formats': formats,
+        'teams': teams,
+        'roster': config.DEFAULT_ROSTER_POS,
+        'position_adjustment': config.POSITION_ADJUSTMENT,
+    }
+    key = board_cache.cache_key(settings, input_files)
+    if use_cache:
+        cached = board_cache.load(key)
+        if cached is not None:
+            return cached
+
+    boards = _build_vbd_big_boards(formats, teams)
+    if use_cache and not boards.empty:
+        # The build may have saved newly learned aliases to the crosswalk
+        board_cache.store(board_cache.cache_key(settings, input_files), boards)
+    return boards
+
+
+def select_format(boards: pd.DataFrame, format: str) -> pd.DataFrame:
+    """
+    Slices the board for one format out of create_vbd_big_boards output. The
+    format's ADP and VORP columns become 'ADP' and 'VORP', the other formats'
+    points and VORP are dropped, and the board is sorted by VORP.
+    """
+    if boards.empty:
+        return boards.copy()
+    points_column = f"fantasy_points_{format.lower()}"
+    vorp_column = f"VORP_{format}"
+    if vorp_column not in boards.columns:
+        raise KeyError(f"Format '{format}' not found in big boards.")
+
+    other_columns = [col for col in boards.columns
+                     if col.startswith(('fantasy_points_', 'VORP_')) and col not in (points_column, vorp_column)]
+    board = boards.drop(columns=other_columns).rename(columns={vorp_column: 'VORP'})
+
+    # Rename the format-specific ADP column to a generic 'ADP' for easier use
+    adp_column_name = f"ADP_{format}"
+    if adp_column_name in board.columns:
+        board.rename(columns={adp_column_name: 'ADP'}, inplace=True)
+    else:
+        logging.warning(f"ADP column '{adp_column_name}' not found. ADP values will be missing.")
+        board.insert(board.columns.get_loc(points_column), 'ADP', None)
+
+    # Sort the final big board by VORP
+    return board.sort_values(by='VORP', ascending=False)
+
+
+def create_vbd_big_board(season: int = 2024, format: str = config.DEFAULT_DRAFT_FORMAT, teams: int = config.DEFAULT_TEAMS, use_cache: bool = True) -> pd.DataFrame:
     """
     Creates a VORP-based "big board" for all positions, incorporating ADP data.
     Kickers and Defenses will be included but will have a VORP of 0.
     """
+    return select_format(create_vbd_big_boards(season, teams, [format], use_cache), format)
+
+
+def _build_vbd_big_boards(formats: list, teams: int) -> pd.DataFrame:
+    """Builds the multi-format big board from the ADP data and projection files."""
     # 1. Load ADP data as the base DataFrame to include all players (including K, DEF)
     base_df = data_service.load_adp_data()
     if base_df is None or base_df.empty:
@@ -138,47 +205,50 @@ def create_vbd_big_board(season: int = 2024, format: str = config.DEFAULT_DRAFT_
 
     # Ensure base columns exist
     if 'normalized_name' not in base_df.columns and 'display_name' in base_df.columns:
-        base_df['normalized_name'] = base_df['display_name'].apply(utils.normalize_name)
-    
-    # Rename the format-specific ADP column to a generic 'ADP' for easier use
-    adp_column_name = f"ADP_{format}"
-    if adp_column_name in base_df.columns:
-        base_df.rename(columns={adp_column_name: 'ADP'}, inplace=True)
-    else:
-        logging.warning(f"ADP column '{adp_column_name}' not found. ADP values will be missing.")
-        base_df['ADP'] = None
-
-    # 2. Create a DataFrame for skill positions with fantasy points
-    skill_players_df = pd.DataFrame()
-    for position in ['QB', 'RB', 'WR', 'TE']:
-        pos_df = data_service.load_athletic_projections(position, format)
-        if pos_df is not None:
-            pos_df.rename(columns={'Player': 'display_name', 'FPS': f'fantasy_points_{format.lower()}'}, inplace=True)
-            pos_df['position'] = position
-            pos_df['normalized_name'] = pos_df['display_name'].apply(utils.normalize_name)
-            skill_players_df = pd.concat([skill_players_df, pos_df], ignore_index=True)
-        else:
-            logging.warning(f"Athletic projections file not found for {position}. Skipping.")
-
-    # 3. Merge the fantasy points into the base DataFrame
-    if not skill_players_df.empty:
-        # Select only the key columns to merge from skill_players_df
-        points_col = f'fantasy_points_{format.lower()}'
-        merge_cols = ['normalized_name', points_col]
-        if points_col in skill_players_df.columns:
-            base_df = pd.merge(base_df, skill_players_df[merge_cols], on='normalized_name', how='left')
-        else:
-            base_df[points_col] = 0.0
-    else:
-        base_df[f'fantasy_points_{format.lower()}'] = 0.0
-
-    # 4. Calculate VORP for all positions (will handle K/DEF gracefully)
+        base_df['normalized_name'] = utils.normalize_names(base_df['display_name'])
+    # Projections are joined on player_uid; new players are added to the crosswalk
+    resolver = identity_service.IdentityResolver.load()
+    base_df['player_uid'] = resolver.register(base_df)
+
+    # 2. Collect every format's skill projections into one long-form frame
+    projections = data_service.load_athletic_projections_table(formats, SKILL_POSITIONS)
+    for format in formats:
+        for position in SKILL_POSITIONS:
+            if not data_service.get_athletic_projections_path(position, format).exists():
+                logging.warning(f"Athletic projections file not found for {position} ({format}). Skipping.")
+    projected_formats = set(projections['format'])
+
+    # 3. Pivot to one points column per format and merge into the base DataFrame once
+    points_columns = {format: f'fantasy_points_{format.lower()}' for format in formats}
+    if not projections.empty:
+        skill_players_df = projections.rename(columns={'Player': 'display_name', 'FPS': 'points'})
+        skill_players_df['player_uid'] = resolver.resolve(skill_players_df['display_name'], skill_players_df['position'], 'athletic')
+        skill_players_df = (skill_players_df.dropna(subset=['player_uid'])
+                            .drop_duplicates(subset=['format', 'player_uid'])
+                            .astype({'player_uid': 'int64'}))
+        points_df = (skill_players_df.pivot(index='player_uid', columns='format', values='points')
+                     .reindex(columns=formats)
+                     .rename(columns=points_columns)
+                     .reset_index())
+        points_df.columns.name = None
+        base_df = pd.merge(base_df, points_df, on='player_uid', how='left')
+    # Formats without any projections score every player 0
+    for format in formats:
+        if format not in projected_formats:
+            base_df[points_columns[format]] = 0.0
+
+    # Learned aliases make the next build's matches exact
+    if resolver.changed:
+        resolver.save()
+    if resolver.unmatched:
+        path = resolver.write_unmatched_report()
+        logging.warning(f"Unmatched projection names written to {path}")
+
+    # 4. Calculate VORP for every format and position (will handle K/DEF gracefully)
     all_positions = base_df['position'].unique()
     final_df = base_df.copy()
-    for position in all_positions:
-        final_df = calculate_vorp(final_df, position, teams, format)
+    for format in formats:
+        for position in all_positions:
+            final_df = calculate_vorp(final_df, position, teams, format, output_column=f'VORP_{format}')
 
-    # Sort the final big board by VORP
-    final_df.sort_values(by='VORP', ascending=False, inplace=True)
-    
-    return final_df
\ No newline at end of file
+    return final_df
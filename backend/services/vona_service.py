@@ -0,0 +1,507 @@
+"""
+Monte Carlo VONA: simulates many draft futures at once instead of a single
+stochastic rollout per candidate.
+"""
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from backend import config
+from .draft import Draft, Team
+from .draft_service import get_team_index
+from .draft_state import POSITION_CODES, OTHER_POSITION
+from .profiler import profiled
+from .simulation_service import CPU_PICK_PROBABILITIES, SCARCITY_POSITIONS, QB_CODE
+from .vorp_index import VORP_POSITIONS, replacement_rank
+
+NUM_CODES = OTHER_POSITION + 1
+FLEX_ELIGIBLE = np.zeros(NUM_CODES, dtype=bool)
+FLEX_ELIGIBLE[[POSITION_CODES[pos] for pos in config.FLEX_POSITIONS]] = True
+
+# Sort key for a missing value: after every real value, before drafted players
+MISSING_KEY = 1e300
+
+
+def batch_top_candidates(score: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    Row-wise indices of the `top_n` lowest scores of a 2-D array, best first,
+    with ties in column order: the same ranking as a stable argsort of each
+    row, as in `top_candidates`.
+    """
+    n = score.shape[1]
+    if n <= top_n:
+        return np.argsort(score, axis=1, kind='stable')
+    top = np.sort(np.argpartition(score, top_n - 1, axis=1)[:, :top_n], axis=1)
+    # A tie at the cut-off may have kept a later column over an earlier one;
+    # those rows are ranked in full instead
+    cutoff = np.take_along_axis(score, top, axis=1).max(axis=1)
+    tied = np.flatnonzero((score <= cutoff[:, None]).sum(axis=1) > top_n)
+    if len(tied):
+        top[tied] = np.argsort(score[tied], axis=1, kind='stable')[:, :top_n]
+    ranked = np.argsort(np.take_along_axis(score, top, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(top, ranked, axis=1)
+
+
+def batch_average_rank(keys: np.ndarray) -> np.ndarray:
+    """
+    Row-wise ascending average ranks of a 2-D array. Equal keys share the mean
+    of the ranks they span, as in `Series.rank(method='average')`.
+    """
+    futures, n = keys.shape
+    order = np.argsort(keys, axis=1, kind='stable')
+    sorted_keys = np.take_along_axis(keys, order, axis=1)
+
+    is_start = np.ones((futures, n), dtype=bool)
+    is_start[:, 1:] = sorted_keys[:, 1:] != sorted_keys[:, :-1]
+    is_end = np.ones((futures, n), dtype=bool)
+    is_end[:, :-1] = is_start[:, 1:]
+    columns = np.arange(n)
+    start = np.maximum.accumulate(np.where(is_start, columns, 0), axis=1)
+    end = np.minimum.accumulate(np.where(is_end, columns + 1, n)[:, ::-1], axis=1)[:, ::-1]
+
+    ranks = np.empty((futures, n))
+    np.put_along_axis(ranks, order, (start + 1 + end) / 2.0, axis=1)
+    return ranks
+
+
+class FutureSimulator:
+    """
+    Steps a batch of draft futures forward from the current state of a draft
+    to the user's next pick.
+
+    Availability is a futures x players boolean matrix. Every future makes the
+    same sequence of CPU picks with the scoring of `cpu_pick_kernel`, but each
+    future draws its own players, so rosters, needs and replacement levels are
+    tracked per future as well.
+    """
+    def __init__(self, draft: Draft, teams_list: list[Team], picks_to_simulate: int, current_pick: int):
+        state = draft.state
+        self.points = state.points
+        self.position = state.position
+        self.base_vorp = state.vorp
+        self.initial_available = state.available.copy()
+        self.pick_teams = [get_team_index(current_pick + i + 1, draft.teams, draft.order) for i in range(picks_to_simulate)]
+
+        # Row IDs per position sorted by points, NaN last, as in sort_values
+        self.orders = {}
+        for code in np.unique(self.position):
+            rows = np.flatnonzero(self.position == code)
+            self.orders[code] = rows[np.argsort(-self.points[rows], kind='stable')]
+
+        # Replacement levels for the positions whose VORP moves with the pool
+        self.levels = {POSITION_CODES[pos]: replacement_rank(pos, draft.teams) for pos in VORP_POSITIONS}
+        self.adjustment = np.ones(NUM_CODES)
+        for pos in VORP_POSITIONS:
+            self.adjustment[POSITION_CODES[pos]] = config.POSITION_ADJUSTMENT.get(pos, 1.0)
+        self.tracked_rows = np.flatnonzero(np.isin(self.position, list(self.levels)))
+
+        # ADP is static, so its ranking only needs the availability counts
+        # before and within each run of equal values.
+        self.has_adp = state.has_adp
+        adp = np.where(np.isnan(state.adp), 999, state.adp)
+        self.adp_order = np.argsort(adp, kind='stable')
+        sorted_adp = adp[self.adp_order]
+        run_starts = np.flatnonzero(np.r_[True, sorted_adp[1:] != sorted_adp[:-1]])
+        run_ends = np.r_[run_starts[1:], len(sorted_adp)]
+        run_lengths = run_ends - run_starts
+        self.adp_run_start = np.repeat(run_starts, run_lengths)
+        self.adp_run_end = np.repeat(run_ends, run_lengths)
+
+        # Players sharing a normalized name leave the pool together
+        self.siblings = {row: group for group in state._siblings.values() for row in group}
+        self.has_siblings = np.zeros(len(self.points), dtype=bool)
+        self.has_siblings[list(self.siblings)] = True
+
+        self._init_rosters(teams_list)
+
+    def _init_rosters(self, teams_list: list[Team]) -> None:
+        """Captures slot capacities and current fills for every team."""
+        self.capacity = np.stack([team.layout.capacity for team in teams_list])
+        self.flex_capacity = np.array([len(team.layout.flex_slots) for team in teams_list], dtype=np.int16)
+        self.bench_capacity = np.array([len(team.layout.bench_slots) for team in teams_list], dtype=np.int16)
+        self.filled = np.stack([team.filled for team in teams_list])
+        self.flex_filled = np.array([team.flex_filled for team in teams_list], dtype=np.int16)
+        self.bench_filled = np.array([team.bench_filled for team in teams_list], dtype=np.int16)
+        self.qb_count = np.array([team.position_counts[QB_CODE] for team in teams_list], dtype=np.int16)
+
+    def _replacement_and_scarcity(self, available: np.ndarray):
+        """
+        Returns per-future replacement points, scarcity by position and the row
+        of the top player at each scarcity position.
+        """
+        futures = available.shape[0]
+        replacement = np.zeros((futures, NUM_CODES))
+        seen = {}
+        for code, level in self.levels.items():
+            order = self.orders.get(code)
+            if order is None:
+                continue
+            # Running count of available players down the points order
+            seen[code] = np.cumsum(available[:, order], axis=1, dtype=np.int32)
+            count = seen[code][:, -1]
+            replacement_points = self.points[order][np.argmax(seen[code] > level, axis=1)]
+            # No replacement player found, so VORP is just their score
+            replacement[:, code] = np.where(count > level, replacement_points, 0)
+
+        scarcity = np.zeros((futures, len(SCARCITY_POSITIONS)))
+        top_rows = np.full((futures, len(SCARCITY_POSITIONS)), -1)
+        for k, pos in enumerate(SCARCITY_POSITIONS):
+            code = POSITION_CODES[pos]
+            if code not in seen:
+                continue
+            order = self.orders[code]
+            count = seen[code][:, -1]
+            first = np.argmax(seen[code] >= 1, axis=1)
+            second = np.argmax(seen[code] >= 2, axis=1)
+            first_vorp = (self.points[order][first] - replacement[:, code]) * self.adjustment[code]
+            second_vorp = (self.points[order][second] - replacement[:, code]) * self.adjustment[code]
+            scarcity[:, k] = np.where(count > 1, first_vorp - second_vorp, 0)
+            top_rows[:, k] = np.where(count > 0, order[first], -1)
+        return replacement, scarcity, top_rows
+
+    def _scores(self, available: np.ndarray, team_index: int, filled: np.ndarray, qb_count: np.ndarray) -> np.ndarray:
+        """Draft scores for every future, with drafted players at +inf."""
+        futures = available.shape[0]
+        replacement, scarcity, top_rows = self._replacement_and_scarcity(available)
+
+        vorp = np.broadcast_to(self.base_vorp, available.shape).copy()
+        tracked = self.tracked_rows
+        tracked_position = self.position[tracked]
+        vorp[:, tracked] = (self.points[tracked] - replacement[:, tracked_position]) * self.adjustment[tracked_position]
+
+        vorp_keys = np.where(available, np.where(np.isnan(vorp), MISSING_KEY, -vorp), np.inf)
+        score = batch_average_rank(vorp_keys)
+        if self.has_adp:
+            seen = np.zeros((futures, available.shape[1] + 1), dtype=np.int32)
+            np.cumsum(available[:, self.adp_order], axis=1, out=seen[:, 1:])
+            before = seen[:, self.adp_run_start]
+            count = seen[:, self.adp_run_end] - before
+            adp_rank = np.empty(available.shape)
+            adp_rank[:, self.adp_order] = before + (count + 1) / 2.0
+            score = (0.10 * score) + (0.90 * adp_rank)
+
+        # QB penalty, starter bonus and scarcity bonus
+        penalised = np.flatnonzero(qb_count[:, team_index] >= 2)
+        if len(penalised):
+            qb_rows = np.flatnonzero(self.position == QB_CODE)
+            score[np.ix_(penalised, qb_rows)] *= 5.0
+        needs = filled[:, team_index, :] < self.capacity[team_index]
+        score[needs[:, self.position]] *= 0.70
+
+        # Python's max() keeps the first position unless a later one is strictly larger
+        best = scarcity[:, 0].copy()
+        scarcest = np.zeros(futures, dtype=np.int64)
+        for k in range(1, len(SCARCITY_POSITIONS)):
+            larger = scarcity[:, k] > best
+            best = np.where(larger, scarcity[:, k], best)
+            scarcest = np.where(larger, k, scarcest)
+        target = top_rows[np.arange(futures), scarcest]
+        has_target = target >= 0
+        score[np.flatnonzero(has_target), target[has_target]] -= 10
+
+        score[~available] = np.inf
+        return score
+
+    def _draw(self, score: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """Draws one pick per future from its top 10 draft scores (-1 if none)."""
+        futures, n = score.shape
+        top_n = min(len(CPU_PICK_PROBABILITIES), n)
+        top = batch_top_candidates(score, top_n)
+        top_scores = np.take_along_axis(score, top, axis=1)
+
+        # Fewer than 10 players left: renormalise over the ones that remain
+        probabilities = np.where(np.isfinite(top_scores), CPU_PICK_PROBABILITIES[:top_n], 0.0)
+        cumulative = np.cumsum(probabilities, axis=1)
+        draws = rng.random(futures) * cumulative[:, -1]
+        choice = np.minimum((cumulative <= draws[:, None]).sum(axis=1), top_n - 1)
+        picks = top[np.arange(futures), choice]
+        return np.where(cumulative[:, -1] > 0, picks, -1)
+
+    def run(self, n_futures: int = config.VONA_FUTURES, rng: np.random.Generator | None = None) -> np.ndarray:
+        """
+        Simulates `n_futures` futures and returns their final availability
+        matrix with shape (n_futures, players).
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        available = np.tile(self.initial_available, (n_futures, 1))
+        filled = np.tile(self.filled, (n_futures, 1, 1))
+        flex_filled = np.tile(self.flex_filled, (n_futures, 1))
+        bench_filled = np.tile(self.bench_filled, (n_futures, 1))
+        qb_count = np.tile(self.qb_count, (n_futures, 1))
+
+        for team_index in self.pick_teams:
+            picks = self._draw(self._scores(available, team_index, filled, qb_count), rng)
+            drafted = np.flatnonzero(picks >= 0)
+            rows = picks[drafted]
+            available[drafted, rows] = False
+            for f, row in zip(drafted[self.has_siblings[rows]], rows[self.has_siblings[rows]]):
+                available[f, self.siblings[row]] = False
+
+            # Roster placement mirrors Team.add_player: own slot, then FLEX, then bench
+            t = team_index
+            position = self.position[rows]
+            own = filled[drafted, t, position] < self.capacity[t, position]
+            flex = ~own & FLEX_ELIGIBLE[position] & (flex_filled[drafted, t] < self.flex_capacity[t])
+            bench = ~own & ~flex & (bench_filled[drafted, t] < self.bench_capacity[t])
+            filled[drafted, t, position] += own
+            flex_filled[drafted, t] += flex
+            bench_filled[drafted, t] += bench
+            qb_count[drafted, t] += (position == QB_CODE) & (own | flex | bench)
+
+        return available
+
+    def best_remaining_points(self, available: np.ndarray) -> np.ndarray:
+        """
+        Returns the best remaining projected points per future and position code,
+        with shape (futures, NUM_CODES). NaN where a position has no projection left.
+        """
+        best = np.full((available.shape[0], NUM_CODES), np.nan)
+        for code, order in self.orders.items():
+            remaining = available[:, order]
+            first = np.argmax(remaining, axis=1)
+            best[:, code] = np.where(remaining.any(axis=1), self.points[order][first], np.nan)
+        return best
+
+
+# The simulator shipped to each worker process by the pool initializer
+_worker_simulator: FutureSimulator | None = None
+
+
+def _init_worker(simulator: FutureSimulator) -> None:
+    global _worker_simulator
+    _worker_simulator = simulator
+
+
+def _run_batch(batch_size: int, seed_sequence: np.random.SeedSequence) -> np.ndarray:
+    return _worker_simulator.run(batch_size, np.random.default_rng(seed_sequence))
+
+
+def _batches(n_futures: int, seed: int | None) -> tuple[list[int], list[np.random.SeedSequence]]:
+    """The fixed batch sizes for `n_futures` and one RNG stream per batch, spawned from `seed`."""
+    batch_sizes = [min(config.VONA_BATCH_SIZE, n_futures - start) for start in range(0, n_futures, config.VONA_BATCH_SIZE)]
+    return batch_sizes, np.random.SeedSequence(seed).spawn(len(batch_sizes))
+
+
+def iter_futures(simulator: FutureSimulator, n_futures: int = config.VONA_FUTURES, seed: int | None = None):
+    """Yields the batches of `simulate_futures` one at a time, in this process."""
+    for size, seed_sequence in zip(*_batches(n_futures, seed)):
+        yield simulator.run(size, np.random.default_rng(seed_sequence))
+
+
+def simulate_futures(
+    simulator: FutureSimulator,
+    n_futures: int = config.VONA_FUTURES,
+    seed: int | None = None,
+    workers: int = 1
+) -> np.ndarray:
+    """
+    Runs futures in fixed-size batches, each with its own RNG stream spawned
+    from `seed`. Batching does not depend on `workers`, so the parallel path
+    returns exactly the same availability matrix as the serial one.
+
+    Args:
+        simulator: The prepared simulator.
+        n_futures: Total number of futures.
+        seed: Root seed for the batch streams.
+        workers: Worker processes; 1 runs in this process. The simulator is
+            sent once per worker, not once per batch.
+    """
+    batch_sizes, seeds = _batches(n_futures, seed)
+    if workers <= 1 or len(batch_sizes) <= 1:
+        batches = list(iter_futures(simulator, n_futures, seed))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(simulator,)) as pool:
+            batches = list(pool.map(_run_batch, batch_sizes, seeds))
+    return np.vstack(batches)
+
+
+@profiled("evaluate_vona")
+def evaluate_vona(
+    draft: Draft,
+    teams_list: list[Team],
+    picks_to_simulate: int,
+    current_pick: int,
+    candidates: pd.Index | None = None,
+    n_futures: int = config.VONA_FUTURES,
+    seed: int | None = None,
+    workers: int = 1
+) -> pd.DataFrame:
+    """
+    Calculates Monte Carlo VONA for many candidates from one set of futures.
+
+    A candidate is never removed from the pool during the rollouts, so the
+    futures do not depend on which candidate is evaluated. They are simulated
+    once; the best remaining points per position are found once per future and
+    broadcast against every candidate.
+
+    Args:
+        draft: The current draft; it is not modified.
+        teams_list: The current teams; they are not modified.
+        picks_to_simulate: Picks between now and the user's next turn.
+        current_pick: The current overall pick number (1-based).
+        candidates: Big board index labels to evaluate. Defaults to every available player.
+        n_futures: Number of futures to simulate.
+        seed: Seed for the random picks.
+        workers: Worker processes for the rollouts (see `simulate_futures`).
+
+    Returns:
+        A DataFrame indexed like the big board with the mean VONA ('VONA'), its
+        variance across futures ('VONA_VAR') and the probability the player is
+        still available at the user's next pick ('SURVIVAL').
+
+    Raises:
+        KeyError: If any candidate label is not on the big board.
+    """
+    if candidates is None:
+        row_ids = draft.available_ids()
+    else:
+        row_ids = draft.players.index.get_indexer(candidates)
+        if (row_ids < 0).any():
+            # -1 would otherwise silently index the last row of the board
+            raise KeyError(f"Candidates not on the big board: {list(candidates[row_ids < 0])}")
+
+    simulator = FutureSimulator(draft, teams_list, picks_to_simulate, current_pick)
+    available = simulate_futures(simulator, n_futures, seed, workers)
+    return summarize_vona(draft, simulator, available, row_ids)
+
+
+def summarize_vona(draft: Draft, simulator: FutureSimulator, available: np.ndarray, row_ids: np.ndarray) -> pd.DataFrame:
+    """
+    Turns a futures x players availability matrix into the VONA, VONA_VAR and
+    SURVIVAL of the candidate rows, indexed like the big board.
+    """
+    next_best_points = simulator.best_remaining_points(available)
+
+    # futures x candidates; NaN or negative VONA counts as 0, as in calculate_vona
+    vona = draft.state.points[row_ids] - next_best_points[:, draft.state.position[row_ids]]
+    vona = np.where(np.isnan(vona) | (vona < 0), 0.0, vona)
+    return pd.DataFrame({
+        'VONA': vona.mean(axis=0),
+        'VONA_VAR': vona.var(axis=0, ddof=1) if len(available) > 1 else 0.0,
+        'SURVIVAL': available[:, row_ids].mean(axis=0),
+    }, index=draft.players.index[row_ids])
+
+
+def monte_carlo_vona(
+    player_to_eval: pd.Series,
+    draft: Draft,
+    teams_list: list[Team],
+    picks_to_simulate: int,
+    current_pick: int,
+    n_futures: int = config.VONA_FUTURES,
+    seed: int | None = None
+) -> dict:
+    """
+    Calculates VONA for a single player over many simulated futures until the
+    user's next pick. See `evaluate_vona` for the arguments.
+
+    Returns:
+        A dict with the mean VONA ('VONA'), its variance across futures
+        ('VONA_VAR') and the probability the candidate is still available at
+        the user's next pick ('SURVIVAL').
+    """
+    result = evaluate_vona(draft, teams_list, picks_to_simulate, current_pick,
+                           pd.Index([player_to_eval.name]), n_futures, seed)
+    return result.iloc[0].to_dict()
+
+
+class SpeculativeVona:
+    """
+    Background thread that keeps a VONA estimate current while other teams
+    are on the clock.
+
+    Each `update` hands the worker a snapshot of the draft. The worker runs
+    futures for it batch by batch and publishes a refined estimate after
+    every batch. When a newer snapshot arrives it drops the current one and
+    starts on the newer one. A completed estimate equals
+    `evaluate_vona(..., n_futures, seed)` for the same snapshot. Estimates
+    carry the `picks_made` of the update they belong to, so callers can
+    tell a current estimate from one made before the latest picks.
+    """
+    def __init__(self, n_futures: int = config.VONA_FUTURES, seed: int | None = None):
+        self.n_futures = n_futures
+        self.seed = seed
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._request = None
+        self._result = None
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="speculative-vona", daemon=True)
+        self._thread.start()
+
+    def update(self, draft: Draft, teams_list: list[Team], picks_to_simulate: int, current_pick: int,
+               picks_made: int | None = None) -> None:
+        """
+        Starts refining VONA for a new draft state; arguments as in
+        `evaluate_vona`, plus the number of picks made so far, which tags the
+        estimates for this state. The draft and teams are copied, so the
+        caller can keep changing them.
+        """
+        snapshot = (draft.copy(), [team.copy() for team in teams_list], picks_to_simulate, current_pick, picks_made)
+        with self._condition:
+            self._generation += 1
+            self._request = (self._generation,) + snapshot
+            self._condition.notify_all()
+
+    def latest(self) -> tuple:
+        """
+        Returns the most recent estimate without waiting.
+
+        Returns:
+            (VONA DataFrame or None, futures behind it, whether it is complete
+            and for the latest update, picks_made of the update it belongs to).
+        """
+        with self._condition:
+            if self._result is None:
+                return None, 0, False, None
+            generation, frame, futures, picks_made = self._result
+            return frame, futures, generation == self._generation and futures >= self.n_futures, picks_made
+
+    def wait(self, timeout: float | None = None, complete: bool = True) -> pd.DataFrame | None:
+        """
+        Waits until the estimate for the latest update is complete, or with
+        `complete=False` until it has its first batch, then returns it.
+        """
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._result is not None and self._result[0] == self._generation
+                        and (self._result[2] >= self.n_futures or not complete),
+                timeout)
+        return self.latest()[0]
+
+    def stop(self) -> None:
+        """Stops the worker thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._stopped or self._request is not None)
+                if self._stopped:
+                    return
+                generation, draft, teams_list, picks_to_simulate, current_pick, picks_made = self._request
+                self._request = None
+            try:
+                self._refine(generation, draft, teams_list, picks_to_simulate, current_pick, picks_made)
+            except Exception as e:
+                logging.error(f"Speculative VONA failed: {e}")
+
+    def _refine(self, generation: int, draft: Draft, teams_list: list[Team], picks_to_simulate: int,
+                current_pick: int, picks_made: int | None) -> None:
+        """Runs the batches of `simulate_futures` one at a time, publishing after each."""
+        row_ids = draft.available_ids()
+        simulator = FutureSimulator(draft, teams_list, picks_to_simulate, current_pick)
+        batches = []
+        for batch in iter_futures(simulator, self.n_futures, self.seed):
+            batches.append(batch)
+            available = np.vstack(batches)
+            frame = summarize_vona(draft, simulator, available, row_ids)
+            with self._condition:
+                if self._request is not None or self._stopped:
+                    return # A newer state arrived; this one is stale
+                self._result = (generation, frame, len(available), picks_made)
+                self._condition.notify_all()
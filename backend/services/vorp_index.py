@@ -0,0 +1,130 @@
+"""
+Incrementally maintained VORP for simulated drafts.
+"""
+import numpy as np
+from backend import config
+from .draft_state import DraftState, POSITION_CODES, OTHER_POSITION
+
+# Positions whose VORP is recomputed from the available pool during simulation
+VORP_POSITIONS = ['QB', 'RB', 'WR', 'TE']
+
+
+def replacement_rank(position: str, teams: int = config.DEFAULT_TEAMS, roster_config: list = config.DEFAULT_ROSTER_POS) -> int:
+    """
+    Returns the 0-based rank, by projected points, of the replacement-level
+    player at a position.
+    """
+    num_starters = roster_config.count(position)
+    num_flex = roster_config.count('FLEX')
+
+    # A simple approach to FLEX: assume a 50/50 split between RB and WR
+    if position == 'RB' or position == 'WR':
+        return (num_starters * teams) + int(num_flex * teams * 0.5)
+    return num_starters * teams
+
+
+class VorpIndex:
+    """
+    Keeps per-position VORP current as players are drafted, without re-sorting
+    the pool on every pick.
+
+    Each tracked position holds its row IDs sorted by projected points and a
+    cursor pointing at the current replacement-level player. Drafting a player
+    at or above the cursor moves the cursor forward to the next undrafted player;
+    drafting below it changes nothing. The cursor only ever moves forward, so
+    updates are amortised O(1). VORP for any row is then
+    `(points - replacement) * adjustment`, exactly as `calculate_vorp` computes
+    it on the available pool. Untracked positions (K, DEF) keep their board VORP.
+    """
+    def __init__(self, state: DraftState, teams: int = config.DEFAULT_TEAMS, roster_config: list = config.DEFAULT_ROSTER_POS, positions: list = VORP_POSITIONS):
+        self.state = state
+        self._tracked = np.zeros(OTHER_POSITION + 1, dtype=bool)
+        self._adjustment = np.ones(OTHER_POSITION + 1)
+        self._replacement = np.zeros(OTHER_POSITION + 1)
+        self._levels: dict = {}
+        self._order: dict = {}
+        self._cursor: dict = {}
+        self._rank = np.full(len(state), -1, dtype=np.int64)
+
+        for position in positions:
+            code = POSITION_CODES[position]
+            self._tracked[code] = True
+            self._adjustment[code] = config.POSITION_ADJUSTMENT.get(position, 1.0)
+            self._levels[code] = replacement_rank(position, teams, roster_config)
+            self._rebuild(code)
+
+    def copy(self, state: DraftState) -> "VorpIndex":
+        """Returns a copy bound to a forked DraftState. Sorted orders are shared."""
+        clone = object.__new__(VorpIndex)
+        clone.__dict__.update(self.__dict__)
+        clone.state = state
+        clone._replacement = self._replacement.copy()
+        clone._order = self._order.copy()
+        clone._cursor = self._cursor.copy()
+        return clone
+
+    def _rebuild(self, code: int) -> None:
+        """Re-sorts one position and places its replacement cursor from scratch."""
+        points = self.state.points
+        rows = np.flatnonzero(self.state.position == code)
+        # Sort by points descending; NaN projections sort last, as in sort_values
+        order = rows[np.argsort(-points[rows], kind='stable')]
+        self._rank = self._rank.copy()
+        self._rank[order] = np.arange(len(order))
+        self._order[code] = order
+
+        available = np.flatnonzero(self.state.available[order])
+        level = self._levels[code]
+        self._cursor[code] = available[level] if len(available) > level else len(order)
+        self._refresh_replacement(code)
+
+    def _refresh_replacement(self, code: int) -> None:
+        order = self._order[code]
+        cursor = self._cursor[code]
+        # No replacement player found, so VORP is just their score
+        self._replacement[code] = self.state.points[order[cursor]] if cursor < len(order) else 0
+
+    def rebuild(self) -> None:
+        """Recomputes every tracked position, e.g. after the availability mask was replaced."""
+        for code in self._order:
+            self._rebuild(code)
+
+    def remove(self, row_id: int) -> None:
+        """
+        Updates the index after a row has been marked unavailable in the state.
+        Must be called exactly once per newly drafted row.
+        """
+        code = self.state.position[row_id]
+        if not self._tracked[code]:
+            return
+        cursor = self._cursor[code]
+        if self._rank[row_id] > cursor:
+            return # Drafted below replacement level; nothing moves
+
+        order = self._order[code]
+        available = self.state.available
+        cursor += 1
+        while cursor < len(order) and not available[order[cursor]]:
+            cursor += 1
+        self._cursor[code] = cursor
+        self._refresh_replacement(code)
+
+    def update_points(self, row_id: int) -> None:
+        """Re-sorts only the position of a row whose projection changed."""
+        code = self.state.position[row_id]
+        if self._tracked[code]:
+            self._rebuild(code)
+
+    def replacement_value(self, position: str) -> float:
+        """Returns the current replacement-level points for a tracked position."""
+        return self._replacement[POSITION_CODES[position]]
+
+    def vorp(self, row_ids: np.ndarray | None = None) -> np.ndarray:
+        """
+        Returns current VORP for the given row IDs (all rows if None).
+        """
+        if row_ids is None:
+            row_ids = np.arange(len(self.state))
+        position = self.state.position[row_ids]
+        current = (self.state.points[row_ids] - self._replacement[position]) * self._adjustment[position]
+        return np.where(self._tracked[position], current, self.state.vorp[row_ids])
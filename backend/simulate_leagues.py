@@ -0,0 +1,47 @@
+"""
+Runs many automated drafts headlessly and writes the pick logs and final
+rosters to Parquet, partitioned by draft slot.
+
+    python -m backend.simulate_leagues 10000 --teams 12 --format PPR --workers 8 --compact
+"""
+import argparse
+from datetime import datetime
+from backend import config
+from backend.services.draft import Draft
+from backend.services.vbd_service import create_vbd_big_board
+from backend.services.batch_service import simulate_leagues
+from backend.services.board_schema import compact_board
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch draft simulator")
+    parser.add_argument("leagues", type=int, help="Number of leagues to simulate")
+    parser.add_argument("--teams", type=int, default=config.DEFAULT_TEAMS, help="Number of teams")
+    parser.add_argument("--rounds", type=int, default=config.DEFAULT_ROUNDS, help="Number of rounds")
+    parser.add_argument("--format", type=str, default=config.DEFAULT_DRAFT_FORMAT, help="Scoring format")
+    parser.add_argument("--order", choices=["snake", "normal"], default="snake", help="Draft order")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--seed", type=int, help="Root random seed, for reproducible runs")
+    parser.add_argument("--auto-slot", type=int, help="Draft slot that uses the user auto-pick instead of the CPU logic")
+    parser.add_argument("--vona-futures", type=int, default=0, help="Futures per VONA estimate for the auto-pick slot (default: 0, no VONA)")
+    parser.add_argument("--output", type=str, help="Output directory (default: data/simulations/<timestamp>)")
+    parser.add_argument("--compact", action="store_true", help="Hold the board in the compact schema (same picks, less memory per worker)")
+    args = parser.parse_args()
+
+    draft_format = args.format
+    big_board = create_vbd_big_board(format=draft_format, teams=args.teams)
+    if big_board.empty:
+        print("[Error] Big board could not be created. Exiting.")
+        return
+
+    if args.compact:
+        big_board = compact_board(big_board)
+
+    output_dir = args.output or config.SIMULATIONS_DIR / datetime.now().strftime("%Y%m%d_%H%M%S")
+    draft = Draft(big_board, draft_format, args.teams, args.rounds, order=args.order)
+    summary = simulate_leagues(draft, args.leagues, output_dir, seed=args.seed, workers=args.workers,
+                               auto_slot=args.auto_slot, vona_futures=args.vona_futures)
+    print(f"Simulated {summary['leagues']} leagues in {summary['seconds']:.1f}s "
+          f"({summary['drafts_per_second']:.2f} drafts/s). Results written to {summary['output_dir']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+from backend.services.draft import Draft
+from backend.tests.vorp_index_test import create_random_big_board
+
+pq = pytest.importorskip("pyarrow.parquet", exc_type=ImportError)
+from backend.services.batch_service import simulate_league, simulate_leagues
+
+def create_draft() -> Draft:
+    board = create_random_big_board(seed=3, size=200)
+    board['sleeper_id'] = [str(1000 + i) for i in range(len(board))]
+    return Draft(board, 'PPR', teams=4, rounds=8)
+
+def test_simulate_league_fills_every_team():
+    """Every pick drafts a distinct player and lands on its team's roster."""
+    picks, rosters = simulate_league(create_draft(), np.random.default_rng(0), auto_slot=2)
+    assert len(picks) == 32
+    assert len({row[3] for _, row in picks}) == 32
+    assert [slot for slot, _ in picks[:8]] == [1, 2, 3, 4, 4, 3, 2, 1]
+    drafted = [row[1] for _, row in rosters if row[1] is not None]
+    assert sorted(drafted) == sorted(row[3] for _, row in picks)
+
+def test_simulate_league_rosters_with_shared_names():
+    """Players who share a name keep their own position and points on each roster."""
+    draft = create_draft()
+    draft.players['display_name'] = [f"Player {i // 2}" for i in range(len(draft.players))]
+    picks, rosters = simulate_league(draft, np.random.default_rng(1))
+    for slot in range(1, 5):
+        drafted = sorted((row[4], np.nan_to_num(row[5])) for team, row in picks if team == slot)
+        rostered = sorted((row[2], np.nan_to_num(row[3])) for team, row in rosters if team == slot and row[1] is not None)
+        assert rostered == drafted
+
+def test_simulate_leagues_writes_partitions(tmp_path):
+    """Results are partitioned by slot, cover every league, and ignore the worker count."""
+    draft = create_draft()
+    summary = simulate_leagues(draft, 5, tmp_path / "serial", seed=7, chunk_leagues=2, row_group_leagues=1)
+    assert summary['leagues'] == 5 and summary['drafts_per_second'] > 0
+    picks = pd.read_parquet(tmp_path / "serial" / "picks")
+    assert len(picks) == 5 * 32
+    assert sorted(picks['slot'].astype(int).unique()) == [1, 2, 3, 4]
+    assert pq.ParquetFile(tmp_path / "serial" / "picks" / "slot=1" / "part-00000.parquet").num_row_groups == 2
+
+    simulate_leagues(draft, 5, tmp_path / "parallel", seed=7, workers=2, chunk_leagues=2, row_group_leagues=1)
+    for table in ['picks', 'rosters']:
+        serial = pd.read_parquet(tmp_path / "serial" / table).sort_values(['league_id', 'slot'], kind='stable')
+        parallel = pd.read_parquet(tmp_path / "parallel" / table).sort_values(['league_id', 'slot'], kind='stable')
+        pd.testing.assert_frame_equal(serial.reset_index(drop=True), parallel.reset_index(drop=True))
+
+    with pytest.raises(FileExistsError):
+        simulate_leagues(draft, 1, tmp_path / "serial")
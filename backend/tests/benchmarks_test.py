@@ -0,0 +1,41 @@
+import pytest
+from backend.benchmarks.load_test import summarize
+from backend.benchmarks.run_benchmarks import find_regressions, run_benchmarks
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services.draft import Draft
+
+def test_synthetic_big_board_shape():
+    """The synthetic board has the big board columns and respects the position mix."""
+    board = create_synthetic_big_board(size=400, format='HalfPPR', position_mix={'QB': 0.5, 'RB': 0.5}, seed=2)
+    assert len(board) == 400
+    assert set(board['position']) == {'QB', 'RB'}
+    for column in ['display_name', 'normalized_name', 'position', 'sleeper_id', 'ADP', 'ADP_PPR', 'fantasy_points_halfppr', 'VORP']:
+        assert column in board.columns
+    assert 'ADP_HalfPPR' not in board.columns
+    assert board['VORP'].is_monotonic_decreasing
+    # ADP follows value, so the top of the board goes early
+    assert board['ADP'].head(20).mean() < board['ADP'].tail(20).mean()
+    assert len(Draft(board, 'HalfPPR', 12, 15).available_ids()) == 400
+
+def test_find_regressions():
+    """Only benchmarks whose ratio to the reference exceeds baseline * threshold on the same universe are flagged."""
+    report = run_benchmarks(size=150, teams=4, rounds=3, repeat=2, only=['calculate_draft_score', 'draft_player'], min_sample_s=0.01)
+    assert set(report['benchmarks']) == {'calculate_draft_score', 'draft_player'}
+    for result in report['benchmarks'].values():
+        # Short calls are batched until a sample lasts min_sample_s; later samples may run a little faster
+        assert result['min_s'] * result['number'] >= 0.005 or result['number'] == 1024
+        assert result['ratio'] == result['min_s'] / report['reference']['min_s']
+    baseline = {'universe': report['universe'], 'benchmarks': {
+        'calculate_draft_score': {'ratio': report['benchmarks']['calculate_draft_score']['ratio'] / 10},
+        'draft_player': {'ratio': report['benchmarks']['draft_player']['ratio'] * 10},
+    }}
+    assert [name for name, _, _ in find_regressions(report, baseline, 1.5)] == ['calculate_draft_score']
+    baseline['universe'] = dict(report['universe'], size=151)
+    assert find_regressions(report, baseline) == []
+
+def test_load_test_summary():
+    """Latency summaries are in milliseconds, and an empty run reports no percentiles."""
+    summary = summarize([0.001 * ms for ms in range(1, 101)])
+    assert summary['count'] == 100 and summary['max_ms'] == pytest.approx(100)
+    assert summary['p50_ms'] == pytest.approx(50.5) and summary['p99_ms'] == pytest.approx(99.01)
+    assert summarize([]) == {'count': 0}
@@ -0,0 +1,106 @@
+
+import os
+import pandas as pd
+import pytest
+from backend import config
+from backend.services import board_cache
+from backend.services.vbd_service import create_vbd_big_board, create_vbd_big_boards, select_format
+
+def write_fake_inputs(data_dir):
+    """Writes a tiny ADP parquet and Athletic projection CSVs under data_dir."""
+    adp_dir = data_dir / "players_adp"
+    adp_dir.mkdir(parents=True)
+    names = ['Josh Allen', 'Bijan Robinson', "Ja'Marr Chase", 'Sam LaPorta', 'Justin Tucker', 'Saquon Barkley', 'CeeDee Lamb']
+    positions = ['QB', 'RB', 'WR', 'TE', 'K', 'RB', 'WR']
+    pd.DataFrame({
+        'display_name': names,
+        'normalized_name': [n.lower().replace("'", "") for n in names],
+        'position': positions,
+        'sleeper_id': [str(1000 + i) for i in range(len(names))],
+        'ADP_STD': [8.0, 1.0, 3.0, 60.0, 140.0, 2.0, 5.0],
+        'ADP_PPR': [10.0, 2.0, 1.0, 40.0, 150.0, 3.0, 4.0],
+    }).to_parquet(adp_dir / "2025-08-01_adp.parquet", index=False)
+
+    projections_dir = data_dir / "projections"
+    projections_dir.mkdir()
+    points = {'Josh Allen': 380.5, 'Bijan Robinson': 310.2, "Ja'Marr Chase": 330.1, 'Sam LaPorta': 190.0,
+              'Saquon Barkley': 300.4, 'CeeDee Lamb': 305.7}
+    for format, reception_weight in [('std', 0.8), ('halfppr', 0.9), ('ppr', 1.0)]:
+        for position in ['QB', 'RB', 'WR', 'TE']:
+            scale = 1.0 if position == 'QB' else reception_weight
+            rows = [(n, round(points[n] * scale, 1)) for n, p in zip(names, positions) if p == position]
+            pd.DataFrame(rows, columns=['Player', 'FPS']).to_csv(
+                projections_dir / f"athletic_{position.lower()}_projections_{format}.csv", sep='\t', index=False)
+    return adp_dir / "2025-08-01_adp.parquet"
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(config, 'PLAYER_ADP_DIR', tmp_path / "players_adp")
+    monkeypatch.setattr(config, 'BOARD_CACHE_DIR', tmp_path / "big_boards")
+    monkeypatch.setattr(config, 'IDENTITY_DIR', tmp_path / "identity")
+    monkeypatch.setattr(config, 'ARROW_CACHE_DIR', tmp_path / "arrow_cache")
+    return tmp_path
+
+def test_big_board_cache_round_trip(data_dir):
+    """A warm start returns the identical board from the cache."""
+    write_fake_inputs(data_dir)
+    cold = create_vbd_big_board(format='PPR', teams=2)
+    assert len(list((data_dir / "big_boards").glob("*.parquet"))) == 1
+    warm = create_vbd_big_board(format='PPR', teams=2)
+    pd.testing.assert_frame_equal(warm, cold)
+    pd.testing.assert_frame_equal(create_vbd_big_board(format='PPR', teams=2, use_cache=False), cold)
+
+def test_big_board_cache_invalidates_on_new_input(data_dir):
+    """Rewriting an input file or changing settings produces a new entry."""
+    adp_path = write_fake_inputs(data_dir)
+    create_vbd_big_board(format='PPR', teams=2)
+    create_vbd_big_board(format='PPR', teams=3)
+    stat = os.stat(adp_path)
+    os.utime(adp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    create_vbd_big_board(format='PPR', teams=2)
+    assert len(list((data_dir / "big_boards").glob("*.parquet"))) == 3
+
+def test_big_board_cache_follows_crosswalk(data_dir):
+    """Builds that learn nothing leave the crosswalk alone; editing it invalidates the cached board."""
+    write_fake_inputs(data_dir)
+    cold = create_vbd_big_board(format='PPR', teams=2)
+    crosswalk = data_dir / "identity" / "crosswalk.parquet"
+    written = os.stat(crosswalk).st_mtime_ns
+    pd.testing.assert_frame_equal(create_vbd_big_board(format='PPR', teams=2, use_cache=False), cold)
+    assert os.stat(crosswalk).st_mtime_ns == written
+    assert len(list((data_dir / "big_boards").glob("*.parquet"))) == 1
+
+    # Pointing Josh Allen's projection alias at CeeDee Lamb changes the joins
+    rows = pd.read_parquet(crosswalk)
+    allen = rows.loc[(rows['source'] == 'name') & (rows['key'] == 'josh allen'), 'player_uid'].iat[0]
+    lamb = rows.loc[(rows['source'] == 'name') & (rows['key'] == 'ceedee lamb'), 'player_uid'].iat[0]
+    rows.loc[(rows['source'] == 'athletic') & (rows['player_uid'] == allen), 'player_uid'] = lamb
+    rows = pd.concat([rows, pd.DataFrame({'player_uid': [lamb], 'source': ['athletic'], 'key': ['josh allen'], 'position': ['QB']})])
+    rows.drop_duplicates(subset=['source', 'key', 'position'], keep='last').to_parquet(crosswalk, index=False)
+    stat = os.stat(crosswalk)
+    os.utime(crosswalk, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    edited = create_vbd_big_board(format='PPR', teams=2)
+    assert pd.isna(edited.set_index('display_name').at['Josh Allen', 'fantasy_points_ppr'])
+
+def test_multi_format_big_boards(data_dir):
+    """Slicing the multi-format board gives the same board as a single-format build."""
+    write_fake_inputs(data_dir)
+    boards = create_vbd_big_boards(teams=2, use_cache=False)
+    assert {'VORP_STD', 'VORP_HalfPPR', 'VORP_PPR', 'fantasy_points_halfppr'} <= set(boards.columns)
+    for format in ['STD', 'HalfPPR', 'PPR']:
+        board = select_format(boards, format)
+        pd.testing.assert_frame_equal(board, create_vbd_big_board(format=format, teams=2, use_cache=False))
+    # HalfPPR has no ADP column in the input, matching the single-format fallback
+    assert select_format(boards, 'HalfPPR')['ADP'].isna().all()
+
+def test_cache_prune_evicts_least_recently_used(data_dir):
+    """Pruning removes the oldest entries first and keeps recently loaded ones."""
+    board = pd.DataFrame({'display_name': ['A'] * 100, 'VORP': range(100)})
+    paths = [board_cache.store(key, board) for key in ['a', 'b', 'c']]
+    for age, path in enumerate(reversed(paths)):
+        os.utime(path, (1000 - age, 1000 - age))
+    board_cache.load('a') # Touch the oldest entry
+    removed = board_cache.prune(max_bytes=2 * paths[0].stat().st_size)
+    assert removed == [paths[1]]
+    assert board_cache.load('b') is None and board_cache.load('a') is not None
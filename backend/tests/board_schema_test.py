@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from backend.benchmarks.board_memory import board_memory
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services.batch_service import simulate_leagues
+from backend.services.board_schema import compact_board, memory_report
+from backend.services.draft import Draft
+
+def test_compact_board_dtypes_and_lookups():
+    """Strings become categoricals, numbers shrink, and rows still resolve by name and ID."""
+    board = create_synthetic_big_board(size=300, seed=1)
+    compact = compact_board(board)
+    assert list(compact.columns) == list(board.columns) and compact.index.equals(board.index)
+    for column in ['display_name', 'normalized_name', 'position', 'team', 'sleeper_id']:
+        assert isinstance(compact[column].dtype, pd.CategoricalDtype)
+    assert compact['fantasy_points_ppr'].dtype == np.float32
+    assert str(compact['ADP'].dtype) == 'Int16'
+
+    # A value column whose float32 cast would create ties keeps float64
+    tied = pd.DataFrame({'VORP': [1.0, 1.0 + 1e-12, 2.0]})
+    assert compact_board(tied)['VORP'].dtype == np.float64
+
+    draft, compact_draft = Draft(board, 'PPR', 12, 15), Draft(compact, 'PPR', 12, 15)
+    name, sleeper_id = board['display_name'].iat[7], board['sleeper_id'].iat[9]
+    assert compact_draft.find_rows(name) == draft.find_rows(name)
+    assert compact_draft.row_for_sleeper_id(sleeper_id) == 9
+    assert np.array_equal(compact_draft.state.position, draft.state.position)
+    assert compact_draft.draft_row(7) == board['position'].iat[7]
+
+def test_compact_board_keeps_vorp_and_picks(tmp_path):
+    """VORP is unchanged to the precision stored, and seeded simulations draft the same players."""
+    board = create_synthetic_big_board(size=400, seed=0)
+    compact = compact_board(board)
+    assert np.array_equal(compact['VORP'].to_numpy(dtype=np.float64),
+                          board['VORP'].to_numpy(dtype=compact['VORP'].dtype).astype(np.float64), equal_nan=True)
+    assert np.array_equal(board['VORP'].rank(method='average').to_numpy(), compact['VORP'].rank(method='average').to_numpy(), equal_nan=True)
+
+    picks = []
+    for name, players in [('default', board), ('compact', compact)]:
+        simulate_leagues(Draft(players, 'PPR', 8, 10), 4, tmp_path / name, seed=3, auto_slot=2, vona_futures=2)
+        picks.append(pd.read_parquet(tmp_path / name / "picks").sort_values(['league_id', 'pick'])['sleeper_id'].tolist())
+    assert picks[0] == picks[1]
+
+def test_memory_report():
+    """The report totals each schema, and the measured copies of the compact board are smaller."""
+    board = create_synthetic_big_board(size=500)
+    report = memory_report(board)
+    assert report.loc['total', 'bytes'] == board.memory_usage(index=False, deep=True).sum()
+    assert report.loc['total', 'compact_copy_bytes'] < report.loc['total', 'copy_bytes'] / 2
+    measured = board_memory(size=500, copies=5)['measured']
+    assert measured.loc['compact', '5_copies_bytes'] < measured.loc['default', '5_copies_bytes']
@@ -0,0 +1,170 @@
+import glob
+import io
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs as fs
+import pyarrow.parquet as pq
+import pytest
+from backend import config
+from backend.services import data_service
+
+@pytest.fixture
+def adp_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'PLAYER_ADP_DIR', tmp_path / "players_adp")
+    monkeypatch.setattr(config, 'ARROW_CACHE_DIR', tmp_path / "arrow_cache")
+    config.PLAYER_ADP_DIR.mkdir()
+    data_service.clear_catalog()
+    yield config.PLAYER_ADP_DIR
+    data_service.clear_catalog()
+
+def write_adp(path, offset=0.0):
+    pd.DataFrame({
+        'display_name': ['Josh Allen', 'Bijan Robinson', 'Justin Tucker'],
+        'normalized_name': ['josh allen', 'bijan robinson', 'justin tucker'],
+        'sleeper_id': ['1000', '1001', None],
+        'ADP_PPR': [10.0 + offset, 2.0 + offset, None],
+    }).to_parquet(path, index=False)
+
+def test_latest_file_lookup_is_memoized(adp_dir, monkeypatch):
+    """The directory is only globbed again once a file is added to it."""
+    write_adp(adp_dir / "2025-08-01_adp.parquet")
+    calls = []
+    real_glob = glob.glob
+    monkeypatch.setattr(data_service.glob, 'glob', lambda pattern: calls.append(pattern) or real_glob(pattern))
+    assert data_service.get_latest_adp_path().endswith("2025-08-01_adp.parquet")
+    data_service.get_latest_adp_path()
+    assert len(calls) == 1
+
+    newer = adp_dir / "2025-08-02_adp.parquet"
+    write_adp(newer)
+    stat = os.stat(adp_dir)
+    os.utime(adp_dir, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert data_service.get_latest_adp_path() == str(newer)
+    assert len(calls) == 2
+
+def test_loads_come_from_memory_mapped_arrow(adp_dir):
+    """Loads match the Parquet file, reuse one mapped table, honor columns and pick up rewrites."""
+    path = adp_dir / "2025-08-01_adp.parquet"
+    write_adp(path)
+    pd.testing.assert_frame_equal(data_service.load_adp_data(), pd.read_parquet(path))
+    first = data_service.load_table(path)
+    assert data_service.load_table(path) is first
+    assert len(list(config.ARROW_CACHE_DIR.glob("*.arrow"))) == 1
+    assert list(data_service.load_adp_data(columns=['normalized_name', 'sleeper_id']).columns) == ['normalized_name', 'sleeper_id']
+
+    # Loaded frames are independent copies
+    data_service.load_adp_data()['ADP_PPR'] = 0.0
+    assert data_service.load_adp_data()['ADP_PPR'].iat[0] == 10.0
+
+    write_adp(path, offset=1.0)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert data_service.load_adp_data()['ADP_PPR'].iat[0] == 11.0
+    assert len(list(config.ARROW_CACHE_DIR.glob("*.arrow"))) == 1
+
+    # A new process maps the copy already on disk
+    data_service.clear_catalog()
+    pd.testing.assert_frame_equal(data_service.load_adp_data(), pd.read_parquet(path))
+
+@pytest.fixture
+def projections_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, 'DATA_DIR', tmp_path)
+    monkeypatch.setattr(config, 'ARROW_CACHE_DIR', tmp_path / "arrow_cache")
+    (tmp_path / "projections").mkdir()
+    data_service.clear_catalog()
+    yield tmp_path / "projections"
+    data_service.clear_catalog()
+
+def write_projections(directory, position, format, rows):
+    pd.DataFrame(rows, columns=['Player', 'FPS', 'Team']).to_csv(
+        directory / f"athletic_{position.lower()}_projections_{format.lower()}.csv", sep='\t', index=False)
+
+def test_athletic_projections_are_typed_and_cached(projections_dir, monkeypatch):
+    """CSVs are parsed once into typed tables and reparsed only after they change."""
+    write_projections(projections_dir, 'QB', 'PPR', [('Josh Allen', 380, 'BUF'), ('Jalen Hurts', '-', 'PHI')])
+    qb = data_service.load_athletic_projections('QB', 'PPR')
+    assert qb['FPS'].dtype == 'float64' and pd.isna(qb['FPS'].iat[1])
+
+    parses = []
+    real_read_csv = data_service.pacsv.read_csv
+    monkeypatch.setattr(data_service.pacsv, 'read_csv', lambda *args, **kwargs: parses.append(args) or real_read_csv(*args, **kwargs))
+    data_service.load_athletic_projections('QB', 'PPR')
+    assert parses == []
+
+    path = projections_dir / "athletic_qb_projections_ppr.csv"
+    write_projections(projections_dir, 'QB', 'PPR', [('Josh Allen', 390.5, 'BUF')])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert data_service.load_athletic_projections('QB', 'PPR')['FPS'].tolist() == [390.5]
+    assert len(parses) == 1
+
+    path.write_text("Name\tPoints\nJosh Allen\t1\n")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    with pytest.raises(ValueError):
+        data_service.load_athletic_projections('QB', 'PPR')
+
+def test_combined_projections_table(projections_dir):
+    """Every format and position comes back in one table; missing files are left out."""
+    write_projections(projections_dir, 'QB', 'PPR', [('Josh Allen', 380.5, 'BUF')])
+    write_projections(projections_dir, 'RB', 'PPR', [('Bijan Robinson', 310.2, 'ATL'), ('Saquon Barkley', 300.4, 'PHI')])
+    write_projections(projections_dir, 'RB', 'STD', [('Bijan Robinson', 280.0, 'ATL')])
+    combined = data_service.load_athletic_projections_table(['STD', 'PPR'], ['QB', 'RB'])
+    assert list(combined.columns) == ['format', 'position', 'Player', 'FPS']
+    assert list(zip(combined['format'], combined['position'], combined['Player'])) == [
+        ('STD', 'RB', 'Bijan Robinson'), ('PPR', 'QB', 'Josh Allen'),
+        ('PPR', 'RB', 'Bijan Robinson'), ('PPR', 'RB', 'Saquon Barkley')]
+    assert data_service.load_athletic_projections_table(['HalfPPR'], ['QB']).empty
+
+class CountingHandler(fs.FileSystemHandler):
+    """Local file system that counts the bytes read from every file."""
+    def __init__(self):
+        self.local, self.bytes_read = fs.LocalFileSystem(), 0
+    def get_type_name(self): return "counting"
+    def normalize_path(self, path): return path
+    def get_file_info(self, paths): return self.local.get_file_info(paths)
+    def get_file_info_selector(self, selector): return self.local.get_file_info(selector)
+    def open_input_file(self, path):
+        handler, raw = self, open(path, 'rb')
+        class Counted(io.RawIOBase):
+            def readable(self): return True
+            def seekable(self): return True
+            def seek(self, offset, whence=0): return raw.seek(offset, whence)
+            def tell(self): return raw.tell()
+            def readinto(self, buffer):
+                n = raw.readinto(buffer)
+                handler.bytes_read += n
+                return n
+            def close(self): raw.close(); super().close()
+        return pa.PythonFile(Counted(), mode='r')
+    def open_input_stream(self, path): return self.open_input_file(path)
+    # Read-only: nothing is written during a scan
+    def create_dir(self, path, recursive): raise NotImplementedError
+    def delete_dir(self, path): raise NotImplementedError
+    def delete_dir_contents(self, path, missing_dir_ok=False): raise NotImplementedError
+    def delete_root_dir_contents(self): raise NotImplementedError
+    def delete_file(self, path): raise NotImplementedError
+    def move(self, src, dest): raise NotImplementedError
+    def copy_file(self, src, dest): raise NotImplementedError
+    def open_output_stream(self, path, metadata): raise NotImplementedError
+    def open_append_stream(self, path, metadata): raise NotImplementedError
+
+def test_filtered_adp_load_reads_fewer_row_groups(adp_dir, monkeypatch):
+    """A position filter is pushed into the Parquet scan and skips row groups that cannot match."""
+    rng = np.random.default_rng(0)
+    adp = pd.DataFrame({'display_name': [f"Player {i}" for i in range(40000)], 'position': sorted(['QB', 'RB', 'WR', 'TE'] * 10000),
+                        'ADP_PPR': rng.random(40000)})
+    pq.write_table(pa.Table.from_pandas(adp, preserve_index=False), adp_dir / "2025-08-01_adp.parquet", row_group_size=5000)
+    handler = CountingHandler()
+    real_dataset = ds.dataset
+    monkeypatch.setattr(ds, 'dataset', lambda source, **kwargs: real_dataset(source, filesystem=fs.PyFileSystem(handler), **kwargs))
+
+    quarterbacks = data_service.load_adp_data(position='QB', columns=['display_name', 'position'])
+    filtered_bytes, handler.bytes_read = handler.bytes_read, 0
+    assert len(quarterbacks) == 10000 and set(quarterbacks['position']) == {'QB'}
+    everyone = data_service.load_adp_data(name='player', columns=['display_name', 'position'])
+    assert len(everyone) == 40000
+    # Each row group holds one position, so only 2 of the 8 are read
+    assert filtered_bytes < handler.bytes_read / 2
@@ -0,0 +1,149 @@
+import contextlib
+import io
+import numpy as np
+import pytest
+import api
+from backend import config
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services.draft import Draft, Team
+from backend.services.draft_journal import NO_ROW, DraftJournal, reconcile, replay, restore_snapshot, snapshot
+from backend.services.draft_service import get_user_picks
+from backend.tests.sleeper_service_test import sleeper # noqa: F401 (fixture)
+
+def run_simulated_draft(board, journal, teams=4, rounds=5):
+    """Runs a non-interactive simulated draft and returns it with its teams."""
+    np.random.seed(0)
+    draft = Draft(board, 'PPR', teams, rounds)
+    teams_list = [Team() for _ in range(teams)]
+    with contextlib.redirect_stdout(io.StringIO()):
+        api.run_draft(draft, teams_list, 1, get_user_picks(1, 'snake', teams, rounds), non_interactive=True, journal=journal)
+    return draft, teams_list
+
+def test_replay_matches_drafted_state(tmp_path):
+    """Replaying a draft's journal onto a fresh draft rebuilds the same board and rosters."""
+    board = create_synthetic_big_board(size=80, teams=4, seed=1)
+    journal = DraftJournal(tmp_path / "sim.journal", board, 4, 5)
+    draft, teams_list = run_simulated_draft(board, journal)
+    records = journal.records()
+    journal.close()
+    assert records['pick'].tolist() == list(range(1, 21))
+
+    replayed = Draft(board, 'PPR', 4, 5)
+    replayed_teams = [Team() for _ in range(4)]
+    reopened = DraftJournal(tmp_path / "sim.journal", board, 4, 5)
+    replay(replayed, replayed_teams, reopened.records())
+    reopened.close()
+    assert (replayed.state.available == draft.state.available).all()
+    assert replayed.drafted_players == draft.drafted_players
+    assert [t.roster for t in replayed_teams] == [t.roster for t in teams_list]
+
+def test_partial_record_is_dropped(tmp_path):
+    """A record cut short by a crash is truncated when the journal is reopened."""
+    board = create_synthetic_big_board(size=40, teams=2, seed=2)
+    path = tmp_path / "crash.journal"
+    journal = DraftJournal(path, board, 2, 3)
+    journal.append(1, 5, 0)
+    journal.append(2, None, 1)
+    journal.close()
+    with open(path, 'ab') as f:
+        f.write(b"\x03\x00\x07")
+
+    reopened = DraftJournal(path, board, 2, 3)
+    records = reopened.records()
+    assert records['pick'].tolist() == [1, 2]
+    assert records['row_id'].tolist() == [5, NO_ROW]
+    reopened.append(3, 7, 0)
+    assert reopened.records()['row_id'].tolist() == [5, NO_ROW, 7]
+    reopened.close()
+
+def test_journal_rejects_other_board(tmp_path):
+    """A journal is only reopened for the board and league it was written for."""
+    path = tmp_path / "draft.journal"
+    DraftJournal(path, create_synthetic_big_board(size=40, seed=3), 2, 3).close()
+    with pytest.raises(ValueError):
+        DraftJournal(path, create_synthetic_big_board(size=40, seed=4), 2, 3)
+    with pytest.raises(ValueError):
+        DraftJournal(path, create_synthetic_big_board(size=40, seed=3), 2, 4)
+
+def test_snapshot_forks_draft(tmp_path):
+    """A snapshot restores into a fresh draft that can then diverge from the original."""
+    board = create_synthetic_big_board(size=80, teams=4, seed=5)
+    journal = DraftJournal(tmp_path / "sim.journal", board, 4, 5)
+    draft, teams_list = run_simulated_draft(board, journal)
+    data = snapshot(draft, journal.records())
+    journal.close()
+    assert len(data) < 400
+
+    fork = Draft(board, 'PPR', 4, 5)
+    fork_teams = [Team() for _ in range(4)]
+    records = restore_snapshot(data, fork, fork_teams)
+    assert len(records) == 20
+    assert (fork.state.available == draft.state.available).all()
+    assert fork.drafted_players == draft.drafted_players
+    assert [t.roster for t in fork_teams] == [t.roster for t in teams_list]
+
+    fork.draft_row(fork.available_ids()[0])
+    assert fork.state.available.sum() == draft.state.available.sum() - 1
+    with pytest.raises(ValueError):
+        restore_snapshot(data, Draft(board, 'PPR', 2, 5), [Team(), Team()])
+
+def test_reconcile_reports_mismatched_picks():
+    """Journaled picks are compared with the Sleeper pick list by player ID."""
+    board = create_synthetic_big_board(size=40, teams=2, seed=6)
+    draft = Draft(board, 'PPR', 2, 3)
+    records = np.array([(1, 0, 0), (2, 1, 1), (3, NO_ROW, 1)], dtype=[('pick', '<u2'), ('row_id', '<u4'), ('team', '<u2')])
+    picks = [{'player_id': board['sleeper_id'].iat[0]}, {'player_id': board['sleeper_id'].iat[2]}, {'player_id': 'unknown'}]
+    assert reconcile(draft, records, picks) == [2]
+    assert reconcile(draft, records, [None, None, None]) == []
+
+def test_live_draft_resumes_from_journal(sleeper, monkeypatch, tmp_path):
+    """A resumed live draft replays the journal and applies only the newer Sleeper picks."""
+    board = create_synthetic_big_board(size=40, teams=2, seed=7)
+    monkeypatch.setattr(config, 'SLEEPER_API_URL', sleeper.base_url)
+    sleeper.draft['settings'] = {'rounds': 1, 'teams': 2}
+    path = tmp_path / "42.journal"
+    journal = DraftJournal(path, board, 2, 1)
+    journal.append(1, 0, 0)
+    journal.close()
+    sleeper.add_pick(board['sleeper_id'].iat[0], 1)
+    sleeper.add_pick(board['sleeper_id'].iat[3], 2)
+
+    draft = Draft(board, 'PPR', teams=2, rounds=1)
+    teams_list = [Team() for _ in range(2)]
+    journal = DraftJournal(path, board, 2, 1)
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        api.run_draft(draft, teams_list, 1, [], draft_id='42', journal=journal)
+
+    assert "Resumed 1 picks" in printed.getvalue()
+    assert "Pick 1:" not in printed.getvalue()
+    assert journal.records()['row_id'].tolist() == [0, 3]
+    journal.close()
+    assert draft.available_ids()[:2].tolist() == [1, 2]
+    assert sum(name is not None for name in teams_list[1].roster.values()) == 1
+
+def test_live_journal_resumes_user_roster(sleeper, monkeypatch, tmp_path):
+    """The user's own live pick is journaled with their team, so resuming rebuilds their roster."""
+    board = create_synthetic_big_board(size=40, teams=2, seed=8)
+    monkeypatch.setattr(config, 'SLEEPER_API_URL', sleeper.base_url)
+    sleeper.draft['settings'] = {'rounds': 1, 'teams': 2}
+    def user_picks(prompt):
+        sleeper.add_pick(board['sleeper_id'].iat[0], 1)
+        return f"draft {board['normalized_name'].iat[0]}"
+    monkeypatch.setattr('builtins.input', user_picks)
+    monkeypatch.setattr(api, 'sleep', lambda seconds: sleeper.add_pick(board['sleeper_id'].iat[1], 2))
+
+    path = tmp_path / "42.journal"
+    journal = DraftJournal(path, board, 2, 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        api.run_draft(Draft(board, 'PPR', teams=2, rounds=1), [Team() for _ in range(2)], 1, [], draft_id='42', journal=journal)
+    assert journal.records()['team'].tolist() == [0, 1]
+    journal.close()
+
+    resumed = Draft(board, 'PPR', teams=2, rounds=1)
+    resumed_teams = [Team() for _ in range(2)]
+    reopened = DraftJournal(path, board, 2, 1)
+    replay(resumed, resumed_teams, reopened.records())
+    reopened.close()
+    assert board['display_name'].iat[0] in resumed_teams[0].roster.values()
+    assert board['display_name'].iat[1] in resumed_teams[1].roster.values()
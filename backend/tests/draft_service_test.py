@@ -1,6 +1,6 @@
 
 import pytest
-from backend.services.draft_service import get_user_picks
+from backend.services.draft_service import get_user_picks, get_team_index
 
 def test_get_user_picks_snake():
     """Tests get_user_picks for a snake draft."""
@@ -12,3 +12,9 @@ def test_get_user_picks_standard():
     picks = get_user_picks(pick=3, order='normal', teams=10, rounds=3)
     assert picks == [3, 13, 23]
 
+def test_get_team_index_matches_user_picks():
+    """The team on the clock agrees with get_user_picks for every slot."""
+    for order in ['snake', 'normal']:
+        for pick in range(1, 11):
+            for pick_num in get_user_picks(pick, order, teams=10, rounds=5):
+                assert get_team_index(pick_num, 10, order) == pick - 1
@@ -0,0 +1,82 @@
+import pytest
+import numpy as np
+import pandas as pd
+from backend.services.draft import Draft, Team
+from backend.services.draft_state import POSITION_CODES
+
+def create_test_big_board():
+    """Creates a small big board with a shared normalized name."""
+    data = {
+        'display_name': ['Player A', 'Player B', 'Player C', 'Player D', 'Player B'],
+        'normalized_name': ['player a', 'player b', 'player c', 'player d', 'player b'],
+        'position': ['QB', 'RB', 'WR', 'TE', 'WR'],
+        'fantasy_points_ppr': [300.0, 250.0, 240.0, 180.0, np.nan],
+        'VORP': [120, 100, 110, 90, 0],
+        'ADP': [1, 20, 15, 30, 200],
+        'sleeper_id': ['101', '102', '103', '104', '105']
+    }
+    return pd.DataFrame(data, index=[10, 11, 12, 13, 14])
+
+def test_draft_player_updates_mask_and_view():
+    """Drafting by name removes every row sharing the normalized name."""
+    draft = Draft(create_test_big_board(), 'PPR', 2, 2)
+    assert draft.draft_player('Player B') == 'RB'
+    assert draft.drafted_players == {'player b'}
+    assert draft.available_ids().tolist() == [0, 2, 3]
+    assert draft.get_available_players().index.tolist() == [10, 12, 13]
+    assert draft.draft_player('Player B') is None
+    assert draft.draft_player('Nobody') is None
+
+def test_draft_copy_is_independent():
+    """A copied draft shares the board but not the availability mask."""
+    draft = Draft(create_test_big_board(), 'PPR', 2, 2)
+    draft_sim = draft.copy()
+    draft_sim.draft_row(0)
+    assert draft.state.available.all()
+    assert draft_sim.players is draft.players
+    assert np.isnan(draft_sim.state.best_points_at_position('QB'))
+
+def test_drafted_players_setter_rebuilds_mask():
+    """Assigning drafted_players keeps the array state in sync."""
+    draft = Draft(create_test_big_board(), 'PPR', 2, 2)
+    draft.drafted_players = {'player a', 'player d'}
+    assert draft.available_ids().tolist() == [1, 2, 4]
+    assert draft.state.best_points_at_position('RB') == 250.0
+    # The drafted set is read-only, so it cannot drift from the availability mask
+    with pytest.raises(AttributeError):
+        draft.drafted_players.add('player b')
+    assert draft.available_ids().tolist() == [1, 2, 4]
+
+def test_team_slot_placement_and_needs():
+    """Players fill their own slots, then FLEX, then the bench."""
+    team = Team()
+    for name in ['RB A', 'RB B', 'RB C', 'RB D', 'RB E']:
+        team.add_player(name, 'RB')
+    team.add_player('QB A', 'QB')
+    roster = team.roster
+    assert (roster['RB1'], roster['RB2']) == ('RB A', 'RB B')
+    assert (roster['FLEX1'], roster['FLEX2']) == ('RB C', 'RB D')
+    assert roster['BN1'] == 'RB E'
+    assert team.count_players_at_position('RB') == 5
+    assert set(team.get_starting_positional_needs()) == {'WR', 'TE', 'K', 'DEF'}
+    needs = team.starting_needs_mask()
+    assert needs[POSITION_CODES['WR']] and not needs[POSITION_CODES['RB']]
+
+def test_team_copy_is_independent():
+    """A copied team can be filled without touching the original."""
+    team = Team()
+    team.add_player('QB A', 'QB')
+    team_sim = team.copy()
+    team_sim.add_player('QB B', 'QB')
+    assert team.count_players_at_position('QB') == 1
+    assert team_sim.count_players_at_position('QB') == 2
+    assert team.roster['BN1'] is None and team_sim.roster['BN1'] == 'QB B'
+
+def test_draft_lookup_indexes():
+    """Names, normalized names and Sleeper IDs resolve through the indexes."""
+    draft = Draft(create_test_big_board(), 'PPR', 2, 2)
+    assert draft.find_rows('Player B') == [1, 4]
+    assert draft.find_rows("player c") == [2]
+    assert draft.row_for_sleeper_id('105') == 4
+    assert draft.row_for_sleeper_id('999') is None
+    assert draft.draft_player('player d') == 'TE'
@@ -0,0 +1,57 @@
+import pandas as pd
+from backend import utils
+from backend.services.identity_service import IdentityResolver
+from backend.services.vbd_service import create_vbd_big_boards
+from backend.tests.board_cache_test import data_dir, write_fake_inputs # noqa: F401 (fixture)
+
+def create_directory():
+    """A small player directory with two same-name players at different positions."""
+    return pd.DataFrame({
+        'sleeper_id': ['11', '12', '13', '14'],
+        'gsis_id': ['00-1', None, '00-3', '00-4'],
+        'normalized_name': ['jamarr chase', 'kenneth walker', 'mike williams', 'mike williams'],
+        'position': ['WR', 'RB', 'WR', 'QB'],
+    })
+
+def test_normalize_names_matches_scalar():
+    """The vectorized normalizer agrees with normalize_name, including non-strings."""
+    names = pd.Series(["Ja'Marr Chase", 'Kenneth Walker III', 'Marvin Harrison Jr.', 'D.J. Moore', None, 7], dtype=object)
+    assert utils.normalize_names(names).tolist() == [utils.normalize_name(n) for n in names]
+
+def test_register_keeps_player_uids(tmp_path):
+    """Players keep their player_uid across runs and new players get new ones."""
+    resolver = IdentityResolver()
+    uids = resolver.register(create_directory())
+    assert uids.tolist() == [1, 2, 3, 4]
+    resolver.save(tmp_path / "crosswalk.parquet")
+
+    reloaded = IdentityResolver.load(tmp_path / "crosswalk.parquet")
+    directory = pd.concat([create_directory().iloc[::-1], pd.DataFrame({'sleeper_id': ['15'], 'normalized_name': ['new guy'], 'position': ['TE']})])
+    assert reloaded.register(directory).tolist() == [4, 3, 2, 1, 5]
+    assert reloaded.lookup('gsis', pd.Series(['00-3', 'missing'])).tolist() == [3, pd.NA]
+
+def test_resolve_names(tmp_path):
+    """Names resolve by position, then fuzzily; learned aliases persist and misses are reported."""
+    resolver = IdentityResolver()
+    resolver.register(create_directory())
+    names = pd.Series(["Ja'Marr Chase", 'Mike Williams', 'Mike Williams', 'Kenneth Walkerr', 'Nobody'])
+    uids = resolver.resolve(names, pd.Series(['WR1', 'WR2', 'QB', 'RB', 'TE']), 'fantasypros')
+    assert uids.tolist() == [1, 3, 4, 2, pd.NA]
+    assert resolver.unmatched_report().to_dict('records') == [{'source': 'fantasypros', 'name': 'Nobody', 'position': 'TE', 'rows': 1}]
+    resolver.save(tmp_path / "crosswalk.parquet")
+
+    # The fuzzy match is now an exact alias for the source
+    reloaded = IdentityResolver.load(tmp_path / "crosswalk.parquet")
+    aliases = reloaded.crosswalk[reloaded.crosswalk['source'] == 'fantasypros']
+    assert 'kenneth walkerr' in set(aliases['key'])
+    assert reloaded.resolve(pd.Series(['Kenneth Walkerr']), pd.Series(['RB']), 'fantasypros').tolist() == [2]
+
+def test_big_board_joins_on_player_uid(data_dir):
+    """Projections join on player_uid, and the crosswalk is written alongside the board."""
+    write_fake_inputs(data_dir)
+    boards = create_vbd_big_boards(teams=2, use_cache=False)
+    assert boards['player_uid'].is_unique
+    assert boards.set_index('display_name').at['Josh Allen', 'fantasy_points_ppr'] == 380.5
+    assert (data_dir / "identity" / "crosswalk.parquet").exists()
+    # A second build resolves through the persisted crosswalk to the same IDs
+    pd.testing.assert_frame_equal(create_vbd_big_boards(teams=2, use_cache=False), boards)
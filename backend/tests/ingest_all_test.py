@@ -0,0 +1,159 @@
+import json
+import threading
+from types import SimpleNamespace
+import pandas as pd
+import pytest
+from backend import config
+from backend.ingest import ingest_all, ingest_players, ingest_stats
+from backend.ingest.ingest_all import Stage, run_pipeline
+from backend.ingest.stat_columns import player_columns, seasonal_columns
+
+def write_stage(path, barrier=None, log=None):
+    """A stage body that optionally waits for a concurrent stage, then writes its output."""
+    def run():
+        if barrier:
+            barrier.wait()
+        if log is not None:
+            log.append(path.name)
+        path.write_text("done")
+    return run
+
+def test_independent_stages_run_concurrently(tmp_path):
+    """Two stages without dependencies overlap; a dependent stage waits for both."""
+    barrier = threading.Barrier(2, timeout=5)
+    order = []
+    a, b, c = tmp_path / "a", tmp_path / "b", tmp_path / "c"
+    stages = [
+        Stage('c', write_stage(c, log=order), deps=['a', 'b'], inputs=lambda: [a, b], outputs=lambda: [c]),
+        Stage('a', write_stage(a, barrier, order), outputs=lambda: [a]),
+        Stage('b', write_stage(b, barrier, order), outputs=lambda: [b]),
+    ]
+    results = run_pipeline(stages, state_file=tmp_path / "state.json")
+    assert {name: r['status'] for name, r in results.items()} == {'a': 'ran', 'b': 'ran', 'c': 'ran'}
+    assert order[-1] == 'c'
+
+def test_unchanged_stages_are_skipped(tmp_path):
+    """A second run skips everything; changing an input reruns that stage and its dependents."""
+    source, middle, final = tmp_path / "source.txt", tmp_path / "middle", tmp_path / "final"
+    source.write_text("v1")
+    runs = []
+    def stage(name, output):
+        def run():
+            runs.append(name)
+            output.write_text(name)
+        return run
+    stages = [
+        Stage('middle', stage('middle', middle), inputs=lambda: [source], outputs=lambda: [middle]),
+        Stage('final', stage('final', final), deps=['middle'], outputs=lambda: [final]),
+    ]
+    state_file = tmp_path / "state.json"
+    run_pipeline(stages, state_file=state_file)
+    results = run_pipeline(stages, state_file=state_file)
+    assert runs == ['middle', 'final']
+    assert all(r['status'] == 'skipped' for r in results.values())
+
+    source.write_text("version 2")
+    run_pipeline(stages, state_file=state_file)
+    assert runs == ['middle', 'final', 'middle', 'final']
+    final.unlink()
+    run_pipeline(stages, state_file=state_file)
+    assert runs[-1] == 'final' and len(runs) == 5
+
+def test_failed_stage_blocks_dependents(tmp_path):
+    """A stage that raises is not recorded, and stages that need it do not run."""
+    def fail():
+        raise RuntimeError("network down")
+    ok = tmp_path / "ok"
+    stages = [
+        Stage('fetch', fail, outputs=lambda: [tmp_path / "never"]),
+        Stage('merge', write_stage(tmp_path / "merged"), deps=['fetch'], outputs=lambda: [tmp_path / "merged"]),
+        Stage('other', write_stage(ok), outputs=lambda: [ok]),
+    ]
+    results = run_pipeline(stages, state_file=tmp_path / "state.json")
+    assert results['fetch']['status'] == 'failed'
+    assert results['merge']['status'] == 'blocked'
+    assert results['other']['status'] == 'ran'
+    assert set(json.loads((tmp_path / "state.json").read_text())) == {'other'}
+    with pytest.raises(ValueError):
+        run_pipeline([Stage('x', fail, deps=['missing'])], state_file=tmp_path / "state.json")
+
+class FileResponse:
+    """Stands in for a streamed requests response, serving a local file in small chunks."""
+    def __init__(self, path):
+        self.content = path.read_bytes()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=100):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+@pytest.fixture
+def ingest_fixtures(tmp_path, monkeypatch):
+    """Points every ingest directory at tmp_path and replaces the network sources with local fixture files."""
+    for name, sub in [('DATA_DIR', ''), ('PLAYERS_DIR', 'sleeper_players'), ('STATS_DIR', 'nfl_stats'),
+                      ('ADP_DIR', 'fantasy_pros_adp'), ('PLAYER_ADP_DIR', 'players_adp'), ('IDENTITY_DIR', 'identity'),
+                      ('ARROW_CACHE_DIR', 'arrow_cache')]:
+        monkeypatch.setattr(config, name, tmp_path / sub)
+
+    # Sleeper's player directory, as served by the API
+    players = {
+        '4046': {'first_name': 'Patrick', 'last_name': 'Mahomes', 'position': 'QB', 'team': 'KC', 'gsis_id': '00-0033873'},
+        '4866': {'first_name': 'Saquon', 'last_name': 'Barkley', 'position': 'RB', 'team': 'PHI', 'gsis_id': '00-0034844'},
+        '7564': {'first_name': "Ja'Marr", 'last_name': 'Chase', 'position': 'WR', 'team': 'CIN', 'gsis_id': '00-0036900'},
+        '5012': {'first_name': 'Mark', 'last_name': 'Andrews', 'position': 'TE', 'team': 'BAL', 'gsis_id': '00-0034777'},
+    }
+    for player in players.values():
+        player.update({'active': True, 'college': None, 'number': 1, 'age': 27})
+    directory_file = tmp_path / "sleeper_players.json"
+    directory_file.write_text(json.dumps(players))
+    monkeypatch.setattr(ingest_players, 'requests', SimpleNamespace(get=lambda url, **kwargs: FileResponse(directory_file)))
+
+    # nflverse player and seasonal tables
+    nfl_players = pd.DataFrame({column: [None] * 4 for column in player_columns})
+    nfl_players['gsis_id'] = [p['gsis_id'] for p in players.values()]
+    nfl_players['display_name'] = [f"{p['first_name']} {p['last_name']}" for p in players.values()]
+    nfl_players['position'] = [p['position'] for p in players.values()]
+    seasonal = pd.concat([pd.DataFrame({column: [float(i + 1) for i in range(4)] for column in seasonal_columns})
+                          .assign(player_id=nfl_players['gsis_id'], season=season, season_type='REG')
+                          for season in range(2019, 2025)], ignore_index=True)
+    nfl_players.to_parquet(tmp_path / "nfl_players.parquet", index=False)
+    seasonal.to_parquet(tmp_path / "nfl_seasonal.parquet", index=False)
+    def import_seasonal_data(seasons):
+        df = pd.read_parquet(tmp_path / "nfl_seasonal.parquet")
+        return df[df['season'].isin(seasons)].reset_index(drop=True)
+    monkeypatch.setattr(ingest_stats, 'nfl', SimpleNamespace(
+        import_players=lambda: pd.read_parquet(tmp_path / "nfl_players.parquet"),
+        import_seasonal_data=import_seasonal_data))
+
+    # FantasyPros ADP exports
+    config.ADP_DIR.mkdir(parents=True)
+    for rank_offset, format in enumerate(['STD', 'HalfPPR', 'PPR']):
+        pd.DataFrame({
+            'Rank': [str(i + 1 + rank_offset) for i in range(4)],
+            'Player': ['Saquon Barkley', "Ja'Marr Chase", 'Patrick Mahomes', 'Mark Andrews'],
+            'POS': ['RB1', 'WR1', 'QB1', 'TE1'],
+            'AVG': [1.5, 2.5, 20.0, 40.0],
+        }).to_parquet(config.ADP_DIR / f"FantasyPros_2025_{format}_ADP.parquet", index=False)
+    return tmp_path
+
+def test_ingest_all_from_fixtures(ingest_fixtures, capsys):
+    """The full pipeline runs against local fixtures, then skips every stage on a rerun."""
+    results = ingest_all.main()
+    assert {name: r['status'] for name, r in results.items()} == {'players': 'ran', 'adp': 'ran', 'stats': 'ran'}
+    assert list(results).index('adp') > list(results).index('players')
+    adp = pd.read_parquet(next((ingest_fixtures / "players_adp").glob("*_adp.parquet")))
+    assert adp.set_index('display_name').at["Ja'Marr Chase", 'ADP_PPR'] == 4
+    assert adp['player_uid'].is_unique
+    assert len(list((ingest_fixtures / "nfl_stats" / "seasonal" / "season=2024").glob("position=*/*.parquet"))) == 4
+    assert "total" in capsys.readouterr().out
+
+    results = ingest_all.main()
+    assert all(r['status'] == 'skipped' for r in results.values())
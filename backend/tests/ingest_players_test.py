@@ -0,0 +1,82 @@
+import json
+import pandas as pd
+from backend.ingest import ingest_players
+from backend.services import data_service
+from backend.tests.ingest_all_test import ingest_fixtures # noqa: F401 (fixture)
+
+def test_streaming_parse_matches_json():
+    """Players decoded chunk by chunk match a full json.loads, whatever the chunk size."""
+    directory = {str(i): {'first_name': f"P{i}", 'age': 20 + i, 'team': None if i % 3 else 'KC', 'number': 1.5 * i,
+                          'metadata': {'nested': [1, {'x': '}'}]}} for i in range(40)}
+    text = json.dumps(directory, indent=1)
+    for chunk_size in [1, 7, 100, len(text)]:
+        chunks = (text[i:i + chunk_size].encode() for i in range(0, len(text), chunk_size))
+        assert dict(ingest_players._iter_players(chunks)) == directory
+
+def test_streaming_parse_splits_multibyte_characters():
+    """Accented names survive byte chunks that end inside a multibyte UTF-8 character."""
+    directory = {'1': {'first_name': 'Amon-Ra', 'college': 'Université Laval'}, '2': {'last_name': 'Muñoz Zoë'}}
+    payload = json.dumps(directory, ensure_ascii=False).encode('utf-8')
+    for chunk_size in [1, 2, 3, 5]:
+        chunks = (payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size))
+        assert dict(ingest_players._iter_players(chunks)) == directory
+
+def test_incremental_ingest_writes_deltas(ingest_fixtures, monkeypatch):
+    """Later runs store only changed rows, the loaded directory matches a full fetch, and deltas compact."""
+    days = iter(['2025-08-01', '2025-08-02', '2025-08-03', '2025-08-04'])
+    monkeypatch.setattr(ingest_players, '_today', lambda: current_day)
+    directory_file = ingest_fixtures / "sleeper_players.json"
+
+    current_day = next(days)
+    ingest_players.main()
+    assert data_service.get_player_directory_paths() == [str(ingest_fixtures / "sleeper_players" / "all_players_2025-08-01.parquet")]
+    ingest_players.main() # Already ingested today
+    assert len(data_service.get_player_directory_paths()) == 1
+
+    # One player changes team, one retires and one is new
+    players = json.loads(directory_file.read_text())
+    players['4866']['team'] = 'NYG'
+    players['5012']['team'] = None
+    players['9999'] = dict(players['7564'], first_name='Rookie', gsis_id='00-0099999')
+    directory_file.write_text(json.dumps(players))
+
+    current_day = next(days)
+    ingest_players.main(compact_after=3)
+    delta = pd.read_parquet(ingest_fixtures / "sleeper_players" / "deltas" / "players_delta_2025-08-02.parquet")
+    assert sorted(zip(delta['sleeper_id'], delta['deleted'])) == [('4866', False), ('5012', True), ('9999', False)]
+
+    loaded = data_service.load_player_directory().set_index('sleeper_id').sort_index()
+    assert loaded.index.tolist() == ['4046', '4866', '7564', '9999']
+    assert loaded.at['4866', 'team'] == 'NYG'
+    assert loaded['player_uid'].is_unique
+
+    # The third file triggers compaction into a single snapshot
+    current_day = next(days)
+    ingest_players.main(compact_after=3)
+    current_day = next(days)
+    ingest_players.main(compact_after=3)
+    assert data_service.get_player_directory_paths() == [str(ingest_fixtures / "sleeper_players" / "all_players_2025-08-04.parquet")]
+    compacted = data_service.load_player_directory().set_index('sleeper_id').sort_index()
+    pd.testing.assert_frame_equal(compacted[loaded.columns], loaded, check_dtype=False)
+
+def test_ingest_after_schema_change(ingest_fixtures, monkeypatch):
+    """A snapshot written before player_uid existed is diffed on shared columns and replaced by a full snapshot."""
+    days = iter(['2025-08-01', '2025-08-02'])
+    monkeypatch.setattr(ingest_players, '_today', lambda: current_day)
+    current_day = next(days)
+    ingest_players.main()
+    snapshot = ingest_fixtures / "sleeper_players" / "all_players_2025-08-01.parquet"
+    current = pd.read_parquet(snapshot)
+    old = current.drop(columns='player_uid').iloc[1:]
+    old.to_parquet(snapshot, index=False)
+
+    delta = ingest_players._diff(old, current)
+    assert sorted(delta['sleeper_id']) == sorted(current['sleeper_id'])
+    assert not delta['deleted'].any()
+    removed = ingest_players._diff(current.drop(columns='player_uid'), current.iloc[1:])
+    assert removed.loc[removed['deleted'], 'sleeper_id'].tolist() == [current['sleeper_id'].iat[0]]
+
+    current_day = next(days)
+    ingest_players.main()
+    assert data_service.get_player_directory_paths() == [str(ingest_fixtures / "sleeper_players" / "all_players_2025-08-02.parquet")]
+    assert data_service.load_player_directory()['player_uid'].notna().all()
@@ -0,0 +1,38 @@
+import pyarrow.dataset as ds
+from backend.ingest import ingest_stats
+from backend.services import data_service
+from backend.tests.ingest_all_test import ingest_fixtures # noqa: F401 (fixture)
+
+def test_backfill_writes_one_partition_per_season_and_position(ingest_fixtures):
+    """Backfilling several seasons writes a season=/position= directory for each."""
+    ingest_stats.main([2022, 2023, 2024])
+    root = data_service.stats_dataset_dir()
+    assert sorted(p.name for p in root.iterdir()) == ['season=2022', 'season=2023', 'season=2024']
+    assert sorted(p.name for p in (root / "season=2023").iterdir()) == [
+        'position=QB', 'position=RB', 'position=TE', 'position=WR']
+
+def test_scan_stats_prunes_partitions_and_columns(ingest_fixtures):
+    """A season range and position only touch the matching files and return the requested columns."""
+    ingest_stats.main(list(range(2019, 2025)))
+    df = data_service.scan_stats(seasons=range(2022, 2025), positions=['RB'],
+                                 columns=['display_name', 'season', 'rushing_yards'])
+    assert list(df.columns) == ['display_name', 'season', 'rushing_yards']
+    assert sorted(df['season'].unique()) == [2022, 2023, 2024]
+    assert set(df['display_name']) == {'Saquon Barkley'}
+
+    dataset = ds.dataset(data_service.stats_dataset_dir(), format='parquet', partitioning='hive')
+    fragments = list(dataset.get_fragments(filter=ds.field('season').isin([2022, 2023, 2024]) & (ds.field('position') == 'RB')))
+    assert len(fragments) == 3
+
+    # Row-level predicates are applied on top of the partition filters
+    assert data_service.scan_stats(positions=['RB'], filter=ds.field('rushing_yards') > 100).empty
+
+def test_reingesting_a_season_replaces_its_partition(ingest_fixtures):
+    """Rerunning a season overwrites that season's files and leaves the others alone."""
+    ingest_stats.main([2023, 2024])
+    other = sorted((data_service.stats_dataset_dir() / "season=2023").rglob("*.parquet"))
+    ingest_stats.main([2024])
+    df = data_service.scan_stats(seasons=[2024])
+    assert len(df) == 4 and df['player_id'].is_unique
+    assert sorted((data_service.stats_dataset_dir() / "season=2023").rglob("*.parquet")) == other
+    assert data_service.scan_stats(seasons=[2023], positions=['QB'])['display_name'].tolist() == ['Patrick Mahomes']
@@ -0,0 +1,91 @@
+
+import contextlib
+import io
+import time
+import api
+from backend import config
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services.draft import Draft, Team
+from backend.services.vona_service import SpeculativeVona, evaluate_vona
+from backend.tests.sleeper_service_test import sleeper # noqa: F401 (fixture)
+from backend.tests.vona_service_test import create_draft_and_teams
+
+def test_speculative_vona_matches_evaluate_vona():
+    """A completed background estimate equals evaluate_vona for the latest state."""
+    draft, teams_list = create_draft_and_teams()
+    speculator = SpeculativeVona(n_futures=200, seed=5)
+    try:
+        speculator.update(draft, teams_list, 10, 3, picks_made=6)
+        draft.draft_row(draft.available_ids()[0]) # The caller keeps drafting
+        speculator.update(draft, teams_list, 9, 4, picks_made=7)
+        result = speculator.wait(timeout=30)
+        _, futures, complete, picks_made = speculator.latest()
+    finally:
+        speculator.stop()
+    assert futures == 200 and complete and picks_made == 7
+    expected = evaluate_vona(draft, teams_list, 9, 4, n_futures=200, seed=5)
+    assert result.index.equals(expected.index)
+    assert (result.values == expected.values).all()
+
+def test_speculative_vona_tags_estimates_with_picks_made():
+    """Every published estimate names the pick count it was computed for."""
+    draft, teams_list = create_draft_and_teams()
+    speculator = SpeculativeVona(n_futures=400, seed=2)
+    try:
+        speculator.update(draft, teams_list, 10, 3, picks_made=6)
+        speculator.wait(timeout=30)
+        assert speculator.latest()[3] == 6
+        draft.draft_row(draft.available_ids()[0])
+        speculator.update(draft, teams_list, 9, 4, picks_made=7)
+        assert speculator.latest()[3] in (6, 7)
+        speculator.wait(timeout=30, complete=False)
+        vona, futures, _, picks_made = speculator.latest()
+    finally:
+        speculator.stop()
+    assert picks_made == 7 and futures >= config.VONA_BATCH_SIZE
+    assert vona.index.equals(draft.players.index[draft.available_ids()])
+
+def test_live_vona_window():
+    """On the clock the window is exact; earlier it runs through the user's following turn."""
+    picks_order = [1, 2, 3, 4, 4, 3, 2, 1, 1, 2, 3, 4]
+    slot_to_roster_id = {str(slot): slot for slot in range(1, 5)}
+    # User is slot 2: overall picks 2, 7 and 10
+    assert api.live_vona_window(0, picks_order, slot_to_roster_id, 2) == (6, 0)
+    assert api.live_vona_window(1, picks_order, slot_to_roster_id, 2) == (4, 2)
+    assert api.live_vona_window(6, picks_order, slot_to_roster_id, 2) == (2, 7)
+    assert api.live_vona_window(7, picks_order, slot_to_roster_id, 2) is None
+
+def test_live_draft_shows_vona_immediately(sleeper, monkeypatch):
+    """In live mode the user's turn shows the background VONA estimate without recomputing it."""
+    board = create_synthetic_big_board(size=60, teams=2, seed=4)
+    sleeper_ids = dict(zip(board['normalized_name'], board['sleeper_id']))
+    monkeypatch.setattr(config, 'SLEEPER_API_URL', sleeper.base_url)
+    sleeper.draft['settings'] = {'rounds': 3, 'teams': 2}
+    draft = Draft(board, 'PPR', teams=2, rounds=3)
+    teams_list = [Team() for _ in range(2)]
+
+    # The other team drafts down the board whenever the loop waits, giving
+    # the background worker a moment to refine
+    def other_team_picks(seconds):
+        time.sleep(0.2)
+        taken = {p['player_id'] for p in sleeper.picks}
+        player_id = next(i for i in board.sort_values('ADP')['sleeper_id'] if i not in taken)
+        sleeper.add_pick(player_id, 2)
+    # The user drafts the best remaining player by VORP and it shows up on Sleeper
+    def user_picks(prompt):
+        name = draft.get_available_players().sort_values('VORP', ascending=False)['normalized_name'].iat[0]
+        sleeper.add_pick(sleeper_ids[name], 1)
+        return f"draft {name}"
+    monkeypatch.setattr(api, 'sleep', other_team_picks)
+    monkeypatch.setattr('builtins.input', user_picks)
+
+    printed = io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        api.run_draft(draft, teams_list, 1, [], draft_id='42')
+
+    output = printed.getvalue()
+    assert len(sleeper.picks) == 6
+    assert output.count("You drafted") == 3
+    assert "VONA from" in output
+    assert len(draft.drafted_players) == 6
+    assert sum(name is not None for name in teams_list[0].roster.values()) == 3
@@ -0,0 +1,59 @@
+import io
+import json
+import pandas as pd
+from backend.ingest import ingest_all
+from backend.print_parquet import print_parquet_file
+from backend.services import data_service
+from backend.tests.ingest_all_test import ingest_fixtures # noqa: F401 (fixture)
+
+def test_loaders_push_down_filters_and_columns(ingest_fixtures):
+    """Every folder's loader returns only the matching rows and requested columns."""
+    ingest_all.main(seasons=[2023, 2024])
+
+    players = data_service.load_all_players(name="chase", columns=['display_name', 'team'])
+    assert players.to_dict('records') == [{'display_name': "Ja'Marr Chase", 'team': 'CIN'}]
+    assert data_service.load_all_players(position='TE')['display_name'].tolist() == ['Mark Andrews']
+
+    stats = data_service.load_stats_data('rb', [2023, 2024], columns=['display_name', 'season', 'rushing_yards'])
+    assert list(stats.columns) == ['display_name', 'season', 'rushing_yards']
+    assert sorted(stats['season']) == [2023, 2024]
+    assert data_service.load_stats_data('QB', 2024, name='barkley').empty
+
+    raw = data_service.load_raw_adp_data('halfppr', position='WR', columns=['Player', 'POS'])
+    assert raw.to_dict('records') == [{'Player': "Ja'Marr Chase", 'POS': 'WR1'}]
+    assert len(data_service.load_adp_data(limit=2)) == 2
+    assert data_service.load_adp_data(name='mahomes', columns=['sleeper_id'])['sleeper_id'].tolist() == ['4046']
+
+def test_player_queries_apply_deltas(ingest_fixtures, monkeypatch):
+    """Once deltas exist, queries see renamed players under their new name only."""
+    ingest_all.main()
+    players = json.loads((ingest_fixtures / "sleeper_players.json").read_text())
+    players['4866']['last_name'] = 'Barkley-Smith'
+    players['5012']['team'] = None
+    (ingest_fixtures / "sleeper_players.json").write_text(json.dumps(players))
+    monkeypatch.setattr(ingest_all.ingest_players, '_today', lambda: '2099-01-01')
+    ingest_all.ingest_players.main()
+    assert len(data_service.get_player_directory_paths()) == 2
+    assert data_service.load_all_players(name='barkley')['display_name'].tolist() == ['Saquon Barkley-Smith']
+    assert data_service.load_all_players(position='TE').empty
+
+    # Scanning each file with the filter matches filtering the merged directory
+    directory = data_service.load_player_directory()
+    pd.testing.assert_frame_equal(data_service.load_all_players(), directory, check_dtype=False)
+    rbs = directory[directory['position'] == 'RB'].reset_index(drop=True)[['display_name', 'team']]
+    pd.testing.assert_frame_equal(data_service.load_all_players(position='RB', columns=['display_name', 'team']), rbs, check_dtype=False)
+    assert len(data_service.load_all_players(limit=2)) == 2
+
+def test_print_outputs_csv_and_json(ingest_fixtures, capsys):
+    """The CLI writes the queried rows as CSV or JSON records."""
+    ingest_all.main()
+    capsys.readouterr()
+    print_parquet_file("players_adp", pos="RB", columns=['display_name', 'ADP_PPR'], output="csv")
+    csv = pd.read_csv(io.StringIO(capsys.readouterr().out))
+    assert csv.to_dict('records') == [{'display_name': 'Saquon Barkley', 'ADP_PPR': 3}]
+
+    print_parquet_file("stats", pos="WR", columns=['display_name', 'season'], output="json")
+    assert json.loads(capsys.readouterr().out) == [{'display_name': "Ja'Marr Chase", 'season': 2024}]
+
+    print_parquet_file("players", player_name="nobody")
+    assert "No data found" in capsys.readouterr().err
@@ -0,0 +1,57 @@
+
+import contextlib
+import io
+import json
+from backend import config
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services import profiler
+from backend.services.draft import Draft, Team
+from backend.services.draft_service import get_user_picks
+
+def test_profiler_disabled_by_default():
+    """With profiling off, stages are shared no-op contexts and nothing is written."""
+    null = profiler.get_profiler()
+    assert not null.enabled
+    assert null.stage('a') is null.stage('b')
+    assert null.dump() is None
+
+def test_profiled_run_draft(tmp_path, monkeypatch):
+    """A profiled draft writes stage timings, pick histograms and a Chrome trace."""
+    from api import run_draft
+    monkeypatch.setattr(config, 'PROFILE_DIR', tmp_path)
+    board = create_synthetic_big_board(size=120, teams=4, seed=1)
+    draft = Draft(board, 'PPR', teams=4, rounds=3)
+    teams_list = [Team() for _ in range(4)]
+    profiler.enable_profiling()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            run_draft(draft, teams_list, 2, get_user_picks(2, 'snake', 4, 3), non_interactive=True)
+    finally:
+        profiler.disable_profiling()
+
+    (profile_dir,) = list(tmp_path.iterdir())
+    report = json.loads((profile_dir / "report.json").read_text())
+    assert report['stages']['evaluate_vona']['count'] == 2
+    assert report['stages']['cpu_pick']['count'] == 9
+    assert report['picks']['user']['count'] == 3
+    assert sum(report['picks']['cpu']['histogram_ms'].values()) == 9
+    trace = json.loads((profile_dir / "trace.json").read_text())
+    names = {event['name'] for event in trace['traceEvents']}
+    assert {'evaluate_vona', 'cpu_pick', 'draft_player', 'board_copy', 'pick 1'} <= names
+
+def test_nested_stage_peak():
+    """Memory peaks inside a nested stage still count toward the enclosing stage."""
+    active = profiler.enable_profiling()
+    try:
+        with active.stage('outer'):
+            with active.stage('inner'):
+                block = bytearray(4_000_000)
+                del block
+            with active.stage('after'):
+                pass
+        report = active.report()
+    finally:
+        profiler.disable_profiling()
+    assert report['stages']['inner']['peak_bytes'] >= 4_000_000
+    assert report['stages']['outer']['peak_bytes'] >= report['stages']['inner']['peak_bytes']
+    assert report['stages']['after']['peak_bytes'] < 4_000_000
@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from fastapi.testclient import TestClient
+from backend.benchmarks.load_test import run_load_test
+from backend.server import create_app
+from backend.services.session_service import SessionStore
+from backend.tests.session_service_test import make_store
+
+@pytest.fixture
+def client():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with TestClient(create_app(make_store(), executor, warm=False)) as client:
+            yield client
+
+def test_session_endpoints(client):
+    """Create a session, query and filter the board, pick, and request VONA over HTTP."""
+    created = client.post("/sessions", json={'format': 'ppr', 'teams': 4, 'rounds': 4})
+    assert created.status_code == 201 and created.json()['format'] == 'PPR'
+    session = f"/sessions/{created.json()['session_id']}"
+
+    players = client.get(f"{session}/board", params={'position': 'FLEX', 'limit': 5}).json()['players']
+    assert len(players) == 5 and all(player['position'] != 'QB' for player in players)
+    assert client.get(f"{session}/board", params={'sort': 'display_name'}).status_code == 400
+
+    pick = client.post(f"{session}/picks", json={'player': players[0]['display_name']})
+    assert pick.status_code == 201 and pick.json()['session']['pick_count'] == 1
+    assert client.post(f"{session}/picks", json={'player': players[0]['display_name']}).status_code == 409
+    assert client.post(f"{session}/picks", json={}).status_code == 400
+
+    vona = client.post(f"{session}/vona", params={'futures': 20, 'seed': 1}).json()
+    assert vona['current'] and vona['players'][0]['VONA'] >= vona['players'][-1]['VONA']
+    board = client.get(f"{session}/board", params={'sort': 'VONA', 'limit': 3}).json()['players']
+    assert [player['row_id'] for player in board] == [player['row_id'] for player in vona['players'][:3]]
+
+    assert client.delete(session).status_code == 204
+    assert client.get(session).status_code == 404
+
+def test_load_test_against_app(client):
+    """The load test drives sessions end to end and reports board latency percentiles."""
+    report = run_load_test(lambda: client, base_url="", sessions=1, queries=20, pick_every=4, vona_every=10, teams=4)
+    assert report['errors'] == 0
+    assert report['board']['count'] == 20 and report['vona']['count'] == 2
+    assert report['board']['p50_ms'] <= report['board']['p99_ms']
+
+def test_load_test_counts_failed_picks_and_vona(client):
+    """Picks and VONA requests that fail count as errors, not only failed board queries."""
+    # Two teams of 15 rounds: the last 10 picks fail once the draft is complete, as does the final VONA request
+    report = run_load_test(lambda: client, base_url="", sessions=1, queries=40, pick_every=1, vona_every=40, teams=2)
+    assert report['board']['count'] == 40
+    assert report['errors'] == 11
+
+def test_board_queries_served_while_a_session_is_built():
+    """Building a board for a new league setup does not hold up other sessions' requests."""
+    building, release, built = threading.Event(), threading.Event(), threading.Event()
+    factory = make_store().board_factory
+    def slow_factory(format, teams):
+        if teams == 6:
+            building.set()
+            release.wait(timeout=10)
+            built.set()
+        return factory(format, teams)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        with TestClient(create_app(SessionStore(slow_factory), executor, warm=False)) as client:
+            session = f"/sessions/{client.post('/sessions', json={'teams': 4}).json()['session_id']}"
+            with ThreadPoolExecutor(max_workers=1) as background:
+                pending = background.submit(client.post, "/sessions", json={'teams': 6})
+                assert building.wait(timeout=10)
+                board = client.get(f"{session}/board", params={'limit': 3})
+                served_while_building = not built.is_set()
+                release.set()
+                assert pending.result().status_code == 201
+    assert board.status_code == 200 and len(board.json()['players']) == 3
+    assert served_while_building
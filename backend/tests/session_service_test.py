@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+from backend import config
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services import session_service
+from backend.services.session_service import SessionStore, init_worker, run_vona
+
+def make_store() -> SessionStore:
+    return SessionStore(lambda format, teams: create_synthetic_big_board(size=300, format=format, teams=teams, seed=4))
+
+def test_sessions_share_boards_and_track_the_clock():
+    """Sessions on one setup share a board but not their picks; the clock follows the snake."""
+    store = make_store()
+    first, second = store.create('ppr', teams=4, rounds=3, user_slot=2), store.create('PPR', teams=4, rounds=3)
+    assert first.draft.format == 'PPR' and first.draft.players is second.draft.players
+    assert len(store.boards) == 1
+    with pytest.raises(ValueError):
+        store.create('Standardish')
+    with pytest.raises(ValueError):
+        store.create(teams=4, user_slot=5)
+
+    board = first.board(limit=5)
+    assert board['ADP'].is_monotonic_increasing
+    teams_on_clock = []
+    first.pick(board['display_name'].iat[0])
+    for _ in range(7):
+        teams_on_clock.append(first.on_the_clock())
+        first.pick(sleeper_id=first.board(limit=1)['sleeper_id'].iat[0])
+    assert teams_on_clock == [1, 2, 3, 3, 2, 1, 0]
+    assert first.pick_count == 8 and second.pick_count == 0
+    assert first.summary()['on_the_clock'] == 1
+    assert second.board(limit=1)['display_name'].iat[0] == board['display_name'].iat[0]
+
+    with pytest.raises(LookupError):
+        first.pick(board['display_name'].iat[0])
+    with pytest.raises(ValueError):
+        first.pick()
+    for _ in range(4):
+        first.pick(sleeper_id=first.board(limit=1)['sleeper_id'].iat[0])
+    assert first.complete and first.on_the_clock() is None
+    with pytest.raises(ValueError):
+        first.pick(second.board(limit=1)['display_name'].iat[0])
+
+    store.delete(second.id)
+    with pytest.raises(KeyError):
+        store.get(second.id)
+
+def test_board_filters_and_sorts():
+    """Position and FLEX filters, sorts by any value column, and paging."""
+    session = make_store().create(teams=4, rounds=5)
+    flex = session.board('flex', limit=500)
+    assert set(flex['position']) == set(config.FLEX_POSITIONS)
+    assert set(session.board('QB', limit=500)['position']) == {'QB'}
+    by_points = session.board(sort='points', limit=50)
+    assert by_points['points'].is_monotonic_decreasing
+    assert session.board(sort='VORP', ascending=True, limit=50)['VORP'].is_monotonic_increasing
+    assert list(session.board(limit=10, offset=5)['row_id']) == list(session.board(limit=15)['row_id'])[5:]
+    # VONA falls back to VORP until an estimate exists
+    assert list(session.board(sort='VONA', limit=10)['row_id']) == list(session.board(sort='VORP', limit=10)['row_id'])
+    with pytest.raises(ValueError):
+        session.board(sort='display_name')
+
+def test_run_vona_keeps_the_loop_free_and_caches_current_estimates(monkeypatch):
+    """VONA runs on the executor while the loop serves boards; only an estimate still current is kept."""
+    session = make_store().create(teams=4, rounds=4, user_slot=1)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        vona = asyncio.run(run_vona(session, executor, n_futures=20, seed=1))
+        assert list(vona.columns) == ['VONA', 'SURVIVAL'] and session.vona_picks == 0
+        board = session.board(sort='VONA', limit=500)
+        assert 'VONA' in board.columns and board['VONA'].dropna().is_monotonic_decreasing
+
+        # A board query and a pick are answered while a slow estimate is in flight
+        release = threading.Event()
+        compute_vona = session_service.compute_vona
+        def slow_vona(*args):
+            assert release.wait(timeout=10)
+            return compute_vona(*args)
+        monkeypatch.setattr(session_service, 'compute_vona', slow_vona)
+
+        async def board_while_vona_runs():
+            pending = asyncio.ensure_future(run_vona(session, executor, n_futures=20, seed=2))
+            await asyncio.sleep(0)
+            top = session.board(limit=1)['display_name'].iat[0]
+            session.pick(top)
+            release.set()
+            return await pending
+
+        assert asyncio.run(board_while_vona_runs()) is not None
+    # The estimate was computed before the pick, so it is not shown on the board
+    assert session.vona_picks == 0 and session.pick_count == 1
+    assert 'VONA' not in session.board(limit=5).columns
+
+def test_vona_workers_get_the_board_once():
+    """Workers given the boards at startup receive only the session's state with each request."""
+    store = make_store()
+    session = store.create(teams=4, rounds=4, user_slot=2)
+    session.pick(session.board(limit=1)['display_name'].iat[0])
+    request = session.vona_request(20, 1)
+    board_bytes = len(pickle.dumps(session.draft.players))
+    assert len(pickle.dumps(request)) * 10 < board_bytes
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        expected = asyncio.run(run_vona(session, executor, n_futures=20, seed=1))
+    with ProcessPoolExecutor(max_workers=1, initializer=init_worker, initargs=(dict(store.boards),)) as executor:
+        vona = asyncio.run(run_vona(session, executor, n_futures=20, seed=1, shared_boards=frozenset(store.boards)))
+    assert vona.equals(expected)
+    assert session.vona_picks == 1
@@ -1,8 +1,14 @@
 
+import time
 import pytest
+import numpy as np
 import pandas as pd
-from backend.services.simulation_service import simulate_cpu_pick, calculate_draft_score
+from backend.benchmarks.synthetic import create_synthetic_big_board
+from backend.services.simulation_service import (
+    simulate_cpu_pick, calculate_draft_score, average_rank, cpu_draft_scores, cpu_pick_kernel, user_auto_pick_kernel
+)
 from backend.services.draft import Team
+from backend.services.draft_state import encode_positions, position_mask
 
 def create_test_player_df():
     """Creates a sample DataFrame of players for testing."""
@@ -26,6 +32,7 @@ def test_simulate_cpu_pick():
     """Tests the simulate_cpu_pick function."""
     available_players = create_test_player_df()
     team = Team()
+    np.random.seed(0) # CPU picks are a weighted draw; keep the test reproducible
     
     # With an empty team, the CPU should pick the best player available (BPA).
     # Based on draft_score, Player A should be the top choice.
@@ -38,3 +45,106 @@ def test_simulate_cpu_pick():
     # Now the team needs an RB or WR. Player B (RB) and C (WR) are top options.
     picks_with_need = [simulate_cpu_pick(available_players, team) for _ in range(20)]
     assert 'Player B' in picks_with_need or 'Player C' in picks_with_need
+
+def test_average_rank_matches_pandas():
+    """average_rank reproduces pandas average ranking with NaN at the bottom."""
+    values = np.array([3.0, np.nan, 5.0, 5.0, np.nan, 1.0, 3.0])
+    expected = pd.Series(values).rank(ascending=False, na_option='bottom').to_numpy()
+    np.testing.assert_array_equal(average_rank(values, ascending=False), expected)
+    expected = pd.Series(values).rank(ascending=True, na_option='bottom').to_numpy()
+    np.testing.assert_array_equal(average_rank(values), expected)
+
+def test_cpu_pick_kernel_matches_draft_score():
+    """With no needs the kernel draws from the best draft scores."""
+    players = create_test_player_df()
+    position = encode_positions(players['position'])
+    no_needs = position_mask([])
+    rng = np.random.default_rng(0)
+    picks = {cpu_pick_kernel(position, players['VORP'].to_numpy(float), players['ADP'].to_numpy(float), no_needs, 0, rng) for _ in range(50)}
+    assert 0 in picks
+    assert picks <= set(range(len(players)))
+
+def dataframe_draft_scores(players: pd.DataFrame, team: Team) -> np.ndarray:
+    """The CPU draft_score as computed with DataFrame operations before the array kernel."""
+    players = players.copy()
+    players['vorp_rank'] = players['VORP'].rank(ascending=False, na_option='bottom')
+    players['adp_rank'] = players['ADP'].fillna(999).rank(ascending=True, na_option='bottom')
+    players['draft_score'] = (0.10 * players['vorp_rank']) + (0.90 * players['adp_rank'])
+
+    if team.count_players_at_position('QB') >= 2:
+        players.loc[players['position'] == 'QB', 'draft_score'] *= 5.0
+    starting_needs = team.get_starting_positional_needs()
+    if starting_needs:
+        players.loc[players['position'].isin(starting_needs), 'draft_score'] *= 0.70
+
+    scarcity = {}
+    for pos in ['QB', 'RB', 'WR', 'TE']:
+        pos_players = players[players['position'] == pos].sort_values(by='VORP', ascending=False)
+        scarcity[pos] = pos_players.iloc[0]['VORP'] - pos_players.iloc[1]['VORP'] if len(pos_players) > 1 else 0
+    scarcest_position = max(scarcity, key=scarcity.get)
+    top_player = players[players['position'] == scarcest_position].sort_values(by='VORP', ascending=False).head(1)
+    if not top_player.empty:
+        players.loc[top_player.index[0], 'draft_score'] -= 10
+    return players['draft_score'].to_numpy()
+
+def scoring_board() -> pd.DataFrame:
+    """A synthetic board with tied VORP below the top of each position and some players without ADP."""
+    board = create_synthetic_big_board(size=300, teams=10, seed=3)
+    rng = np.random.default_rng(3)
+    below_top = board.groupby('position').cumcount() >= 3
+    board.loc[below_top, 'VORP'] = board.loc[below_top, 'VORP'].round(-1)
+    board.loc[rng.random(len(board)) < 0.15, 'ADP'] = np.nan
+    board.loc[board.index[-5:], 'VORP'] = np.nan
+    return board.reset_index(drop=True)
+
+def test_cpu_draft_scores_match_dataframe_scoring():
+    """The array kernel reproduces the DataFrame draft_score, including ties, missing ADP and team adjustments."""
+    board = scoring_board()
+    assert board['VORP'].duplicated().any() and board['ADP'].isna().any()
+    position = encode_positions(board['position'])
+    vorp, adp = board['VORP'].to_numpy(float), board['ADP'].to_numpy(float)
+
+    empty = Team()
+    two_qbs = Team()
+    for name, pos in [('QB One', 'QB'), ('QB Two', 'QB'), ('RB One', 'RB'), ('RB Two', 'RB'), ('WR One', 'WR')]:
+        two_qbs.add_player(name, pos)
+    for team in [empty, two_qbs]:
+        expected = dataframe_draft_scores(board, team)
+        scores = cpu_draft_scores(position, vorp, adp, team.starting_needs_mask(), team.count_players_at_position('QB'))
+        np.testing.assert_allclose(scores, expected)
+
+    # Part-way through a draft, on what is left of the board
+    available = board.iloc[40:].reset_index(drop=True)
+    expected = dataframe_draft_scores(available, two_qbs)
+    scores = cpu_draft_scores(encode_positions(available['position']), available['VORP'].to_numpy(float),
+                              available['ADP'].to_numpy(float), two_qbs.starting_needs_mask(), 2)
+    np.testing.assert_allclose(scores, expected)
+
+def test_cpu_draft_scores_faster_than_dataframe_scoring():
+    """The array kernel is several times faster than the DataFrame scoring on a full board."""
+    board = scoring_board()
+    team = Team()
+    position = encode_positions(board['position'])
+    vorp, adp = board['VORP'].to_numpy(float), board['ADP'].to_numpy(float)
+
+    def fastest(run, repeat=20):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    dataframe_s = fastest(lambda: dataframe_draft_scores(board, team))
+    kernel_s = fastest(lambda: cpu_draft_scores(position, vorp, adp, team.starting_needs_mask(), 0))
+    assert kernel_s * 5 < dataframe_s
+
+def test_user_auto_pick_kernel_prefers_vona():
+    """The auto-pick kernel favours the highest VONA when other ranks are close."""
+    players = create_test_player_df()
+    vona = np.array([0.0, 40.0, 0.0, 0.0, 0.0])
+    pick = user_auto_pick_kernel(
+        encode_positions(players['position']), vona, players['VORP'].to_numpy(float),
+        players['ADP'].to_numpy(float), position_mask(['RB']), 0
+    )
+    assert players['display_name'].iat[pick] == 'Player B'
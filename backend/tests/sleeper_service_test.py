@@ -0,0 +1,109 @@
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+import requests
+from backend import config
+from backend.services import sleeper_service
+from backend.services.sleeper_service import SleeperClient
+
+class FakeSleeper:
+    """A local stand-in for the Sleeper draft endpoints that honours If-None-Match."""
+    def __init__(self):
+        self.draft = {'type': 'snake', 'settings': {'rounds': 2, 'teams': 2},
+                      'metadata': {'scoring_type': 'ppr'}, 'slot_to_roster_id': {'1': 1, '2': 2}}
+        self.picks = []
+        self.requests = []
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/v1/draft/42':
+                    body = fake.draft
+                elif self.path == '/v1/draft/42/picks':
+                    body = fake.picks
+                else:
+                    self.send_error(404)
+                    return
+                payload = json.dumps(body).encode()
+                etag = f'"{hash(payload)}"'
+                fake.requests.append((self.path, self.headers.get('If-None-Match')))
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('ETag', etag)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def add_pick(self, player_id: str, roster_id: int):
+        self.picks = self.picks + [{'pick_no': len(self.picks) + 1, 'player_id': player_id, 'roster_id': roster_id}]
+
+@pytest.fixture
+def sleeper():
+    fake = FakeSleeper()
+    yield fake
+    fake.server.shutdown()
+    fake.server.server_close()
+
+def test_get_draft_settings(sleeper):
+    """Draft settings are parsed from the draft object."""
+    settings = SleeperClient('42', base_url=sleeper.base_url).get_draft_settings()
+    assert settings == {'rounds': 2, 'teams': 2, 'order': 'snake', 'format': 'PPR', 'slot_to_roster_id': {'1': 1, '2': 2}}
+
+def test_get_new_picks_returns_only_new_picks(sleeper):
+    """Each poll returns only unseen picks, and unchanged lists are revalidated with a 304."""
+    client = SleeperClient('42', base_url=sleeper.base_url)
+    assert client.get_new_picks() == []
+    sleeper.add_pick('100', 1)
+    sleeper.add_pick('200', 2)
+    assert [p['player_id'] for p in client.get_new_picks()] == ['100', '200']
+    assert client.get_new_picks() == []
+    sleeper.add_pick('300', 2)
+    assert [p['player_id'] for p in client.get_new_picks()] == ['300']
+    assert len(client.picks) == 3
+
+    conditional = [etag for path, etag in sleeper.requests if path.endswith('/picks')]
+    assert conditional[0] is None and all(conditional[1:])
+    # Every request after the first went over the same pooled connection
+    assert len(client.session.adapters['http://'].poolmanager.pools) == 1
+
+def test_unchanged_picks_are_not_decoded(sleeper, monkeypatch):
+    """A 304 poll returns before any body is decoded, and the pick list is not cached twice."""
+    client = SleeperClient('42', base_url=sleeper.base_url)
+    sleeper.add_pick('100', 1)
+    decoded = []
+    json_body = requests.Response.json
+    monkeypatch.setattr(requests.Response, 'json', lambda self, **kwargs: decoded.append(self.url) or json_body(self, **kwargs))
+    assert len(client.get_new_picks()) == 1
+    for _ in range(3):
+        assert client.get_new_picks() == []
+    assert len(decoded) == 1
+    assert client._bodies == {}
+
+def test_get_new_picks_survives_errors(sleeper):
+    """A failed request returns no picks and leaves the client where it was."""
+    client = SleeperClient('missing', base_url=sleeper.base_url)
+    assert client.get_new_picks() == []
+    assert client.get_draft_settings() is None
+
+def test_poll_interval(monkeypatch):
+    """Polling is fastest right before the user's turn and capped when far away."""
+    monkeypatch.setattr(config, 'POLL_MIN_SECONDS', 1.0)
+    monkeypatch.setattr(config, 'POLL_MAX_SECONDS', 10.0)
+    assert sleeper_service.poll_interval(0) == 1.0
+    assert sleeper_service.poll_interval(1) == 1.0
+    assert sleeper_service.poll_interval(4) == 4.0
+    assert sleeper_service.poll_interval(30) == 10.0
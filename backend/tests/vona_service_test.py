@@ -0,0 +1,115 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+from backend.services.draft import Draft, Team
+from backend.services.draft_state import encode_positions, position_mask
+from backend.services.simulation_service import cpu_draft_scores, top_candidates
+from backend.services.vona_service import FutureSimulator, batch_average_rank, batch_top_candidates, monte_carlo_vona, evaluate_vona, simulate_futures
+from backend.tests.vorp_index_test import create_random_big_board
+
+def create_draft_and_teams():
+    """A 12-team draft with a few picks already made."""
+    board = create_random_big_board(size=400)
+    draft = Draft(board, 'PPR', 12, 20)
+    teams = [Team() for _ in range(12)]
+    for row_id, team in zip([0, 3, 5, 8, 9, 12], teams):
+        pos = draft.draft_row(row_id)
+        team.add_player(board['display_name'].iat[row_id], pos)
+    return draft, teams
+
+def test_batch_average_rank_matches_pandas():
+    """Row-wise ranks agree with pandas average ranking."""
+    keys = np.array([[3.0, 1.0, 3.0, 2.0], [5.0, 5.0, 5.0, 1.0]])
+    expected = np.vstack([pd.Series(row).rank().to_numpy() for row in keys])
+    np.testing.assert_array_equal(batch_average_rank(keys), expected)
+
+def test_future_scores_match_cpu_kernel():
+    """Each future is scored exactly as cpu_draft_scores scores its pool."""
+    draft, teams = create_draft_and_teams()
+    board = draft.players
+    simulator = FutureSimulator(draft, teams, 1, 2)
+    rng = np.random.default_rng(0)
+
+    forks = [draft.copy() for _ in range(3)]
+    for fork in forks:
+        fork.track_vorp()
+        for row_id in rng.choice(fork.available_ids(), size=30, replace=False):
+            fork.draft_row(row_id)
+    available = np.vstack([fork.state.available for fork in forks])
+
+    team_index = simulator.pick_teams[0]
+    team = teams[team_index]
+    scores = simulator._scores(available, team_index, np.tile(simulator.filled, (3, 1, 1)), np.tile(simulator.qb_count, (3, 1)))
+    for f, fork in enumerate(forks):
+        ids = fork.available_ids()
+        expected = cpu_draft_scores(
+            fork.state.position[ids], fork.vorp_index.vorp(ids), fork.state.adp[ids],
+            team.starting_needs_mask(), team.count_players_at_position('QB')
+        )
+        np.testing.assert_array_equal(scores[f, ids], expected)
+        assert np.isinf(scores[f, ~fork.state.available]).all()
+
+def test_monte_carlo_vona():
+    """Monte Carlo VONA is reproducible and reports survival odds."""
+    draft, teams = create_draft_and_teams()
+    board = draft.players
+    candidate = board.iloc[draft.available_ids()[0]]
+
+    result = monte_carlo_vona(candidate, draft, teams, 22, 7, n_futures=200, seed=1)
+    assert set(result) == {'VONA', 'VONA_VAR', 'SURVIVAL'}
+    assert 0.0 <= result['SURVIVAL'] < 1.0
+    assert result['VONA'] >= 0.0 and result['VONA_VAR'] >= 0.0
+    assert monte_carlo_vona(candidate, draft, teams, 22, 7, n_futures=200, seed=1) == result
+
+    # With no picks in between, the candidate itself is the best remaining
+    assert monte_carlo_vona(candidate, draft, teams, 0, 7, n_futures=10) == {'VONA': 0.0, 'VONA_VAR': 0.0, 'SURVIVAL': 1.0}
+    assert draft.state.available.sum() == len(board) - 6
+
+def test_evaluate_vona_shares_futures_across_candidates():
+    """Evaluating the whole board gives each candidate its single-candidate result."""
+    draft, teams = create_draft_and_teams()
+    board = draft.players
+    result = evaluate_vona(draft, teams, 11, 7, n_futures=100, seed=3)
+    assert result.index.equals(board.index[draft.available_ids()])
+    assert (result['SURVIVAL'].between(0, 1)).all()
+    for label in result.sort_values('VONA').index[-3:]:
+        single = monte_carlo_vona(board.loc[label], draft, teams, 11, 7, n_futures=100, seed=3)
+        assert single == result.loc[label].to_dict()
+
+def test_evaluate_vona_rejects_unknown_candidates():
+    """A label missing from the board raises instead of evaluating the board's last row."""
+    draft, teams = create_draft_and_teams()
+    board = draft.players
+    with pytest.raises(KeyError):
+        evaluate_vona(draft, teams, 11, 7, pd.Index([board.index[20], 'not-a-player']), n_futures=10)
+
+def test_parallel_futures_match_serial():
+    """Worker processes reproduce the serial futures bit for bit."""
+    draft, teams = create_draft_and_teams()
+    simulator = FutureSimulator(draft, teams, 11, 7)
+    serial = simulate_futures(simulator, 250, seed=5)
+    parallel = simulate_futures(simulator, 250, seed=5, workers=2)
+    assert serial.shape == (250, len(draft.players))
+    np.testing.assert_array_equal(serial, parallel)
+
+def test_batched_top_candidates_match_scalar_ranking():
+    """Tied draft scores rank the same way in the batched draw as in cpu_pick_kernel."""
+    rng = np.random.default_rng(5)
+    # Few distinct scores, so ties fall inside the top 10 and across its cut-off
+    score = rng.integers(0, 6, size=(200, 40)).astype(float) * 0.5
+    score[rng.random(score.shape) < 0.3] = np.inf
+    score[:5, 3:] = np.inf # Fewer than 10 players left
+    for scores in [score, score[:, :8]]:
+        for row, expected in zip(batch_top_candidates(scores, min(10, scores.shape[1])), scores):
+            np.testing.assert_array_equal(row, top_candidates(expected))
+
+    # Whole boards of draft scores, tied where ranks are averaged
+    board = create_random_big_board(seed=6, size=120)
+    board.loc[board.index[::4], 'ADP'] = np.nan
+    position = encode_positions(board['position'])
+    scores = np.stack([cpu_draft_scores(position, board['VORP'].to_numpy(float), board['ADP'].to_numpy(float),
+                                        position_mask(needs), qb_count)
+                       for needs, qb_count in [([], 0), (['RB', 'WR'], 2), (['QB', 'TE'], 1)]])
+    for row, expected in zip(batch_top_candidates(scores, 10), scores):
+        np.testing.assert_array_equal(row, top_candidates(expected))
@@ -0,0 +1,60 @@
+
+import numpy as np
+import pandas as pd
+from backend.services.draft import Draft
+from backend.services.vbd_service import calculate_vorp
+
+def create_random_big_board(seed: int = 0, size: int = 300):
+    """Creates a random big board with every position represented."""
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(['QB', 'RB', 'WR', 'TE', 'K', 'DEF'], size=size, p=[0.15, 0.3, 0.3, 0.15, 0.05, 0.05])
+    points = rng.normal(150, 60, size=size).round(1)
+    points[np.isin(positions, ['K', 'DEF'])] = np.nan
+    names = [f'player {i}' for i in range(size)]
+    board = pd.DataFrame({
+        'display_name': names,
+        'normalized_name': names,
+        'position': positions,
+        'fantasy_points_ppr': points,
+        'ADP': np.arange(1, size + 1, dtype=float),
+    })
+    for position in ['QB', 'RB', 'WR', 'TE', 'K', 'DEF']:
+        board = calculate_vorp(board, position, teams=12, format='PPR')
+    return board
+
+def recalculated_vorp(draft: Draft) -> np.ndarray:
+    """VORP of the available pool using the full recalculation."""
+    available = draft.get_available_players().copy()
+    for position in ['QB', 'RB', 'WR', 'TE']:
+        available = calculate_vorp(available, position, teams=draft.teams, format=draft.format)
+    return available['VORP'].to_numpy()
+
+def test_vorp_index_matches_recalculation():
+    """The incremental index agrees with calculate_vorp after every pick."""
+    draft = Draft(create_random_big_board(), 'PPR', 12, 20)
+    index = draft.track_vorp()
+    rng = np.random.default_rng(1)
+    for _ in range(150):
+        draft.draft_row(rng.choice(draft.available_ids()))
+        np.testing.assert_array_equal(index.vorp(draft.available_ids()), recalculated_vorp(draft))
+
+def test_vorp_index_projection_change():
+    """A projection change mid-draft only needs its position recomputed."""
+    draft = Draft(create_random_big_board(), 'PPR', 12, 20)
+    index = draft.track_vorp()
+    for row_id in range(40):
+        draft.draft_row(row_id)
+    rb_rows = draft.state.available_at_position('RB')
+    draft.update_projection(rb_rows[-1], 500.0)
+    np.testing.assert_array_equal(index.vorp(draft.available_ids()), recalculated_vorp(draft))
+
+def test_vorp_index_forks_with_draft():
+    """A forked draft carries its own cursors."""
+    draft = Draft(create_random_big_board(), 'PPR', 12, 20)
+    draft.track_vorp()
+    before = draft.vorp_index.vorp()
+    draft_sim = draft.copy()
+    for row_id in draft_sim.state.available_at_position('WR')[:30]:
+        draft_sim.draft_row(row_id)
+    np.testing.assert_array_equal(draft.vorp_index.vorp(), before)
+    np.testing.assert_array_equal(draft_sim.vorp_index.vorp(draft_sim.available_ids()), recalculated_vorp(draft_sim))
@@ -1,14 +1,15 @@
 # python -m backend.tests.vorp_test
 import pandas as pd
-from backend.services.vbd_service import create_vbd_big_board
+from backend.services.vbd_service import create_vbd_big_boards, select_format
 
 def main() -> None:
     print("start")
     formats_to_test = ['STD', 'HalfPPR', 'PPR']
+    big_boards = create_vbd_big_boards(formats=formats_to_test)
 
     for format_type in formats_to_test:
         print(f"\n--- Testing VORP Big Board for {format_type} Format ---")
-        big_board_df = create_vbd_big_board(format=format_type)
+        big_board_df = select_format(big_boards, format_type)
 
         if big_board_df is not None and not big_board_df.empty:
             # Filter for Wide Receivers and print relevant columns
@@ -1,14 +1,43 @@
 """
 Shared utility functions for the backend.
 """
+import os
 import re
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
 
 def normalize_name(name: str) -> str:
     """Normalizes player names for consistent matching."""
     if not isinstance(name, str):
         return name
+    return _normalize_name(name)
+
+@lru_cache(maxsize=65536)
+def _normalize_name(name: str) -> str:
     name = name.lower()
     name = name.replace("'", "") # Remove apostrophes
     name = re.sub(r'[^a-z0-9\s]', '', name)  # Remove other non-alphanumeric except spaces
     name = re.sub(r'(jr|sr|ii|iii|iv)$', '', name)  # Remove common suffixes at end
     return name.strip()
+
+def normalize_names(names: pd.Series) -> pd.Series:
+    """
+    Vectorized normalize_name for a whole column. Values that are not strings
+    are passed through unchanged.
+    """
+    if not (pd.api.types.is_object_dtype(names) or pd.api.types.is_string_dtype(names)):
+        return names.copy()
+    normalized = (names.str.lower()
+                  .str.replace("'", "", regex=False)
+                  .str.replace(r'[^a-z0-9\s]', '', regex=True)
+                  .str.replace(r'(jr|sr|ii|iii|iv)$', '', regex=True)
+                  .str.strip())
+    return normalized.where(normalized.notna(), names)
+
+def file_fingerprint(path: str | Path | None) -> list:
+    """Identifies one version of an input file by path, size and mtime."""
+    if path is None or not os.path.exists(path):
+        return [str(path), None, None]
+    stat = os.stat(path)
+    return [str(path), stat.st_size, stat.st_mtime_ns]